@@ -1,12 +1,33 @@
+import argparse
+import base64
+import hashlib
+import html
+import io
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from tkinter import ttk, messagebox, filedialog
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import matplotlib
 
-matplotlib.use("TkAgg")
+try:
+    matplotlib.use("TkAgg")
+except ImportError:
+    # Ekransız ortam (rapor/batch modu): yalnızca Agg ile çizilir
+    matplotlib.use("Agg")
 
 # Modern renk paleti
 COLORS = {
@@ -21,6 +42,114 @@ COLORS = {
     "graph_bg": "#0f0f23",
 }
 
+# Bu düğüm sayısının üstünde P matrisi hücre yazısız, havuzlanmış görüntü
+# olarak çizilir; ayrıntı için karo (tile) yakınlaştırma kullanılır
+MATRIX_TEXT_LIMIT = 40
+MATRIX_TILE = 32
+MATRIX_OVERVIEW_PIXELS = 512
+
+# Ağ haritasında görünür düğüm sayısı bunun altındayken etiket yazılır
+NODE_LABEL_LIMIT = 60
+
+# Bu kadar rank-1 düzenlemeden sonra fundamental matris baştan hesaplanır
+FUNDAMENTAL_REFRESH = 64
+
+# Slider sürüklenirken komut en fazla bu aralıkta (ms) bir kez çağrılır
+SLIDER_FRAME_MS = 33
+
+# Hassasiyet modları: (durum dtype, geçmiş dtype; None = durum ile aynı)
+PRECISION_MODES = {
+    "float64": (np.float64, None),
+    "float32": (np.float32, None),
+    "compact": (np.float32, np.int32),  # Geçmiş tam sayı araç olarak saklanır
+}
+
+
+def _read_only(*arrays):
+    """Önbelleğe girecek dizileri salt okunur yap (çağıran yerinde bozamasın)"""
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def _kahan_add(total, comp, value):
+    """Kompanse (Kahan) toplama: (yeni toplam, yeni düzeltme) döndürür"""
+    y = value - comp
+    new_total = total + y
+    return new_total, (new_total - total) - y
+
+
+# Sınıf başına ayrı gemv döngüsü yalnızca az sayıda büyük matriste
+GEMV_MAX_CLASSES = 4
+GEMV_MIN_NODES = 512
+
+
+def _use_class_gemv(classes, rows, n):
+    """Tek satırlı yığın çarpımı sınıf başına gemv ile mi yapılmalı
+
+    Bazı numpy sürümleri tek satırlı yığın matmul'de BLAS'ı atlar; bu ancak
+    birkaç sınıf (≤ GEMV_MAX_CLASSES) ve büyük n (≥ GEMV_MIN_NODES) için
+    Python döngüsünün maliyetini karşılar. Topluluk gibi çok matrisli
+    çalıştırmalar her zaman tek bir toplu matmul kullanır.
+    """
+    return rows == 1 and classes <= GEMV_MAX_CLASSES and n >= GEMV_MIN_NODES
+
+
+def _advance(z, M):
+    """z·M; M (C, n, m) biçimindeyse z'nin son toplu ekseni sınıflardır
+
+    Sınıf ekseni öne alınır, böylece tek bir toplu matmul her sınıf için
+    o sınıfın tüm senaryolarını tek bir (B, n)·(n, m) çarpımında işler.
+    """
+    if M.ndim == 2:
+        return z @ M
+    zc = np.moveaxis(z, -2, 0)
+    rows = zc.reshape(len(M), -1, z.shape[-1])
+    if _use_class_gemv(len(M), rows.shape[1], z.shape[-1]):
+        out = np.stack([r @ m for r, m in zip(rows, M)])
+    else:
+        out = rows @ M
+    return np.moveaxis(out.reshape(zc.shape[:-1] + (M.shape[-1],)), 0, -2)
+
+
+def _project_rows_to_simplex(V, mask):
+    """Her satırı, maskede izin verilen hücreler üzerindeki olasılık simpleksine izdüşür"""
+    n_cols = V.shape[1]
+    W = np.where(mask, V, -np.inf)
+    S = -np.sort(-W, axis=1)  # Azalan sıralama, maske dışı hücreler sonda
+    finite = np.isfinite(S)
+    css = np.cumsum(np.where(finite, S, 0.0), axis=1) - 1.0
+    k = np.arange(1, n_cols + 1)
+    rho = np.count_nonzero(finite & (S - css / k > 0), axis=1)
+    rows = np.arange(V.shape[0])
+    theta = css[rows, np.maximum(rho, 1) - 1] / np.maximum(rho, 1)
+    return np.where(mask & (rho > 0)[:, None], np.maximum(V - theta[:, None], 0.0), 0.0)
+
+
+def _partition_worker(names, hours, n, rows, cols, block, barrier):
+    """Bölge işçisi: her saatte kendi sütunlarını hesaplar, sonra bariyerde bekler
+
+    U (girişler) ve H (durum geçmişi) paylaşımlı bellektedir. Bölge yalnızca
+    sütunlarına akış gönderen satırları (rows) okur; bunların bir kısmı başka
+    bölgelerin sınır düğümleridir ve bir önceki saatte bariyerden önce yazılmıştır.
+    """
+    u_shm = shared_memory.SharedMemory(name=names[0])
+    h_shm = shared_memory.SharedMemory(name=names[1])
+    try:
+        U = np.ndarray((hours, n), dtype=np.float64, buffer=u_shm.buf)
+        H = np.ndarray((hours + 1, n), dtype=np.float64, buffer=h_shm.buf)
+        for t in range(hours):
+            H[t + 1, cols] = (H[t, rows] + U[t, rows]) @ block
+            barrier.wait()
+    except BaseException:
+        # Diğer bölgeler bariyerde sonsuza dek beklemesin
+        barrier.abort()
+        raise
+    finally:
+        del U, H
+        u_shm.close()
+        h_shm.close()
+
 
 class TrafficSimulation:
     def __init__(self):
@@ -41,6 +170,38 @@ class TrafficSimulation:
         ]
         self.n_map = {n: i for i, n in enumerate(self.nodes)}
         self.n_len = len(self.nodes)
+        self.absorbing_nodes = ["N3", "N9", "N10", "N12"]
+        self.entry_nodes = ["N1", "N2", "N4", "N11"]
+        self.precision = "float64"
+
+        # Düğüm pozisyonları (manuel yerleşim, ağ haritası için)
+        self.positions = {
+            "N1": (0.5, 1.0),  # Kuzey giriş
+            "N2": (1.0, 0.5),  # Doğu giriş
+            "N3": (1.0, 0.8),  # Çıkış
+            "N4": (0.0, 0.5),  # Batı giriş
+            "N5": (0.5, 0.7),  # Merkez üst
+            "N6": (0.7, 0.5),  # Merkez sağ
+            "N7": (0.5, 0.5),  # Merkez
+            "N8": (0.3, 0.5),  # Merkez sol
+            "N9": (0.5, 0.3),  # Çıkış
+            "N10": (1.0, 0.2),  # Çıkış
+            "N11": (0.5, 0.0),  # Güney giriş
+            "N12": (0.0, 0.2),  # Çıkış
+            "N13": (0.3, 0.2),  # Güney kavşak
+        }
+
+        # Sürekli zaman modu için düğüm başına ortalama bekleme süreleri (saat);
+        # tanımsız düğümler bir saat bekler (saatlik modelle aynı ortalama)
+        self.dwell_times = {}
+
+        # P değiştiğinde çağrılır: listener(düğüm) ya da tüm matris için None
+        self.p_listeners = []
+
+        # P her değiştiğinde artan sürüm; önbellek güncellemeleri kilitle
+        # yapılır ki arka plandaki analiz eski P'den N kurmasın
+        self.p_version = 0
+        self._p_lock = threading.RLock()
 
         self.P = np.zeros((self.n_len, self.n_len))
         self.setup_matrix()
@@ -49,8 +210,10 @@ class TrafficSimulation:
         def set_p(u, v, p):
             self.P[self.n_map[u], self.n_map[v]] = p
 
+        self.P[:] = 0.0
+
         # Yutan (Absorbing) Düğümler
-        for n in ["N3", "N9", "N10", "N12"]:
+        for n in self.absorbing_nodes:
             set_p(n, n, 1.0)
 
         # Geçişler
@@ -71,6 +234,13 @@ class TrafficSimulation:
         set_p("N8", "N10", 0.5)
         set_p("N13", "N5", 0.5)
         set_p("N13", "N12", 0.5)
+        self.invalidate_fundamental()
+        self.notify_p_change()
+
+    def notify_p_change(self, node=None):
+        """P dinleyicilerine değişen satırı (None = tüm matris) bildir"""
+        for listener in list(self.p_listeners):
+            listener(node)
 
     def get_inflow(self, t):
         u = np.zeros(self.n_len)
@@ -97,35 +267,528 @@ class TrafficSimulation:
         u[self.n_map["N11"]] = n11
         return u
 
-    def run_simulation(self, hours=24):
-        x = np.zeros(self.n_len)
-        history = []
+    def _incident_delta(self, node, incidents):
+        """Aynı düğümdeki olaylardan (satır indeksi, P satırına fark) üret
+
+        "row" ({hedef: olasılık}) satırı baştan tanımlar (sonraki kazanır),
+        "close" ([hedef]) bağlantıları kapatır. Kapanışlar tüm tanımlardan
+        sonra uygulanır; sonuç tek satırdır ve 1'e normalize edilir.
+        """
+        if node in self.absorbing_nodes:
+            raise ValueError(f"{node} yutan düğüm, satırı değiştirilemez")
+        i = self.node_index(node)
+        row = self.P[i].copy()
+        for incident in incidents:
+            if "row" in incident:
+                row = self.row_from_targets(node, incident["row"])
+        for incident in incidents:
+            for dst in incident.get("close", []):
+                row[self.node_index(dst)] = 0.0
+        if row.sum() <= 0:
+            raise ValueError(f"{node} olayı satırda hiç çıkış bırakmıyor")
+        return i, row / row.sum() - self.P[i]
+
+    def _compile_incidents(self, incidents, batch, hours):
+        """Olay takvimini adım -> (senaryo, satır, fark) dizilerine derle
+
+        incidents bir olay listesi (tüm senaryolara uygulanır) ya da toplu
+        modda senaryo başına bir liste olabilir. Olay [start, end) saatlerinde
+        etkindir. Aynı (senaryo, düğüm) üzerindeki etkin olaylar tek satırda
+        birleştirilip tek fark üretir. Aynı etkin olay kümesini paylaşan
+        adımlar aynı dizileri kullanır; yoğun P kopyası hiç üretilmez.
+        """
+        if not incidents:
+            return {}
+        count = int(np.prod(batch)) if batch else 1
+        if batch and isinstance(incidents[0], (list, tuple)):
+            per_scenario = incidents
+        else:
+            per_scenario = [incidents] * count
+        if len(per_scenario) != count:
+            raise ValueError("Olay listesi sayısı senaryo sayısıyla eşleşmiyor")
+
+        events = []
+        for b, scenario_events in enumerate(per_scenario):
+            for event in scenario_events:
+                if "node" not in event:
+                    raise ValueError(f"Olayda düğüm (node) yok: {event}")
+                # Tek başına geçerli mi? (hata takvim derlenirken çıkar)
+                self._incident_delta(event["node"], [event])
+                start, end = int(event.get("start", 0)), int(event.get("end", hours))
+                events.append((b, event, max(start, 0), min(end, hours)))
+
+        schedule, compiled = {}, {}
         for t in range(hours):
-            U = self.get_inflow(t)
-            x = np.dot((x + U), self.P)
-            history.append(x.copy())
-        return np.array(history)
+            active = tuple(k for k, e in enumerate(events) if e[2] <= t < e[3])
+            if active:
+                if active not in compiled:
+                    groups = {}
+                    for k in active:
+                        b, event = events[k][:2]
+                        groups.setdefault((b, event["node"]), []).append(event)
+                    merged = [
+                        (b, *self._incident_delta(node, group))
+                        for (b, node), group in groups.items()
+                    ]
+                    compiled[active] = (
+                        np.array([m[0] for m in merged]),
+                        np.array([m[1] for m in merged]),
+                        np.array([m[2] for m in merged]),
+                    )
+                schedule[t] = compiled[active]
+        return schedule
+
+    @staticmethod
+    def _incident_correction(z, rows, active):
+        """Etkin olayların düşük ranklı katkısı: z[b, i]·Δ_i, (B, n) biçiminde"""
+        b, i, delta = active
+        correction = np.zeros((z.size // z.shape[-1], delta.shape[1]), dtype=z.dtype)
+        flat = z.reshape(-1, z.shape[-1])
+        np.add.at(correction, b, (flat[b, rows[i]][:, None] * delta).astype(z.dtype))
+        return correction.reshape(z.shape[:-1] + (delta.shape[1],))
+
+    def _run_engine(
+        self,
+        inflows,
+        x0=None,
+        return_state=False,
+        progress=None,
+        incidents=None,
+        P=None,
+    ):
+        """Ortak simülasyon motoru: inflows (..., T, n) -> geçmiş (..., T, n)
+
+        Baştaki eksenler toplu (batch) senaryolardır. float64 modunda
+        x = (x + U)·P doğrudan uygulanır. Düşük hassasiyette geçici blok Q ile
+        ilerletilir, yutan düğümlerin birikimi ise Kahan toplamı ile tutulur
+        ki araç korunumu float32'de de bozulmasın. progress(adım, toplam) her
+        adımdan sonra çağrılır. incidents (bkz. _compile_incidents) etkin
+        oldukları adımlarda yalnızca değişen satırlar için z[S]·Δ[S]
+        düzeltmesi olarak eklenir. P verilirse self.P yerine kullanılır;
+        (C, n, n) biçimindeki bir tensörde inflows'un son toplu ekseni C
+        sınıftır (çok sınıflı mod).
+        """
+        P = self.P if P is None else np.asarray(P, dtype=np.float64)
+        if P.ndim == 3 and incidents:
+            raise ValueError("Olaylar çok sınıflı modda desteklenmiyor")
+        state_dtype, hist_dtype = PRECISION_MODES[self.precision]
+        U = np.asarray(inflows, dtype=state_dtype)
+        batch, (hours, n) = U.shape[:-2], U.shape[-2:]
+        x = np.zeros(batch + (n,), dtype=state_dtype)
+        if x0 is not None:
+            x = x + np.asarray(x0, dtype=state_dtype)
+        history = np.empty(batch + (hours, n), dtype=hist_dtype or state_dtype)
+        schedule = self._compile_incidents(incidents, batch, hours)
+
+        if state_dtype == np.float64:
+            rows = np.arange(n)
+            for t in range(hours):
+                z = x + U[..., t, :]
+                x = _advance(z, P)
+                if t in schedule:
+                    x += self._incident_correction(z, rows, schedule[t])
+                history[..., t, :] = x
+                if progress is not None:
+                    progress(t + 1, hours)
+        else:
+            t_idx, a_idx = self._split_indices()
+            rows = np.full(n, -1)
+            rows[t_idx] = np.arange(len(t_idx))
+            Q = P[..., t_idx, :][..., t_idx].astype(state_dtype)
+            R = P[..., t_idx, :][..., a_idx].astype(state_dtype)
+            x_t, acc = x[..., t_idx], x[..., a_idx]
+            comp = np.zeros_like(acc)
+            U_t, U_a = U[..., t_idx], U[..., a_idx]
+            for t in range(hours):
+                z = x_t + U_t[..., t, :]
+                x_t = _advance(z, Q)
+                exits = _advance(z, R) + U_a[..., t, :]
+                if t in schedule:
+                    correction = self._incident_correction(z, rows, schedule[t])
+                    x_t += correction[..., t_idx]
+                    exits += correction[..., a_idx]
+                acc, comp = _kahan_add(acc, comp, exits)
+                if hist_dtype is None:
+                    history[..., t, t_idx] = x_t
+                    history[..., t, a_idx] = acc
+                else:
+                    history[..., t, t_idx] = np.rint(x_t)
+                    history[..., t, a_idx] = np.rint(acc)
+                if progress is not None:
+                    progress(t + 1, hours)
+            x[..., t_idx] = x_t
+            x[..., a_idx] = acc
+
+        if return_state:
+            return history, x
+        return history
+
+    def run_simulation(self, hours=24, progress=None, incidents=None, P=None):
+        inflows = np.array([self.get_inflow(t) for t in range(hours)])
+        return self._run_engine(
+            inflows.reshape(hours, self.n_len),
+            progress=progress,
+            incidents=incidents,
+            P=P,
+        )
 
     def run_custom_simulation(self, hours, n1_values, n2_values, n11_values):
         """Özel değerlerle simülasyon çalıştır"""
-        x = np.zeros(self.n_len)
-        history = []
-        for t in range(hours):
-            U = self.get_custom_inflow(n1_values[t], n2_values[t], n11_values[t])
-            x = np.dot((x + U), self.P)
-            history.append(x.copy())
-        return np.array(history)
+        inflows = np.array(
+            [
+                self.get_custom_inflow(n1_values[t], n2_values[t], n11_values[t])
+                for t in range(hours)
+            ]
+        )
+        return self._run_engine(inflows.reshape(hours, self.n_len))
+
+    def run_batch_simulation(self, inflows, initial_state=None, incidents=None):
+        """Toplu senaryo simülasyonu: inflows (B, T, n) -> geçmiş (B, T, n)
+
+        incidents tek bir olay listesi ya da senaryo başına bir liste olabilir.
+        """
+        return self._run_engine(inflows, x0=initial_state, incidents=incidents)
+
+    def class_tensor(self, class_transitions):
+        """Sınıf başına rota tensörü (C, n, n)
+
+        class_transitions her sınıf için {kaynak: {hedef: olasılık}} satır
+        değişiklikleridir (boş sözlük = temel P). Örn. kamyonların N7'ye
+        girmediği bir sınıf: {"N6": {"N3": 0.5, "N10": 0.5}}.
+        """
+        tensor = np.repeat(self.P[None], len(class_transitions), axis=0)
+        for c, transitions in enumerate(class_transitions):
+            for src, row in transitions.items():
+                i, delta = self._incident_delta(src, [{"row": row}])
+                tensor[c, i] += delta
+        return tensor
+
+    def run_multiclass_simulation(self, class_P, inflows, x0=None, class_names=None):
+        """Çok sınıflı (otomobil, otobüs, kamyon...) simülasyon
+
+        class_P (C, n, n) sınıf başına geçiş tensörü, inflows (C, T, n) ya da
+        toplu (B, C, T, n) sınıf başına girişlerdir. Tüm sınıflar her adımda
+        tek bir toplu matmul ile ilerler. Sınıf geçmişleri, toplam geçmiş ve
+        hem toplamın hem her sınıfın analyze_bottleneck sonucu döner.
+        """
+        class_P = np.asarray(class_P, dtype=np.float64)
+        history = self._run_engine(inflows, x0=x0, P=class_P)
+        total = history.sum(axis=-3)
+        names = class_names or [f"sınıf {c}" for c in range(len(class_P))]
+        result = {"class_names": names, "classes": history, "total": total}
+        if history.ndim == 3:
+            result["bottleneck"] = self.analyze_bottleneck(total)
+            result["class_bottlenecks"] = dict(
+                zip(names, (self.analyze_bottleneck(h) for h in history))
+            )
+        return result
+
+    def sample_transition_matrices(self, samples, concentration=100.0, seed=None):
+        """P etrafında Dirichlet örneklenmiş (M, n, n) geçiş matrisleri
+
+        Her geçici satır Dirichlet(κ·P[i]) dağılımından çekilir: beklenen
+        değeri P[i], κ büyüdükçe varyansı küçüktür. Gamma örnekleri satır
+        toplamına bölünerek tüm örnekler tek seferde üretilir; P'de sıfır
+        olan bağlantılar sıfır kalır, yutan satırlar değişmez.
+        """
+        rng = np.random.default_rng(seed)
+        shape = concentration * np.broadcast_to(self.P, (samples,) + self.P.shape)
+        draws = np.zeros(shape.shape)
+        support = shape > 0
+        draws[support] = rng.gamma(shape[support])
+        draws /= draws.sum(axis=-1, keepdims=True)
+        _, a_idx = self._split_indices()
+        draws[:, a_idx] = self.P[a_idx]
+        return draws
+
+    def run_ensemble(
+        self,
+        samples=200,
+        concentration=100.0,
+        hours=24,
+        inflows=None,
+        band=(0.05, 0.95),
+        seed=None,
+    ):
+        """P belirsizliği altında topluluk (ensemble) simülasyonu
+
+        M örnek matris tek bir (M, n, n) toplu matmul ile birlikte
+        simüle edilir. Düğüm ve saat başına ortalama, medyan ve band
+        yüzdelikleri; örnekler arasında tepe darboğazın ve yapısal darboğazın
+        (toplu ters alma ile N'nin sütun toplamları) dağılımı döner.
+        """
+        if inflows is None:
+            inflows = np.array([self.get_inflow(t) for t in range(hours)])
+        inflows = np.asarray(inflows, dtype=np.float64).reshape(-1, self.n_len)
+        P_samples = self.sample_transition_matrices(samples, concentration, seed)
+        history = self._run_engine(
+            np.broadcast_to(inflows, (samples,) + inflows.shape), P=P_samples
+        )
+        lower, median, upper = np.quantile(history, [band[0], 0.5, band[1]], axis=0)
+
+        # Örnek başına tepe darboğaz ve yapısal darboğaz
+        t_idx, _ = self._split_indices()
+        transient_nodes = [self.nodes[i] for i in t_idx]
+        peaks = history[..., t_idx].max(axis=1)
+        Q = P_samples[:, t_idx][:, :, t_idx]
+        visits = np.linalg.inv(np.eye(len(t_idx)) - Q).sum(axis=1)
+
+        def shares(winners):
+            counts = np.bincount(winners, minlength=len(t_idx)) / len(winners)
+            return {transient_nodes[k]: counts[k] for k in np.flatnonzero(counts)}
+
+        return {
+            "mean": history.mean(axis=0),
+            "median": median,
+            "lower": lower,
+            "upper": upper,
+            "peak_load": peaks.max(axis=1),
+            "bottleneck": shares(peaks.argmax(axis=1)),
+            "structural_bottleneck": shares(visits.argmax(axis=1)),
+        }
+
+    def run_lookahead(self, forecaster, steps, current_state=None, z=1.645):
+        """Tahmin edilen girişlerle ileriye bakan toplu simülasyon
+
+        Alt, ortalama ve üst giriş tahminleri tek bir (3, steps, n) toplu
+        çalıştırmada ilerletilir; her biri için geçmiş döner.
+        """
+        bands = [forecaster.inflow_matrix(v) for v in forecaster.forecast(steps, z)]
+        history = self._run_engine(np.stack(bands), x0=current_state)
+        return dict(zip(("lower", "mean", "upper"), history))
+
+    def run_steps(self, current_state, inflows, progress=None):
+        """Mevcut durumdan çok adımlı simülasyon: (geçmiş, son durum) döndürür"""
+        return self._run_engine(
+            inflows, x0=current_state, return_state=True, progress=progress
+        )
+
+    def partition_nodes(self, parts):
+        """Düğümleri P grafiğinde BFS sırasına göre eşit büyüklükte bölgelere ayır
+
+        Komşu düğümler aynı bölgeye düştüğünden bölgeler arası sınır (her
+        saatte paylaşılan akış) küçük kalır.
+        """
+        A = (self.P != 0) | (self.P.T != 0)
+        seen = np.zeros(self.n_len, dtype=bool)
+        order = []
+        for start in np.argsort(A.sum(axis=1), kind="stable"):
+            if seen[start]:
+                continue
+            seen[start] = True
+            frontier = np.array([start])
+            while len(frontier):
+                order.extend(frontier)
+                frontier = np.flatnonzero(A[frontier].any(axis=0) & ~seen)
+                seen[frontier] = True
+        return np.array_split(np.array(order), parts)
+
+    def run_partitioned_simulation(self, hours=24, parts=None, inflows=None, x0=None):
+        """Bölgelere ayrılmış paralel simülasyon (float64)
+
+        Her bölge x·P'nin kendi sütunlarını ayrı bir süreçte hesaplar. Girişler
+        ve geçmiş paylaşımlı bellekte durur, bölgeler her saatten sonra bir
+        bariyerde eşitlenir. Sonuç run_simulation ile aynıdır; yalnızca sıfır
+        olmayan satırlar toplandığı için toplama sırasından gelen yuvarlama
+        farkları (~1e-15 bağıl) görülebilir.
+        """
+        if inflows is None:
+            inflows = np.array([self.get_inflow(t) for t in range(hours)])
+        U = np.asarray(inflows, dtype=np.float64).reshape(-1, self.n_len)
+        hours, n = U.shape
+        parts = max(1, min(parts or os.cpu_count() or 1, n))
+
+        regions = []
+        for cols in self.partition_nodes(parts):
+            rows = np.flatnonzero(self.P[:, cols].any(axis=1))
+            regions.append((rows, cols, self.P[np.ix_(rows, cols)]))
+
+        if parts == 1:
+            rows, cols, block = regions[0]
+            x = np.zeros(n) if x0 is None else np.asarray(x0, dtype=np.float64)
+            history = np.empty((hours, n))
+            for t in range(hours):
+                x = x.copy()
+                x[cols] = (x[rows] + U[t, rows]) @ block
+                history[t] = x
+            return history
+
+        u_shm = shared_memory.SharedMemory(create=True, size=max(U.nbytes, 1))
+        h_shm = shared_memory.SharedMemory(create=True, size=(hours + 1) * n * 8)
+        try:
+            np.ndarray(U.shape, dtype=np.float64, buffer=u_shm.buf)[:] = U
+            H = np.ndarray((hours + 1, n), dtype=np.float64, buffer=h_shm.buf)
+            H[0] = 0 if x0 is None else x0
+
+            context = multiprocessing.get_context()
+            barrier = context.Barrier(parts)
+            workers = [
+                context.Process(
+                    target=_partition_worker,
+                    args=(
+                        (u_shm.name, h_shm.name),
+                        hours,
+                        n,
+                        rows,
+                        cols,
+                        block,
+                        barrier,
+                    ),
+                    daemon=True,
+                )
+                for rows, cols, block in regions
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if any(worker.exitcode != 0 for worker in workers):
+                raise RuntimeError("Bölge işçilerinden biri başarısız oldu")
+
+            history = H[1:].copy()
+            del H
+            return history
+        finally:
+            u_shm.close()
+            u_shm.unlink()
+            h_shm.close()
+            h_shm.unlink()
+
+    def generator_matrix(self, dwell=None):
+        """Sürekli zaman üreteci G: geçici i için G[i] = (P[i] - e_i) / τ_i
+
+        τ_i, i düğümündeki ortalama bekleme süresidir (saat). Yutan
+        düğümlerin satırları sıfırdır, araçlar orada birikir.
+        """
+        dwell = {**self.dwell_times, **(dwell or {})}
+        tau = np.array([dwell.get(node, 1.0) for node in self.nodes], dtype=float)
+        G = (self.P - np.eye(self.n_len)) / tau[:, None]
+        _, a_idx = self._split_indices()
+        G[a_idx] = 0.0
+        return G
+
+    def run_ctmc_simulation(
+        self, hours=24, steps_per_hour=12, inflows=None, dwell=None, x0=None, tol=1e-12
+    ):
+        """Sürekli zaman (CTMC) simülasyonu: dx/dt = x·G + u(t)
+
+        Girişler saatlik sabit hızlardır (araç/saat, varsayılan get_inflow
+        takvimi). Durumlar 1/steps_per_hour saatlik ızgarada (varsayılan 5
+        dakika) uniformizasyonla hesaplanır: Pu = I + G/λ ile
+        x(t+h) = Σ_k w_k·x·Pu^k + Σ_k v_k·u·Pu^k, burada w_k Poisson(λh)
+        olasılıkları, v_k = P(Poisson(λh) > k) / λ'dır. Yalnızca vektör-matris
+        çarpımları yapılır, yoğun matris üsteli alınmaz. λh büyükse adım alt
+        adımlara bölünür. (zamanlar, geçmiş) döndürür.
+        """
+        if inflows is None:
+            inflows = np.array([self.get_inflow(t) for t in range(hours)])
+        U = np.asarray(inflows, dtype=np.float64).reshape(-1, self.n_len)
+        hours = len(U)
+
+        G = self.generator_matrix(dwell)
+        lam = max(float(-G.diagonal().min()), 1e-12)
+        Pu = np.eye(self.n_len) + G / lam
+
+        # Her ızgara adımı aynı uzunlukta: Poisson ağırlıkları bir kez hesaplanır
+        substeps = max(1, int(np.ceil(lam / steps_per_hour / 8)))
+        m = lam / steps_per_hour / substeps
+        w = [np.exp(-m)]
+        while 1.0 - sum(w) > tol:
+            w.append(w[-1] * m / len(w))
+        w = np.array(w)
+        v = (1.0 - np.cumsum(w)).clip(min=0.0) / lam
+
+        x = np.zeros(self.n_len) if x0 is None else np.asarray(x0, dtype=np.float64)
+        history = np.empty((hours * steps_per_hour, self.n_len))
+        for step in range(hours * steps_per_hour):
+            u = U[step // steps_per_hour]
+            for _ in range(substeps):
+                term = np.stack([x, u])
+                x = w[0] * term[0] + v[0] * term[1]
+                for k in range(1, len(w)):
+                    term = term @ Pu
+                    x = x + w[k] * term[0] + v[k] * term[1]
+            history[step] = x
+        times = np.arange(1, hours * steps_per_hour + 1) / steps_per_hour
+        return times, history
 
     def run_single_step(self, current_state, n1, n2, n11):
         """Tek adım simülasyon - mevcut durumdan bir sonraki duruma"""
         U = self.get_custom_inflow(n1, n2, n11)
-        new_state = np.dot((current_state + U), self.P)
+        _, new_state = self._run_engine(U[None, :], x0=current_state, return_state=True)
         return new_state
 
+    def run_reduced_simulation(self, hours=24, inflow_fn=None):
+        """Yalnızca geçici blok Q ile simülasyon, çıkışlar ayrı sayaçlarda
+
+        Yutan düğümler durum vektöründe tutulmaz; her saat R üzerinden çıkan
+        araçlar saatlik akış olarak kaydedilir ve kümülatif toplamı ayrıca
+        hesaplanır.
+        """
+        inflow_fn = inflow_fn or self.get_inflow
+        dtype = PRECISION_MODES[self.precision][0]
+        t_idx, a_idx = self._split_indices()
+        Q = self.P[np.ix_(t_idx, t_idx)].astype(dtype)
+        R = self.P[np.ix_(t_idx, a_idx)].astype(dtype)
+        U = np.array([inflow_fn(t) for t in range(hours)], dtype=dtype)
+        U = U.reshape(hours, self.n_len)
+        U_t, U_a = U[:, t_idx], U[:, a_idx]
+
+        x = np.zeros(len(t_idx), dtype=dtype)
+        transient_history = np.zeros((hours, len(t_idx)), dtype=dtype)
+        exit_flows = np.zeros((hours, len(a_idx)), dtype=dtype)
+        for t in range(hours):
+            z = x + U_t[t]
+            x = z @ Q
+            transient_history[t] = x
+            exit_flows[t] = z @ R
+        exit_flows += U_a
+
+        # Kümülatif çıkışlar kompanse toplam ile (float32'de kayıpsız sayaç)
+        cumulative = np.zeros_like(exit_flows)
+        total = np.zeros(len(a_idx), dtype=dtype)
+        comp = np.zeros_like(total)
+        for t in range(hours):
+            total, comp = _kahan_add(total, comp, exit_flows[t])
+            cumulative[t] = total
+
+        return {
+            "transient_nodes": [self.nodes[i] for i in t_idx],
+            "transient_history": transient_history,
+            "exit_nodes": [self.nodes[i] for i in a_idx],
+            "exit_flows": exit_flows,
+            "cumulative_exits": cumulative,
+        }
+
+    def precision_report(self, hours=24 * 30, mode="float32"):
+        """Seçilen hassasiyet modunu float64 referansına karşı karşılaştır"""
+        inflows = np.array([self.get_inflow(t % 24) for t in range(hours)])
+        inflows = inflows.reshape(hours, self.n_len)
+        saved = self.precision
+        try:
+            self.precision = "float64"
+            reference = self._run_engine(inflows)
+            self.precision = mode
+            result = self._run_engine(inflows)
+        finally:
+            self.precision = saved
+
+        abs_err = np.abs(result.astype(np.float64) - reference)
+        total_in = inflows.sum()
+        return {
+            "mode": mode,
+            "max_abs_error": float(abs_err.max()),
+            "max_rel_error": float(abs_err.max() / max(np.abs(reference).max(), 1.0)),
+            "conservation_error_float64": float(abs(reference[-1].sum() - total_in)),
+            "conservation_error": float(
+                abs(result[-1].astype(np.float64).sum() - total_in)
+            ),
+            "history_bytes_float64": reference.nbytes,
+            "history_bytes": result.nbytes,
+        }
+
     def analyze_bottleneck(self, history):
-        transient_indices = [
-            self.n_map[n] for n in self.nodes if n not in ["N3", "N9", "N10", "N12"]
-        ]
+        transient_indices, _ = self._split_indices()
         transient_history = history[:, transient_indices]
 
         max_loads = transient_history.max(axis=0)
@@ -135,21 +798,1863 @@ class TrafficSimulation:
 
         return bottleneck_node_name, max_val
 
-    def analyze_steady_state(self):
-        transient_nodes = [n for n in self.nodes if n not in ["N3", "N9", "N10", "N12"]]
-        t_indices = [self.n_map[n] for n in transient_nodes]
+    def analyze_steady_state(self, snapshot=None):
+        try:
+            transient_nodes, N_fund, col_sums = self.fundamental(snapshot)
+        except np.linalg.LinAlgError:
+            return None, None
+        struct_bn_idx = np.argmax(col_sums)
+        struct_bn_node = transient_nodes[struct_bn_idx]
+        return struct_bn_node, N_fund
+
+    def invalidate_fundamental(self):
+        """P dışarıdan değiştirildiğinde önbellekli N'yi ve Q kuvvetlerini at"""
+        with self._p_lock:
+            self._fundamental = None
+            self._fundamental_edits = 0
+            self._phase_cache = None
+            self.p_version += 1
+
+    def p_snapshot(self):
+        """(P kopyası, sürüm): arka plana gönderilecek tutarlı görüntü"""
+        with self._p_lock:
+            return self.P.copy(), self.p_version
+
+    def fundamental(self, snapshot=None):
+        """Önbellekli (geçici düğümler, N = (I - Q)^-1, N sütun toplamları)
+
+        Tersinir alma yalnızca ilk çağrıda (ya da her FUNDAMENTAL_REFRESH
+        düzenlemede bir, birikmiş yuvarlamayı silmek için) yapılır; set_row
+        düzenlemeleri önbelleği Sherman–Morrison ile O(n²) günceller.
+        snapshot (bkz. p_snapshot) verilirse N o P'den kurulur. Tersinir alma
+        kilitsiz yapılır; sonuç yalnızca bu arada P değişmediyse önbelleğe
+        yazılır. N ve sütun toplamları salt okunurdur; değiştirmek için kopyalanmalı.
+        """
+        with self._p_lock:
+            if self._fundamental is not None and (
+                snapshot is None or snapshot[1] == self.p_version
+            ):
+                return self._fundamental
+            P, version = snapshot if snapshot is not None else self.p_snapshot()
+        t_idx, _ = self._split_indices()
+        N_fund = np.linalg.inv(np.eye(len(t_idx)) - P[np.ix_(t_idx, t_idx)])
+        transient_nodes = tuple(self.nodes[i] for i in t_idx)
+        result = (transient_nodes, *_read_only(N_fund, N_fund.sum(axis=0)))
+        with self._p_lock:
+            if version == self.p_version:
+                self._fundamental = result
+                self._fundamental_edits = 0
+        return result
+
+    def structural_bottleneck(self):
+        """Önbellekten (düğüm, beklenen ziyaret toplamı) — O(n)"""
+        transient_nodes, _, col_sums = self.fundamental()
+        k = int(np.argmax(col_sums))
+        return transient_nodes[k], col_sums[k]
+
+    def set_row(self, node, row):
+        """P'de geçici bir düğümün satırını değiştir (satır 1'e normalize edilir)
+
+        I - Q yalnızca k. satırında d kadar değişir: (I - Q) - e_k dᵀ. Buna
+        göre N' = N + N[:, k] (dᵀN) / (1 - (dᵀN)[k]); sütun toplamları da aynı
+        rank-1 terimle güncellenir. Düzenleme ağı kapalı bir döngüye
+        çevirirse (payda ~0) P değiştirilmeden LinAlgError fırlatılır.
+        """
+        if node in self.absorbing_nodes:
+            raise ValueError(f"{node} yutan düğüm, satırı değiştirilemez")
+        row = np.asarray(row, dtype=np.float64)
+        if row.shape != (self.n_len,) or np.any(row < 0) or row.sum() <= 0:
+            raise ValueError(f"{node} için geçersiz olasılık satırı")
+        row = row / row.sum()
+        i = self.n_map[node]
+        with self._p_lock:
+            self._update_row(node, i, row)
+        self.notify_p_change(node)
+
+    def _update_row(self, node, i, row):
+        """set_row'un kilit altındaki kısmı: N güncellemesi, P satırı, sürüm"""
+        if self._fundamental is not None:
+            transient_nodes, N_fund, col_sums = self._fundamental
+            t_idx, _ = self._split_indices()
+            k = int(np.searchsorted(t_idx, i))
+            d = row[t_idx] - self.P[i, t_idx]
+            changed = np.flatnonzero(d)
+            dN = d[changed] @ N_fund[changed]
+            denom = 1.0 - dN[k]
+            if abs(denom) < 1e-12:
+                raise np.linalg.LinAlgError(
+                    f"{node} düzenlemesinden sonra yutan düğümlere ulaşılamıyor"
+                )
+            column = N_fund[:, k] / denom
+            self._fundamental = (
+                transient_nodes,
+                *_read_only(
+                    N_fund + np.outer(column, dN), col_sums + column.sum() * dN
+                ),
+            )
+            self._fundamental_edits += 1
+
+        self.P[i] = row
+        self._phase_cache = None
+        self.p_version += 1
+        if self._fundamental_edits >= FUNDAMENTAL_REFRESH:
+            self.invalidate_fundamental()
+
+    def analyze_od(self, entries=None):
+        """Başlangıç–varış (OD) analizi: giriş × çıkış ve giriş × kavşak matrisleri
+
+        B = N·R'nin giriş satırları, o girişten gelen aracın hangi çıkıştan
+        ayrıldığını (exit_share, satır toplamı 1), N'nin aynı satırları yol
+        boyunca her kavşağın beklenen ziyaret sayısını verir. Kavşaktan en az
+        bir kez geçme olasılığı N[e, j] / N[j, j]'dir. Önbellekli N ile tüm
+        girişler tek bir çok sağ taraflı çarpımdır.
+        """
+        entries = self.entry_nodes if entries is None else list(entries)
+        transient_nodes, N_fund, _ = self.fundamental()
+        t_idx, a_idx = self._split_indices()
+        rows = np.searchsorted(t_idx, [self.n_map[e] for e in entries])
+        R = self.P[np.ix_(t_idx, a_idx)]
+
+        entry_set = set(entries)
+        junction_cols = np.array(
+            [k for k, node in enumerate(transient_nodes) if node not in entry_set],
+            dtype=int,
+        )
+        visits = N_fund[rows]
+        junction_visits = visits[:, junction_cols]
+        return {
+            "entries": entries,
+            "exits": [self.nodes[i] for i in a_idx],
+            "junctions": [transient_nodes[k] for k in junction_cols],
+            "exit_share": visits @ R,
+            "junction_visits": junction_visits,
+            "junction_reach": junction_visits / N_fund[junction_cols, junction_cols],
+        }
+
+    def _phase_blocks(self, block):
+        """(K = [Q^r·1]_{r < block}, Q^block) — P değişene kadar önbellekte"""
+        if self._phase_cache is None or self._phase_cache[0] != block:
+            t_idx, _ = self._split_indices()
+            Q = self.P[np.ix_(t_idx, t_idx)]
+            K = np.empty((len(t_idx), block))
+            v = np.ones(len(t_idx))
+            for r in range(block):
+                K[:, r] = v
+                v = Q @ v
+            self._phase_cache = (block, K, np.linalg.matrix_power(Q, block))
+        return self._phase_cache[1:]
+
+    def travel_time_distribution(
+        self,
+        entries=None,
+        horizon=24 * 7,
+        tol=1e-9,
+        quantiles=(0.5, 0.9, 0.99),
+        block=24,
+    ):
+        """Girişten çıkışa yolculuk süresinin (saat) faz tipi dağılımı
+
+        Girişi e olan aracın m saat sonra hâlâ ağda olma olasılığı
+        S(m) = (Q^m·1)[e]'dir. Tüm girişler V = E·Q^{kB} satır bloğu olarak
+        birlikte ilerletilir; her blokta S = V·K ile B saat birden okunur
+        (K ve Q^B önbellekte). Kalan olasılık kütlesi tol altına inince ya
+        da horizon saate ulaşınca durulur. Ufuk içinde erişilemeyen
+        yüzdelikler inf döner; ortalama N'nin satır toplamından tamdır.
+        """
+        entries = self.entry_nodes if entries is None else list(entries)
+        t_idx, _ = self._split_indices()
+        rows = np.searchsorted(t_idx, [self.n_map[e] for e in entries])
+        K, QB = self._phase_blocks(block)
+
+        V = np.zeros((len(entries), len(t_idx)))
+        V[np.arange(len(entries)), rows] = 1.0
+        blocks = []
+        for _ in range(0, horizon + 1, block):
+            S = V @ K
+            blocks.append(S)
+            if S[:, -1].max() < tol:
+                break
+            V = V @ QB
+        survival = np.hstack(blocks)[:, : horizon + 1]
+        cdf = 1.0 - survival
+
+        percentiles = {}
+        for q in quantiles:
+            reached = cdf >= q
+            percentiles[q] = np.where(
+                reached.any(axis=1), np.argmax(reached, axis=1), np.inf
+            )
+        _, N_fund, _ = self.fundamental()
+        return {
+            "entries": entries,
+            "hours": np.arange(survival.shape[1]),
+            "survival": survival,
+            "pmf": -np.diff(survival, axis=1),  # pmf[:, m - 1] = P(T = m)
+            "mean": N_fund[rows].sum(axis=1),
+            "percentiles": percentiles,
+            "tail_mass": survival[:, -1],
+        }
+
+    def analyze_link_closures(self, inflow=None, chunk_size=2048):
+        """Her bağlantı tek tek kapatıldığında tepe yük ve yutulma değişimi
+
+        i -> j kapatılınca i satırı yeniden normalize edilir; bu I - Q'nun
+        k. satırında rank-1 değişikliktir. α = p / (1 - p) ile
+        wᵀ = dᵀN = α(N[k] - e_k - [j geçici] N[j]) ve c = (uN)[k] / (1 - w_k)
+        olmak üzere yeni durağan yükler x + c·w, çıkış akışları
+        f + c·(d_R + w·R) olur. Aynı terimle her giriş e için yutulma
+        olasılıkları ΔB[e] = N[e, k] / (1 - w_k) · (d_R + w·R) kadar değişir.
+        Bağlantılar parçalar halinde toplu hesaplanır, hiç ters alma yapılmaz.
+
+        Tepe yük, sabit inflow altındaki durağan yüktür (saatlik simülasyon
+        değil); inflow verilmezse toplam girişi en büyük saatin (Rush Hour)
+        girişi kullanılır ki analyze_bottleneck'in tepe saatiyle örtüşsün.
+        Satırlar tepe yük artışına göre azalan sıradadır; başka çıkışı
+        olmayan (p = 1) ya da ağı kapalı döngüye çeviren kapatmalar
+        feasible=False ve sonsuz tepe yük ile en üstte yer alır.
+        """
+        transient_nodes, N_fund, _ = self.fundamental()
+        t_idx, a_idx = self._split_indices()
+        pos = np.full(self.n_len, -1)
+        pos[t_idx] = np.arange(len(t_idx))
+        exit_pos = np.full(self.n_len, -1)
+        exit_pos[a_idx] = np.arange(len(a_idx))
+        R = self.P[np.ix_(t_idx, a_idx)]
+
+        if inflow is None:
+            inflow = peak_inflow(np.array([self.get_inflow(t) for t in range(24)]))
+        inflow = np.asarray(inflow, dtype=np.float64)
+        entry_rows = pos[[self.n_map[e] for e in self.entry_nodes]]
+        u = inflow[t_idx]
+        g = u @ N_fund  # Beklenen ziyaretler
+        loads = g - u  # Durağan geçici yükler: x = u(N - I)
+        base = int(np.argmax(loads))
+
+        src, dst = self.edges()
+        keep = pos[src] >= 0
+        src, dst = src[keep], dst[keep]
+        p = self.P[src, dst]
+        n_edges = len(src)
+        peak_load = np.empty(n_edges)
+        peak_idx = np.empty(n_edges, dtype=int)
+        exit_change = np.empty((n_edges, len(a_idx)))
+        absorption_change = np.empty((n_edges, len(entry_rows), len(a_idx)))
+        feasible = p < 1
+
+        for start in range(0, n_edges, chunk_size):
+            sl = slice(start, start + chunk_size)
+            k, j = pos[src[sl]], dst[sl]
+            rows = np.arange(len(k))
+            alpha = np.divide(
+                p[sl], 1 - p[sl], out=np.zeros(len(k)), where=feasible[sl]
+            )
 
-        Q = self.P[np.ix_(t_indices, t_indices)]
-        I = np.eye(len(t_indices))
+            W = N_fund[k]
+            W[rows, k] -= 1
+            to_transient = pos[j] >= 0
+            W[to_transient] -= N_fund[pos[j[to_transient]]]
+            W *= alpha[:, None]
+            denom = 1 - W[rows, k]
+            feasible[sl] &= denom > 1e-12
+            c = np.divide(g[k], denom, out=np.zeros(len(k)), where=feasible[sl])
+
+            new_loads = loads + c[:, None] * W
+            peak_idx[sl] = np.argmax(new_loads, axis=1)
+            peak_load[sl] = new_loads[rows, peak_idx[sl]]
+
+            D = alpha[:, None] * R[k]
+            D[~to_transient, exit_pos[j[~to_transient]]] -= alpha[~to_transient]
+            M = D + W @ R
+            exit_change[sl] = c[:, None] * M
+            scale = np.divide(
+                N_fund[np.ix_(entry_rows, k)].T,
+                denom[:, None],
+                out=np.zeros((len(k), len(entry_rows))),
+                where=feasible[sl, None],
+            )
+            absorption_change[sl] = scale[:, :, None] * M[:, None, :]
+
+        peak_load[~feasible] = np.inf
+        exit_change[~feasible] = np.nan
+        absorption_change[~feasible] = np.nan
+        peak_change = peak_load - loads[base]
+        order = np.argsort(-peak_change, kind="stable")
+        return {
+            "baseline": (transient_nodes[base], loads[base]),
+            "edges": [(self.nodes[src[e]], self.nodes[dst[e]]) for e in order],
+            "peak_node": [transient_nodes[i] for i in peak_idx[order]],
+            "peak_load": peak_load[order],
+            "peak_change": peak_change[order],
+            "exit_nodes": [self.nodes[i] for i in a_idx],
+            "exit_change": exit_change[order],
+            "entry_nodes": list(self.entry_nodes),
+            "absorption_change": absorption_change[order],
+            "feasible": feasible[order],
+        }
+
+    def node_index(self, node):
+        """Düğümün P indeksi; bilinmeyen adda açık bir ValueError"""
+        if node not in self.n_map:
+            raise ValueError(f"bilinmeyen düğüm {node!r}")
+        return self.n_map[node]
+
+    def row_from_targets(self, src, targets):
+        """{hedef: olasılık} sözlüğünden (normalize edilmemiş) P satırı"""
+        row = np.zeros(self.n_len)
+        for dst, p in targets.items():
+            p = float(p)
+            if not np.isfinite(p) or p < 0:
+                raise ValueError(f"{src} → {dst} olasılığı geçersiz: {p}")
+            row[self.node_index(dst)] = p
+        return row
+
+    def set_transition(self, src, dst, p):
+        """src -> dst olasılığını p yap, satırın kalanını orantılı ölçekle"""
+        row = self.P[self.n_map[src]].copy()
+        j = self.n_map[dst]
+        rest = row.sum() - row[j]
+        if rest <= 0 and p < 1:
+            raise ValueError(f"{src} satırında dağıtılacak başka bağlantı yok")
+        if rest > 0:
+            row *= (1 - p) / rest
+        row[j] = p
+        self.set_row(src, row)
+
+    def node_positions(self):
+        """Düğüm koordinatları (n, 2); pozisyonu tanımsız düğümler ızgaraya yerleşir"""
+        xy = np.zeros((self.n_len, 2))
+        missing = []
+        for i, node in enumerate(self.nodes):
+            if node in self.positions:
+                xy[i] = self.positions[node]
+            else:
+                missing.append(i)
+        if missing:
+            side = int(np.ceil(np.sqrt(len(missing))))
+            k = np.arange(len(missing))
+            xy[missing] = np.column_stack([k % side, k // side]) / max(side - 1, 1)
+        return xy
+
+    def edges(self):
+        """P'deki (kaynak, hedef) indeks dizileri, kendine dönüşler hariç"""
+        src, dst = np.nonzero(self.P)
+        keep = src != dst
+        return src[keep], dst[keep]
+
+    def _split_indices(self):
+        """Geçici (transient) ve yutan (absorbing) düğüm indekslerini döndür"""
+        absorbing = set(self.absorbing_nodes)
+        t_idx = np.array([i for i, n in enumerate(self.nodes) if n not in absorbing])
+        a_idx = np.array([i for i, n in enumerate(self.nodes) if n in absorbing])
+        return t_idx, a_idx
+
+    def analyze_periodic_steady_state(self, period=24, inflow_fn=None):
+        """Tekrarlayan günlük döngünün periyodik sabit noktasını doğrudan çöz
+
+        Geçici blokta bir günlük harita x ↦ x·Q^period + c'dir. Sabit nokta
+        x0·(I - Q^period) = c tek bir lineer çözümle bulunur; ardından saatlik
+        durumlar ve çıkış düğümlerinin günlük akışı hesaplanır.
+        """
+        inflow_fn = inflow_fn or self.get_inflow
+        t_idx, a_idx = self._split_indices()
+        Q = self.P[np.ix_(t_idx, t_idx)]
+        R = self.P[np.ix_(t_idx, a_idx)]
+        U = np.array([inflow_fn(t) for t in range(period)])
+        U_t, U_a = U[:, t_idx], U[:, a_idx]
+
+        # Günlük bileşik operatör M = Q^period ve sabit terim c
+        M = np.eye(len(t_idx))
+        c = np.zeros(len(t_idx))
+        for t in range(period):
+            M = M @ Q
+            c = (c + U_t[t]) @ Q
 
         try:
-            N_fund = np.linalg.inv(I - Q)
-            col_sums = N_fund.sum(axis=0)
-            struct_bn_idx = np.argmax(col_sums)
-            struct_bn_node = transient_nodes[struct_bn_idx]
-            return struct_bn_node, N_fund
+            x0 = np.linalg.solve((np.eye(len(t_idx)) - M).T, c)
         except np.linalg.LinAlgError:
-            return None, None
+            return None
+
+        states = np.zeros((period, len(t_idx)))
+        exits = np.zeros((period, len(a_idx)))
+        x = x0
+        for t in range(period):
+            z = x + U_t[t]
+            x = z @ Q
+            states[t] = x
+            exits[t] = z @ R + U_a[t]
+
+        return {
+            "transient_nodes": [self.nodes[i] for i in t_idx],
+            "states": states,
+            "exit_nodes": [self.nodes[i] for i in a_idx],
+            "hourly_exits": exits,
+            "daily_exits": dict(zip([self.nodes[i] for i in a_idx], exits.sum(axis=0))),
+        }
+
+    def calibrate_matrix(
+        self,
+        history,
+        inflows,
+        pattern=None,
+        initial_state=None,
+        max_iter=50,
+        ridge=1e-9,
+        chunk_size=4096,
+        min_flow=0.1,
+        min_snr=3.0,
+    ):
+        """Gözlenen saatlik düğüm sayımlarından P matrisini tahmin et
+
+        history[t] = (history[t-1] + inflows[t]) · P modeline kısıtlı en küçük
+        kareler (aktif küme) ile uyum sağlanır: her satır stokastik olmalı ve
+        yalnızca pattern'de izin verilen geçişler sıfırdan farklı olabilir.
+        Üzerinden akış gözlenmeyen düğümlerin satırları veriden belirlenemez:
+        history + inflows RMS değeri sayım gürültüsünün min_snr katından (ve
+        en az min_flow araçtan) küçükse satır mevcut P'de (pattern'e
+        izdüşürülerek) kalır ve tanılamada "prior_rows" olarak listelenir.
+        Gürültü, araç korunumundan kestirilir: gürültüsüz veride her saat
+        Σ history[t] = Σ (history[t-1] + inflows[t])'dir, sapma yalnızca
+        sayım hatasıdır. (Tahmini P, tanılama sözlüğü) döndürür.
+        """
+        X = np.asarray(history, dtype=np.float64)
+        U = np.asarray(inflows, dtype=np.float64)
+        n = self.n_len
+        mask = (self.P > 0) if pattern is None else np.asarray(pattern, dtype=bool)
+        x0 = np.zeros(n) if initial_state is None else np.asarray(initial_state)
+
+        # Yeterli istatistikler: G = ZᵀZ, C = ZᵀX (Z[t] = X[t-1] + U[t])
+        # Veri parça parça işlenir, aylarca veri için bellek sınırlı kalır
+        G = np.zeros((n, n))
+        C = np.zeros((n, n))
+        x_sq = np.zeros(n)
+        x_sum = np.zeros(n)
+        drift_sq = 0.0
+        prev = x0
+        for start in range(0, len(X), chunk_size):
+            X_c = X[start : start + chunk_size]
+            Z_c = np.vstack([prev[None, :], X_c[:-1]]) + U[start : start + chunk_size]
+            G += Z_c.T @ Z_c
+            C += Z_c.T @ X_c
+            x_sq += np.einsum("ij,ij->j", X_c, X_c)
+            x_sum += X_c.sum(axis=0)
+            drift_sq += float(((X_c.sum(axis=1) - Z_c.sum(axis=1)) ** 2).sum())
+            prev = X_c[-1]
+
+        # Tek çıkışlı satırlar (yutan düğümler, girişler) sabittir
+        T = len(X)
+        fixed = mask.sum(axis=1) <= 1
+        P_hat = np.where(mask & fixed[:, None], 1.0, 0.0)
+
+        # Akış görmeyen satırlarda yalnızca gürültü vardır: önceki P korunur.
+        # Bağımsız düğüm gürültüsü σ ile korunum sapmasının varyansı ≈ 2nσ²
+        noise = np.sqrt(drift_sq / max(2 * n * T, 1))
+        threshold = max(min_flow, min_snr * noise)
+        unobserved = ~fixed & (np.sqrt(np.diag(G) / max(T, 1)) < threshold)
+        P_hat[unobserved] = _project_rows_to_simplex(
+            self.P[unobserved], mask[unobserved]
+        )
+        fixed |= unobserved
+        free = ~fixed
+
+        iterations = 0
+        converged = True
+        if free.any():
+            k = int(free.sum())
+            # Gözlenmeyen satırlar için önceki P'ye doğru küçük ridge terimi
+            G_vv = G[np.ix_(free, free)]
+            eps = ridge * max(float(np.trace(G_vv)) / k, 1.0)
+            G_vv = G_vv + eps * np.eye(k)
+            C_v = C[free] - G[np.ix_(free, fixed)] @ P_hat[fixed] + eps * self.P[free]
+            mask_v = mask[free]
+            active = mask_v.copy()
+            ones = np.ones(k)
+
+            # Aktif küme yöntemi: her sütun için KKT sistemi, satır toplamı
+            # kısıtları Lagrange çarpanları (lam) ile birleştirilir
+            converged = False
+            for iterations in range(1, max_iter + 1):
+                M = np.zeros((k, k))
+                r = -ones
+                solves = []
+                for j in range(n):
+                    S = np.flatnonzero(active[:, j])
+                    if len(S) == 0:
+                        continue
+                    A_inv = np.linalg.inv(G_vv[np.ix_(S, S)])
+                    M[np.ix_(S, S)] += A_inv
+                    r[S] += A_inv @ C_v[S, j]
+                    solves.append((j, S, A_inv))
+                lam = np.linalg.lstsq(M, r, rcond=None)[0]
+                P_v = np.zeros((k, n))
+                for j, S, A_inv in solves:
+                    P_v[S, j] = A_inv @ (C_v[S, j] - lam[S])
+
+                # Negatif olasılıklar kümeden çıkar, KKT'yi ihlal edenler geri girer
+                neg = active & (P_v < -1e-12)
+                if neg.any():
+                    keep = P_v == np.where(active, P_v, -np.inf).max(
+                        axis=1, keepdims=True
+                    )
+                    active &= ~(neg & ~keep)
+                    continue
+                grad = G_vv @ P_v - C_v + lam[:, None]
+                enter = mask_v & ~active & (grad < -1e-9 * eps)
+                if not enter.any():
+                    converged = True
+                    break
+                active |= enter
+            P_hat[free] = _project_rows_to_simplex(P_v, mask_v)
+
+        # Uyum tanılamaları (artıklar G ve C üzerinden, veri tekrar okunmadan)
+        ss_res = np.maximum(
+            np.einsum("ij,ij->j", P_hat, G @ P_hat)
+            - 2.0 * np.einsum("ij,ij->j", P_hat, C)
+            + x_sq,
+            0.0,
+        )
+        ss_tot = x_sq - x_sum**2 / max(T, 1)
+        diagnostics = {
+            "rmse": float(np.sqrt(ss_res.sum() / max(T * n, 1))),
+            "r2": float(1.0 - ss_res.sum() / max(ss_tot.sum(), 1e-300)),
+            "node_rmse": dict(zip(self.nodes, np.sqrt(ss_res / max(T, 1)))),
+            "iterations": iterations,
+            "converged": converged,
+            "max_row_error": float(
+                np.abs(P_hat[mask.any(axis=1)].sum(axis=1) - 1).max()
+            ),
+            "prior_rows": [self.nodes[i] for i in np.flatnonzero(unobserved)],
+            "noise": float(noise),
+        }
+        return P_hat, diagnostics
+
+
+class InflowForecaster:
+    """Giriş düğümleri için artımlı kısa vadeli tahmin (tüm girişler vektörel)
+
+    "holt_winters": toplamsal Holt-Winters (seviye, eğilim, 24 saatlik
+    mevsim). "seasonal_naive": dünün aynı saati. Her gözlem giriş başına
+    O(1) güncellemedir; geçmiş saklanmaz, yeniden uydurma yapılmaz. Mevsim
+    başlangıçta simülasyonun get_inflow profilinden alınır. Tahmin
+    aralıkları, bir adımlık hataların üstel ortalama varyansından
+    Holt-Winters yayılım katsayılarıyla genişletilir.
+    """
+
+    def __init__(
+        self,
+        sim,
+        nodes=None,
+        method="holt_winters",
+        alpha=0.3,
+        beta=0.05,
+        gamma=0.2,
+        period=24,
+        start_hour=0,
+    ):
+        self.sim = sim
+        self.nodes = list(nodes or sim.entry_nodes)
+        self.columns = np.array([sim.n_map[node] for node in self.nodes])
+        self.method = method
+        self.alpha, self.beta, self.gamma = alpha, beta, gamma
+        self.period = period
+        self.hour = start_hour  # Sıradaki gözlemin döngüdeki yeri
+
+        profile = np.array([sim.get_inflow(h % 24) for h in range(period)])
+        profile = profile[:, self.columns]
+        self.last_cycle = profile.copy()  # Mevsimsel naif için son döngü
+        self.level = profile.mean(axis=0)
+        self.trend = np.zeros(len(self.nodes))
+        self.season = profile - self.level
+        self.variance = np.zeros(len(self.nodes))
+        self.observations = 0
+
+    def _predict(self, steps):
+        h = (self.hour + np.arange(steps)) % self.period
+        if self.method == "seasonal_naive":
+            return self.last_cycle[h]
+        j = np.arange(1, steps + 1)[:, None]
+        return self.level + j * self.trend + self.season[h]
+
+    def update(self, counts):
+        """Yeni saatlik sayımlar (girişler sırasıyla) ile durumu güncelle"""
+        y = np.asarray(counts, dtype=np.float64)
+        s = self.hour % self.period
+        error = y - self._predict(1)[0]
+        weight = 1.0 / min(self.observations + 1, self.period)
+        self.variance += weight * (error**2 - self.variance)
+
+        previous = self.level
+        self.level = self.alpha * (y - self.season[s]) + (1 - self.alpha) * (
+            self.level + self.trend
+        )
+        self.trend = self.beta * (self.level - previous) + (1 - self.beta) * self.trend
+        self.season[s] = (
+            self.gamma * (y - self.level) + (1 - self.gamma) * self.season[s]
+        )
+        self.last_cycle[s] = y
+        self.hour += 1
+        self.observations += 1
+
+    def forecast(self, steps, z=1.645):
+        """(alt, ortalama, üst) tahminleri, her biri (steps, girişler)
+
+        z varsayılan olarak %90 aralığa karşılık gelir; değerler sıfırda
+        kırpılır.
+        """
+        mean = self._predict(steps)
+        if self.method == "seasonal_naive":
+            # Her tam döngü aynı gözlemi yeniden kullandığı için hata birikir
+            growth = 1 + np.arange(steps) // self.period
+        else:
+            i = np.arange(1, steps)
+            c = self.alpha * (1 + i * self.beta) + self.gamma * (i % self.period == 0)
+            growth = 1 + np.concatenate([[0.0], np.cumsum(c**2)])
+        spread = z * np.sqrt(growth[:, None] * self.variance)
+        return (
+            np.maximum(mean - spread, 0.0),
+            np.maximum(mean, 0.0),
+            np.maximum(mean + spread, 0.0),
+        )
+
+    def inflow_matrix(self, values):
+        """Giriş tahminlerini (steps, girişler) simülasyon girişine (steps, n) yay"""
+        U = np.zeros((len(values), self.sim.n_len))
+        U[:, self.columns] = values
+        return U
+
+
+def _array_key(*arrays):
+    """Dizilerin içeriğinden önbellek anahtarı üret"""
+    digest = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        digest.update(f"{a.shape}{a.dtype.str}".encode())
+        digest.update(a)
+    return digest.hexdigest()
+
+
+def _pool_matrix(M, max_pixels):
+    """Büyük matrisi blok maksimumu ile en fazla max_pixels kenarlı görüntüye indir"""
+    factor = max(1, int(np.ceil(max(M.shape) / max_pixels)))
+    if factor == 1:
+        return M
+    rows = -(-M.shape[0] // factor) * factor
+    cols = -(-M.shape[1] // factor) * factor
+    padded = np.zeros((rows, cols), dtype=M.dtype)
+    padded[: M.shape[0], : M.shape[1]] = M
+    return padded.reshape(rows // factor, factor, cols // factor, factor).max(
+        axis=(1, 3)
+    )
+
+
+class FigureCache:
+    """Agg ile ekran dışında çizilen figürlerin PNG önbelleği (LRU)
+
+    Girdiler (P veya geçmiş) değişmedikçe figür tekrar çizilmez; aynı
+    anahtarla gelen açılışlarda hazır bitmap kullanılır.
+    """
+
+    def __init__(self, max_items=32):
+        self.max_items = max_items
+        self.items = OrderedDict()
+
+    def get_or_render(self, key, render):
+        """(png baytları, eksen yerleşimi) döndür, yoksa render() ile çiz"""
+        if key in self.items:
+            self.items.move_to_end(key)
+            return self.items[key]
+
+        fig = render()
+        FigureCanvasAgg(fig)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+        layout = {
+            "size": fig.bbox.bounds[2:],
+            "axes": [ax.get_window_extent().bounds for ax in fig.axes],
+        }
+        self.items[key] = (buffer.getvalue(), layout)
+        if len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+        return self.items[key]
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def show_cached_figure(master, key, render, bg=None):
+    """Önbellekteki figürü (gerekirse çizip) bir Label içinde göster"""
+    png, layout = FIGURE_CACHE.get_or_render(key, render)
+    image = tk.PhotoImage(data=base64.b64encode(png))
+    label = tk.Label(
+        master, image=image, bg=bg or COLORS["bg_card"], bd=0, highlightthickness=0
+    )
+    label.image = image  # Referans tutulmazsa görüntü silinir
+    label.pack(padx=10, pady=10)
+    return label, layout
+
+
+def _figure_size(widget, default):
+    """Widget'ın piksel boyutunu inç cinsinden figür boyutuna çevir"""
+    widget.update_idletasks()
+    width, height = widget.winfo_width() - 20, widget.winfo_height() - 20
+    if width < 100 or height < 100:
+        return default
+    return width / 100, height / 100
+
+
+class HistoryPyramid:
+    """Uzun zaman serileri için çok çözünürlüklü min/max piramidi
+
+    Seviye L, ham seriyi 2**L uzunluğunda kovalara böler ve her kovanın
+    en küçük / en büyük değerini konumlarıyla saklar. Görünür aralık için
+    kova sayısı bütçeyi aşmayan en ince seviye seçildiğinden, geçmişin
+    uzunluğundan bağımsız olarak en fazla ~2 * budget nokta çizilir.
+    extend() yeni örnekleri ekler ve her seviyede yalnızca etkilenen son
+    kovaları yeniden hesaplar: k örnek için O(k + log T).
+    """
+
+    def __init__(self, series):
+        series = np.asarray(series, dtype=np.float64)
+        self.width = 1 if series.ndim == 1 else series.shape[1]
+        self.length = 0
+        self._series = np.empty((max(len(series), 16), self.width))
+        # Seviye başına [lo_i, lo_v, hi_i, hi_v] tamponları ve dolu kova sayısı
+        self._levels = []
+        self.counts = []
+        self.extend(series)
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def series(self):
+        return self._series[: self.length]
+
+    @property
+    def levels(self):
+        return [
+            tuple(buffer[:count] for buffer in buffers)
+            for buffers, count in zip(self._levels, self.counts)
+        ]
+
+    @staticmethod
+    def _reserve(buffer, size):
+        """Tamponu en az size satıra büyüt (kapasite ikiye katlanır)"""
+        if len(buffer) >= size:
+            return buffer
+        grown = np.empty((max(size, 2 * len(buffer)),) + buffer.shape[1:], buffer.dtype)
+        grown[: len(buffer)] = buffer
+        return grown
+
+    def extend(self, samples):
+        """Yeni örnekleri (k, width) ekle, etkilenen kovaları güncelle"""
+        samples = np.asarray(samples, dtype=np.float64).reshape(-1, self.width)
+        if not len(samples):
+            return
+        first = self.length
+        self._series = self._reserve(self._series, self.length + len(samples))
+        self._series[first : first + len(samples)] = samples
+        self.length += len(samples)
+
+        # Seviye L'nin b. kovası, L-1'in 2b ve 2b+1 kovalarının birleşimidir
+        # (tek sayıda kova varsa sonuncusu kendisiyle birleşir)
+        below = self.length
+        level = 0
+        while below > 1:
+            count = (below + 1) // 2
+            if level == len(self._levels):
+                self._levels.append(
+                    [
+                        np.empty((0, self.width), dtype=np.intp),
+                        np.empty((0, self.width)),
+                        np.empty((0, self.width), dtype=np.intp),
+                        np.empty((0, self.width)),
+                    ]
+                )
+                self.counts.append(0)
+            first = min(first // 2, self.counts[level])
+            pairs = np.arange(first, count)
+            a, b = 2 * pairs, np.minimum(2 * pairs + 1, below - 1)
+
+            if level == 0:
+                lo_i = hi_i = None  # Ham seride konum satırın kendisidir
+                lo_v = hi_v = self.series
+            else:
+                lo_i, lo_v, hi_i, hi_v = self._levels[level - 1]
+            buffers = self._levels[level]
+            cols = np.arange(self.width)
+            for slot, index, values, pick in (
+                (0, lo_i, lo_v, np.argmin),
+                (2, hi_i, hi_v, np.argmax),
+            ):
+                choice = pick(np.stack([values[a], values[b]], axis=1), axis=1)
+                rows = np.where(choice == 0, a[:, None], b[:, None])
+                for k in (slot, slot + 1):
+                    buffers[k] = self._reserve(buffers[k], count)
+                buffers[slot][first:count] = (
+                    rows if index is None else index[rows, cols]
+                )
+                buffers[slot + 1][first:count] = values[rows, cols]
+            self.counts[level] = count
+            below = count
+            level += 1
+
+    def level_for(self, x0, x1, budget):
+        """[x0, x1] aralığında en fazla budget kova veren seviye (0 = ham)"""
+        span = max(x1 - x0, 1)
+        level = max(0, int(np.ceil(np.log2(span / max(budget, 1)))))
+        return min(level, len(self.levels))
+
+    def query(self, x0, x1, budget):
+        """Görünür aralık için (x, y) dizileri, her biri (noktalar, seri) biçiminde"""
+        length = len(self.series)
+        level = self.level_for(x0, x1, budget)
+        if level == 0:
+            a = max(int(np.floor(x0)) - 1, 0)
+            b = min(int(np.ceil(x1)) + 2, length)
+            x = np.broadcast_to(np.arange(a, b)[:, None], self.series[a:b].shape)
+            return x, self.series[a:b]
+
+        lo_i, lo_v, hi_i, hi_v = self.levels[level - 1]
+        width = 2**level
+        a = max(int(np.floor(x0 / width)) - 1, 0)
+        b = min(int(np.ceil(x1 / width)) + 1, len(lo_v))
+        lo_i, lo_v, hi_i, hi_v = lo_i[a:b], lo_v[a:b], hi_i[a:b], hi_v[a:b]
+
+        # Her kovadan min ve max, zamandaki sıralarıyla art arda
+        first = lo_i <= hi_i
+        x = np.stack([np.where(first, lo_i, hi_i), np.where(first, hi_i, lo_i)], 1)
+        y = np.stack([np.where(first, lo_v, hi_v), np.where(first, hi_v, lo_v)], 1)
+        return x.reshape(-1, x.shape[2]), y.reshape(-1, y.shape[2])
+
+
+def draw_load_chart(ax1, sim, history):
+    """Saatlik düğüm yoğunluklarını (N5-N8) çiz"""
+    # Grafik 1: Düğüm yoğunlukları
+    ax1.set_facecolor(COLORS["graph_bg"])
+
+    colors_plot = ["#e94560", "#4ecca3", "#ffc107", "#00d9ff"]
+    target_nodes = ["N5", "N6", "N7", "N8"]
+
+    # Uzun geçmişler eksen genişliği kadar min/max noktasına indirilir
+    pyramid = HistoryPyramid(history[:, [sim.n_map[n] for n in target_nodes]])
+    last = len(history) - 1
+    budget = int(ax1.bbox.width)
+    hours, loads = pyramid.query(0, last, budget)
+    raw = pyramid.level_for(0, last, budget) == 0
+
+    for i, node in enumerate(target_nodes):
+        ax1.plot(
+            hours[:, i],
+            loads[:, i],
+            label=f"{node}",
+            color=colors_plot[i],
+            linewidth=2.5,
+            marker="o" if raw else None,
+            markersize=4,
+        )
+
+    # Rush hour bölgelerini vurgula (her gün 08:00 ve 17:00)
+    for day_start in range(0, len(history), 24):
+        ax1.axvspan(
+            day_start + 7.5,
+            day_start + 8.5,
+            alpha=0.3,
+            color="#e94560",
+            label="Rush Hour" if day_start == 0 else None,
+        )
+        ax1.axvspan(day_start + 16.5, day_start + 17.5, alpha=0.3, color="#e94560")
+
+    ax1.set_title(
+        "🚦 Saatlik Düğüm Yoğunlukları",
+        fontsize=14,
+        fontweight="bold",
+        color=COLORS["text"],
+        pad=15,
+    )
+    ax1.set_xlabel("Saat", fontsize=10, color=COLORS["text_muted"])
+    ax1.set_ylabel("Araç Sayısı", fontsize=10, color=COLORS["text_muted"])
+    ax1.legend(
+        loc="upper right",
+        facecolor=COLORS["bg_card"],
+        edgecolor=COLORS["accent"],
+        labelcolor=COLORS["text"],
+    )
+    ax1.grid(True, alpha=0.2, color=COLORS["text_muted"])
+    ax1.tick_params(colors=COLORS["text_muted"])
+    if len(history) <= 48:
+        ax1.set_xticks(range(0, len(history), 2))
+
+    for spine in ax1.spines.values():
+        spine.set_color(COLORS["text_muted"])
+        spine.set_alpha(0.3)
+
+
+def draw_load_heatmap(fig, ax2, sim, history):
+    """Geçici düğümlerin saatlik yoğunluk haritasını çiz"""
+    # Grafik 2: Tüm düğümlerin heatmap'i
+    ax2.set_facecolor(COLORS["graph_bg"])
+
+    # Sadece transient (geçici) düğümleri göster
+    transient_nodes = [n for n in sim.nodes if n not in sim.absorbing_nodes]
+    transient_indices = [sim.n_map[n] for n in transient_nodes]
+    transient_data = history[:, transient_indices].T
+
+    im = ax2.imshow(transient_data, aspect="auto", cmap="hot", interpolation="nearest")
+    ax2.set_yticks(range(len(transient_nodes)))
+    ax2.set_yticklabels(transient_nodes)
+    ax2.set_xticks(range(0, len(history), 2))
+    ax2.set_xlabel("Saat", fontsize=10, color=COLORS["text_muted"])
+    ax2.set_title(
+        "🔥 Trafik Yoğunluk Haritası (Heatmap)",
+        fontsize=14,
+        fontweight="bold",
+        color=COLORS["text"],
+        pad=15,
+    )
+    ax2.tick_params(colors=COLORS["text_muted"])
+
+    cbar = fig.colorbar(im, ax=ax2, shrink=0.8)
+    cbar.ax.tick_params(colors=COLORS["text_muted"])
+    cbar.set_label("Araç Sayısı", color=COLORS["text_muted"])
+
+
+def transition_details(sim, P):
+    """P'nin metin özeti: yutan düğümler, direkt geçişler, kavşak dağılımları"""
+
+    def role(node):
+        if node in sim.absorbing_nodes:
+            return "Çıkış"
+        return "Giriş" if node in sim.entry_nodes else "Kavşak"
+
+    absorbing = [sim.n_map[node] for node in sim.absorbing_nodes]
+    lines = ["═══ YUTAN DÜĞÜMLER ═══", "(Çıkış Noktaları)", ""]
+    lines += [f"  • {sim.nodes[i]} → {sim.nodes[i]} ({P[i, i]:.1f})" for i in absorbing]
+
+    direct, spread = [], []
+    for i in np.flatnonzero(~np.isin(np.arange(sim.n_len), absorbing)):
+        targets = np.flatnonzero(P[i])
+        (direct if len(targets) == 1 else spread).append((i, targets))
+
+    lines += ["", "═══ DİREKT GEÇİŞLER ═══", ""]
+    for i, targets in direct:
+        src, dst = sim.nodes[i], sim.nodes[targets[0]]
+        lines += [f"  • {src} → {dst} ({P[i, targets[0]]:.1f})"]
+        lines += [f"    {role(src)} → {role(dst)}", ""]
+
+    lines += ["═══ KAVŞAK DAĞILIMLARI ═══", ""]
+    for i, targets in spread:
+        lines.append(f"  {sim.nodes[i]} düğümünden:")
+        for j in targets:
+            filled = int(P[i, j] * 10)
+            bar = "█" * filled + "░" * (10 - filled)
+            lines.append(f"    → {sim.nodes[j]}: {bar} {P[i, j]:.0%}")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def draw_fundamental_matrix(fig, ax, sim, N_fund):
+    """Fundamental matrisi (beklenen ziyaret sayıları) heatmap olarak çiz"""
+    transient_nodes = [n for n in sim.nodes if n not in sim.absorbing_nodes]
+    ax.set_facecolor(COLORS["graph_bg"])
+    im = ax.imshow(N_fund, cmap="YlOrRd", aspect="auto", interpolation="nearest")
+    ax.set_xticks(range(len(transient_nodes)))
+    ax.set_yticks(range(len(transient_nodes)))
+    ax.set_xticklabels(transient_nodes, fontsize=8, rotation=45)
+    ax.set_yticklabels(transient_nodes, fontsize=8)
+    ax.set_title(
+        "⚖ Fundamental Matris N = (I - Q)⁻¹",
+        fontsize=14,
+        fontweight="bold",
+        color=COLORS["text"],
+        pad=15,
+    )
+    ax.tick_params(colors=COLORS["text_muted"])
+
+    cbar = fig.colorbar(im, ax=ax, shrink=0.8)
+    cbar.ax.tick_params(colors=COLORS["text_muted"])
+    cbar.set_label("Beklenen Ziyaret", color=COLORS["text_muted"])
+
+
+def load_scenarios(path):
+    """JSON senaryo dosyasını oku (liste ya da {"scenarios": [...]})"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["scenarios"] if isinstance(data, dict) else data
+
+
+def build_scenario(spec):
+    """Senaryo tanımından (simülasyon, giriş matrisi (T, n)) oluştur
+
+    Desteklenen alanlar: "hours", "inflows" ({düğüm: sabit ya da saatlik
+    liste}, listeler saat ekseninde tekrarlanır), "transitions"
+    ({kaynak: {hedef: olasılık}} satır değişiklikleri, arayüzdeki gibi
+    set_row ile 1'e normalize edilir), "precision" ve "dwell_times"
+    ({düğüm: saat}, sürekli zaman modu için). "incidents" (zaman pencereli
+    satır değişiklikleri) simülasyonu çalıştıranlarca motora ayrıca
+    verilir; burada yalnızca doğrulanır. Hatalı tanım, senaryo adını ve
+    sorunlu düğümü içeren bir ValueError fırlatır.
+    """
+    sim = TrafficSimulation()
+    try:
+        hours = int(spec.get("hours", 24))
+        if hours <= 0:
+            raise ValueError(f"geçersiz saat sayısı {hours}")
+        for src, targets in spec.get("transitions", {}).items():
+            sim.node_index(src)
+            sim.set_row(src, sim.row_from_targets(src, targets))
+
+        precision = spec.get("precision", sim.precision)
+        if precision not in PRECISION_MODES:
+            raise ValueError(f"bilinmeyen hassasiyet modu {precision!r}")
+        sim.precision = precision
+        for node, dwell in spec.get("dwell_times", {}).items():
+            sim.node_index(node)
+            if not float(dwell) > 0:
+                raise ValueError(f"{node} için bekleme süresi pozitif olmalı")
+            sim.dwell_times[node] = float(dwell)
+
+        inflows = np.array([sim.get_inflow(t % 24) for t in range(hours)])
+        inflows = inflows.reshape(hours, sim.n_len)
+        for node, values in spec.get("inflows", {}).items():
+            values = np.resize(np.asarray(values, float), hours)
+            if not np.all(np.isfinite(values) & (values >= 0)):
+                raise ValueError(f"{node} girişleri negatif olmayan sayılar olmalı")
+            inflows[:, sim.node_index(node)] = values
+        sim._compile_incidents(spec.get("incidents"), (), hours)
+    except ValueError as exc:
+        raise ValueError(f"Senaryo {spec.get('name', '?')!r}: {exc}") from None
+    return sim, inflows
+
+
+def _scenario_slug(position, spec):
+    name = re.sub(r"[^A-Za-z0-9_-]+", "_", str(spec.get("name", "senaryo")))
+    return f"{position:04d}_{name.strip('_') or 'senaryo'}"
+
+
+# Rapor işçisi başına tek figür şablonu (her senaryoda temizlenip yeniden kullanılır)
+_REPORT_FIGURE = None
+
+
+def _init_report_worker():
+    global _REPORT_FIGURE
+    _REPORT_FIGURE = Figure(figsize=(10, 4.5), facecolor=COLORS["bg_card"])
+    FigureCanvasAgg(_REPORT_FIGURE)
+
+
+def _render_scenario_report(position, spec, out_dir):
+    """Tek senaryoyu simüle et, PNG grafiklerini ve JSON özetini yaz"""
+    if _REPORT_FIGURE is None:
+        _init_report_worker()
+    fig = _REPORT_FIGURE
+
+    sim, inflows = build_scenario(spec)
+    history = np.asarray(
+        sim.run_batch_simulation(inflows, incidents=spec.get("incidents")),
+        dtype=np.float64,
+    )
+    bn_node, bn_val = sim.analyze_bottleneck(history)
+    struct_node, N_fund = sim.analyze_steady_state()
+
+    slug = _scenario_slug(position, spec)
+    charts = [
+        ("load", lambda: draw_load_chart(fig.add_subplot(111), sim, history)),
+        ("heatmap", lambda: draw_load_heatmap(fig, fig.add_subplot(111), sim, history)),
+    ]
+    if N_fund is not None:
+        charts.append(
+            (
+                "fundamental",
+                lambda: draw_fundamental_matrix(fig, fig.add_subplot(111), sim, N_fund),
+            )
+        )
+
+    images = {}
+    for kind, draw in charts:
+        fig.clf()
+        draw()
+        fig.tight_layout(pad=2)
+        images[kind] = f"{slug}_{kind}.png"
+        fig.savefig(os.path.join(out_dir, images[kind]), facecolor=fig.get_facecolor())
+
+    t_idx, a_idx = sim._split_indices()
+    summary = {
+        "name": spec.get("name", slug),
+        "hours": len(history),
+        "bottleneck": {"node": bn_node, "max_load": float(bn_val)},
+        "structural_bottleneck": struct_node,
+        "expected_visits": (
+            dict(zip([sim.nodes[i] for i in t_idx], N_fund.sum(axis=0).tolist()))
+            if N_fund is not None
+            else None
+        ),
+        "total_exits": {sim.nodes[i]: float(history[-1, i]) for i in a_idx},
+        "images": images,
+        "summary_file": f"{slug}.json",
+    }
+    with open(
+        os.path.join(out_dir, summary["summary_file"]), "w", encoding="utf-8"
+    ) as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def _write_report_index(summaries, out_dir):
+    with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(summaries, f, ensure_ascii=False, indent=2)
+
+    rows = []
+    for summary in summaries:
+        thumbs = "".join(
+            f'<a href="{html.escape(src)}"><img src="{html.escape(src)}" width="240"></a>'
+            for src in summary["images"].values()
+        )
+        rows.append(
+            "<tr>"
+            f'<td><a href="{html.escape(summary["summary_file"])}">'
+            f'{html.escape(str(summary["name"]))}</a></td>'
+            f'<td>{html.escape(summary["bottleneck"]["node"])} '
+            f'({summary["bottleneck"]["max_load"]:,.0f})</td>'
+            f'<td>{html.escape(str(summary["structural_bottleneck"]))}</td>'
+            f"<td>{thumbs}</td>"
+            "</tr>"
+        )
+    page = (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        "<title>Trafik Senaryo Raporu</title></head>"
+        f'<body style="background:{COLORS["bg_dark"]};color:{COLORS["text"]};'
+        'font-family:sans-serif"><h1>🚦 Trafik Senaryo Raporu</h1>'
+        '<table cellpadding="6"><tr><th>Senaryo</th><th>Darboğaz</th>'
+        "<th>Yapısal Darboğaz</th><th>Grafikler</th></tr>"
+        + "".join(rows)
+        + "</table></body></html>"
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def generate_reports(scenarios, out_dir, jobs=None):
+    """Senaryo listesi için başsız (headless) rapor üret
+
+    Her senaryo bir süreç havuzunda Agg ile çizilir; sonunda birleşik
+    index.json ve index.html yazılır. jobs=1 seri çalıştırır.
+    """
+    for spec in scenarios:
+        build_scenario(spec)  # Hatalı tanım işçide değil burada açıkça düşer
+    os.makedirs(out_dir, exist_ok=True)
+    args = [(i, spec, out_dir) for i, spec in enumerate(scenarios)]
+    if jobs == 1 or len(scenarios) <= 1:
+        summaries = [_render_scenario_report(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_report_worker
+        ) as pool:
+            summaries = list(
+                pool.map(
+                    _render_scenario_report,
+                    *zip(*args),
+                    chunksize=max(1, len(args) // (4 * (jobs or os.cpu_count() or 1))),
+                )
+            )
+    _write_report_index(summaries, out_dir)
+    return summaries
+
+
+# Toplu çalıştırıcının senaryo başına isteyebileceği analizler
+BATCH_ANALYSES = (
+    "steady_state",
+    "periodic",
+    "od",
+    "travel_time",
+    "link_closures",
+    "ctmc",
+)
+
+
+def peak_inflow(inflows):
+    """(T, n) giriş serisinden toplam girişi en büyük saatin giriş vektörü"""
+    inflows = np.asarray(inflows, dtype=np.float64)
+    return inflows[np.argmax(inflows.sum(axis=1))]
+
+
+def _to_json(value):
+    """numpy değerlerini içeren sonuçları JSON'a yazılabilir hale getir"""
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _to_json(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def _batch_task_key(kind, spec, sim, inflows):
+    """Hesaplamanın gerçekten bağlı olduğu girdilerden içerik anahtarı"""
+    settings = json.dumps(
+        [sim.precision, spec.get("incidents", [])], sort_keys=True
+    ).encode()
+    inputs = {
+        "simulation": (sim.P, inflows, np.frombuffer(settings, np.uint8)),
+        "steady_state": (sim.P,),
+        "periodic": (sim.P, np.resize(inflows, (24, sim.n_len))),
+        "od": (sim.P,),
+        "travel_time": (sim.P,),
+        "link_closures": (sim.P, peak_inflow(inflows)),
+        "ctmc": (
+            sim.P,
+            inflows,
+            np.array([sim.dwell_times.get(node, 1.0) for node in sim.nodes]),
+        ),
+    }[kind]
+    return f"{kind}-{_array_key(*inputs)}"
+
+
+def _run_batch_task(kind, spec, key, objects_dir):
+    """Tekilleştirilmiş tek bir hesaplamayı çalıştır: (sonuç, saniye) döndür"""
+    start = time.perf_counter()
+    sim, inflows = build_scenario(spec)
+
+    if kind == "simulation":
+        history = np.asarray(
+            sim.run_batch_simulation(inflows, incidents=spec.get("incidents")),
+            dtype=np.float64,
+        )
+        np.save(os.path.join(objects_dir, f"{key}.npy"), history)
+        bn_node, bn_val = sim.analyze_bottleneck(history)
+        _, a_idx = sim._split_indices()
+        result = {
+            "bottleneck": {"node": bn_node, "max_load": bn_val},
+            "total_exits": {sim.nodes[i]: history[-1, i] for i in a_idx},
+            "history_file": os.path.join("objects", f"{key}.npy"),
+        }
+    elif kind == "steady_state":
+        node, N_fund = sim.analyze_steady_state()
+        result = {
+            "structural_bottleneck": node,
+            "expected_visits": (
+                None
+                if N_fund is None
+                else dict(zip(sim.fundamental()[0], N_fund.sum(axis=0)))
+            ),
+        }
+    elif kind == "periodic":
+        periodic = sim.analyze_periodic_steady_state(
+            inflow_fn=lambda t: inflows[t % len(inflows)]
+        )
+        result = periodic and {"daily_exits": periodic["daily_exits"]}
+    elif kind == "od":
+        od = sim.analyze_od()
+        result = {k: od[k] for k in ("entries", "exits", "junctions", "exit_share")}
+    elif kind == "travel_time":
+        travel = sim.travel_time_distribution()
+        result = {
+            "entries": travel["entries"],
+            "mean": travel["mean"],
+            "percentiles": travel["percentiles"],
+        }
+    elif kind == "link_closures":
+        closures = sim.analyze_link_closures(inflow=peak_inflow(inflows))
+        result = {
+            "baseline": closures["baseline"],
+            "ranking": [
+                {
+                    "edge": edge,
+                    "peak_node": node,
+                    "peak_change": change,
+                    "absorption_change": {
+                        entry: dict(zip(closures["exit_nodes"], row))
+                        for entry, row in zip(closures["entry_nodes"], delta)
+                    },
+                }
+                for edge, node, change, delta in zip(
+                    closures["edges"][:10],
+                    closures["peak_node"][:10],
+                    closures["peak_change"][:10],
+                    closures["absorption_change"][:10],
+                )
+            ],
+        }
+    else:
+        times, history = sim.run_ctmc_simulation(inflows=inflows)
+        peak = np.unravel_index(np.argmax(history), history.shape)
+        _, a_idx = sim._split_indices()
+        result = {
+            "peak": {"node": sim.nodes[peak[1]], "hour": times[peak[0]]},
+            "total_exits": {sim.nodes[i]: history[-1, i] for i in a_idx},
+        }
+    return _to_json(result), time.perf_counter() - start
+
+
+def run_batch(scenarios, out_dir, jobs=None):
+    """Senaryoları toplu çalıştır; aynı alt hesaplamalar yalnızca bir kez yapılır
+
+    Her senaryo bir simülasyon ve "analyses" listesindeki analizlerden
+    (BATCH_ANALYSES) oluşur. Her hesaplama yalnızca bağlı olduğu girdilerin
+    içerik özetiyle anahtarlanır: aynı P'yi paylaşan senaryolar yapısal
+    analizi bir kez çalıştırır, önceki koşuların out_dir/objects altındaki
+    sonuçları da yeniden kullanılır. Kalan işler bir süreç havuzunda
+    yürütülür. Senaryo başına JSON ve süre istatistikleriyle summary.json
+    yazılır.
+    """
+    wall_start = time.perf_counter()
+    objects_dir = os.path.join(out_dir, "objects")
+    os.makedirs(objects_dir, exist_ok=True)
+
+    plans, tasks = [], {}
+    for position, spec in enumerate(scenarios):
+        analyses = spec.get("analyses", ["steady_state"])
+        unknown = set(analyses) - set(BATCH_ANALYSES)
+        if unknown:
+            raise ValueError(f"Bilinmeyen analiz: {', '.join(sorted(unknown))}")
+        sim, inflows = build_scenario(spec)
+        plan = []
+        for kind in ["simulation", *analyses]:
+            key = _batch_task_key(kind, spec, sim, inflows)
+            tasks.setdefault(key, (kind, spec))
+            plan.append((kind, key))
+        plans.append((position, spec, plan))
+
+    done = {}
+    for key in tasks:
+        path = os.path.join(objects_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                done[key] = json.load(f)
+    pending = [key for key in tasks if key not in done]
+
+    if jobs == 1 or len(pending) <= 1:
+        outputs = [_run_batch_task(*tasks[key], key, objects_dir) for key in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_run_batch_task, *tasks[key], key, objects_dir)
+                for key in pending
+            ]
+            outputs = [future.result() for future in futures]
+
+    for key, (result, seconds) in zip(pending, outputs):
+        done[key] = {"kind": tasks[key][0], "result": result, "seconds": seconds}
+        with open(os.path.join(objects_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump(done[key], f, ensure_ascii=False, indent=2)
+
+    # Her hesaplamanın süresi onu ilk isteyen senaryoya yazılır
+    fresh, summaries = set(pending), []
+    for position, spec, plan in plans:
+        slug = _scenario_slug(position, spec)
+        results, timings = {}, {}
+        for kind, key in plan:
+            results[kind] = done[key]["result"]
+            timings[kind] = {
+                "seconds": done[key]["seconds"],
+                "reused": key not in fresh,
+            }
+            fresh.discard(key)
+        with open(os.path.join(out_dir, f"{slug}.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "name": spec.get("name", slug),
+                    "results": results,
+                    "timings": timings,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        summaries.append(
+            {
+                "name": spec.get("name", slug),
+                "file": f"{slug}.json",
+                "seconds": sum(
+                    t["seconds"] for t in timings.values() if not t["reused"]
+                ),
+                "timings": timings,
+            }
+        )
+
+    stats = {
+        "scenarios": len(scenarios),
+        "computations": len(tasks),
+        "computed": len(pending),
+        "reused": sum(len(plan) for _, _, plan in plans) - len(pending),
+        "wall_seconds": time.perf_counter() - wall_start,
+        "scenario_timings": summaries,
+    }
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    return stats
+
+
+# İnteraktif modda slider'larla kontrol edilen girişler (get_custom_inflow sırası)
+SESSION_INPUT_NODES = ["N1", "N2", "N11"]
+
+
+def session_header(sim):
+    """Oturumun başlangıç koşulları: P matrisi ve hassasiyet modu"""
+    return {"version": 2, "precision": sim.precision, "P": sim.P.copy()}
+
+
+def routing_event(sim, node=None):
+    """Rota düzenlemesi olayı: değişen satır ya da (None) tüm P, zaman damgalı"""
+    if node is None:
+        event = {"type": "matrix", "P": sim.P.copy()}
+    else:
+        event = {"type": "row", "node": node, "row": sim.P[sim.n_map[node]].copy()}
+    event["time"] = time.time()
+    return event
+
+
+def load_session(path):
+    """Kaydedilmiş interaktif oturum günlüğünü oku"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def replay_session(session, sim=None):
+    """Oturum günlüğünü arayüz olmadan yeniden oynat
+
+    Aynı dalda art arda gelen adım olayları tek bir (T, n) giriş
+    matrisinde birleştirilip tek run_steps çağrısıyla çalıştırılır;
+    sıfırlama, dal açma, dal değiştirme ve rota düzenlemesi olayları
+    segmentleri böler. Günlükteki başlangıç P'si ve hassasiyet modu sim'e
+    yazılır; satırlar kaydedildikleri değerlerle aynen kurulur. Dal başına
+    {"history", "state", "hour"} döner.
+    """
+    sim = sim or TrafficSimulation()
+    if "P" in session:
+        sim.P[:] = np.asarray(session["P"], dtype=np.float64)
+        sim.invalidate_fundamental()
+    sim.precision = session.get("precision", sim.precision)
+    columns = [sim.n_map[node] for node in SESSION_INPUT_NODES]
+    branches = {"ana": {"chunks": [], "state": np.zeros(sim.n_len), "hour": 0}}
+    active, pending, start_hour = "ana", [], 0
+
+    def flush():
+        if not pending:
+            return
+        values = np.concatenate(pending)
+        U = np.zeros((len(values), sim.n_len))
+        U[:, columns] = values
+        branch = branches[active]
+        history, branch["state"] = sim.run_steps(branch["state"], U)
+        branch["chunks"].append(history)
+        branch["hour"] = (start_hour + len(values)) % 24
+        pending.clear()
+
+    for event in session["events"]:
+        kind = event["type"]
+        if kind == "steps":
+            if not pending:
+                # Saat arayüzde adımsız da değişebilir (ör. Rush Hour Yükle)
+                start_hour = event.get("hour", branches[active]["hour"])
+            pending.append(np.asarray(event["inflows"], dtype=np.float64))
+            continue
+        flush()
+        if kind == "reset":
+            branches[active] = {"chunks": [], "state": np.zeros(sim.n_len), "hour": 0}
+        elif kind == "fork":
+            parent = branches[active]
+            branches[event["name"]] = {
+                "chunks": list(parent["chunks"]),
+                "state": parent["state"].copy(),
+                "hour": parent["hour"],
+            }
+            active = event["name"]
+        elif kind == "switch":
+            active = event["name"]
+        elif kind == "row":
+            sim.P[sim.n_map[event["node"]]] = np.asarray(event["row"], dtype=np.float64)
+            sim.invalidate_fundamental()
+        elif kind == "matrix":
+            sim.P[:] = np.asarray(event["P"], dtype=np.float64)
+            sim.invalidate_fundamental()
+    flush()
+
+    return {
+        name: {
+            "history": (
+                np.concatenate(branch["chunks"])
+                if branch["chunks"]
+                else np.zeros((0, sim.n_len))
+            ),
+            "state": branch["state"],
+            "hour": branch["hour"],
+        }
+        for name, branch in branches.items()
+    }
+
+
+class HistoryStore:
+    """Durum geçmişi için büyüyebilen, O(1) indekslenen dizi deposu"""
+
+    def __init__(self, n, dtype=np.float64, capacity=256):
+        self.data = np.empty((capacity, n), dtype=dtype)
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return self.array()[index]
+
+    def append(self, state):
+        self.extend(np.asarray(state)[None, :])
+
+    def extend(self, states):
+        states = np.asarray(states)
+        needed = self.length + len(states)
+        if needed > len(self.data):
+            # Kapasite ikiye katlanır: ekleme maliyeti amortize O(1)
+            grown = np.empty(
+                (max(needed, 2 * len(self.data)), self.data.shape[1]),
+                dtype=self.data.dtype,
+            )
+            grown[: self.length] = self.data[: self.length]
+            self.data = grown
+        self.data[self.length : needed] = states
+        self.length = needed
+
+    def array(self):
+        """Doldurulmuş kısmın (kopyasız) görünümü"""
+        return self.data[: self.length]
+
+    def clear(self):
+        self.length = 0
+
+
+class SimulationBranch:
+    """Kopyala-yaz (copy-on-write) simülasyon dalı
+
+    Dal, ebeveyninin dallanma anına kadarki geçmişini kopyalamadan paylaşır
+    (base zinciri) ve yalnızca kendi ayrışan son ekini (store) saklar.
+    Dallanma O(1)'dir; bellek dal sayısıyla değil ayrışmayla büyür.
+    """
+
+    def __init__(self, name, n, base=None, state=None, hour=0):
+        self.name = name
+        self.n = n
+        # base: (ebeveyn base'i, ebeveyn deposu, paylaşılan uzunluk, ebeveyn base uzunluğu)
+        self.base = base
+        self.base_length = 0 if base is None else base[3] + base[2]
+        self.store = HistoryStore(n)
+        self.current_state = np.zeros(n) if state is None else state.copy()
+        self.current_hour = hour
+
+    def __len__(self):
+        return self.base_length + len(self.store)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if index >= self.base_length:
+            return self.store[index - self.base_length]
+
+        base = self.base
+        while index < base[3]:
+            base = base[0]
+        return base[1][index - base[3]]
+
+    def _segments(self):
+        segments = [self.store.array()]
+        base = self.base
+        while base is not None:
+            segments.append(base[1].array()[: base[2]])
+            base = base[0]
+        return segments[::-1]
+
+    def array(self, start=0):
+        """Geçmiş (ortak önek + dalın kendi adımları), start adımından itibaren
+
+        start dalın kendi bölümündeyse kopyasız görünüm döner.
+        """
+        if start >= self.base_length:
+            return self.store.array()[start - self.base_length :]
+        return np.concatenate(self._segments())[start:]
+
+    def append(self, state):
+        self.store.append(state)
+
+    def extend(self, states):
+        self.store.extend(states)
+
+    def fork(self, name):
+        base = (self.base, self.store, len(self.store), self.base_length)
+        return SimulationBranch(
+            name, self.n, base=base, state=self.current_state, hour=self.current_hour
+        )
+
+    def clear(self):
+        # Depo yerinde temizlenmez: bu dalı paylaşan alt dallar bozulmasın
+        self.base = None
+        self.base_length = 0
+        self.store = HistoryStore(self.n)
+
+
+def edge_arrows(xy, src, dst):
+    """Kenar okları (başlangıç, vektör); uçlar düğüm işaretçilerinden kısaltılır"""
+    start, vec = xy[src], xy[dst] - xy[src]
+    length = np.linalg.norm(vec, axis=1, keepdims=True)
+    unit = vec / np.maximum(length, 1e-12)
+    gap = min(0.06, 0.3 * float(np.median(length))) if len(length) else 0.0
+    return start + unit * gap, vec - 2 * unit * gap
+
+
+def labelled_nodes(xy, xlim, ylim, limit=NODE_LABEL_LIMIT):
+    """Görünür alandaki düğüm indeksleri; limit'ten fazlaysa etiket yok (boş küme)"""
+    (x0, x1), (y0, y1) = sorted(xlim), sorted(ylim)
+    visible = np.flatnonzero(
+        (xy[:, 0] >= x0) & (xy[:, 0] <= x1) & (xy[:, 1] >= y0) & (xy[:, 1] <= y1)
+    )
+    return set(visible.tolist()) if len(visible) <= limit else set()
+
+
+def timeline_range(length):
+    """length adımlık geçmiş için zaman çizelgesi slider aralığı (0, son adım)"""
+    return 0, max(length - 1, 0)
+
+
+def clamp_step(step, length):
+    """Slider değerini geçerli geçmiş indeksine sıkıştır; geçmiş boşsa None"""
+    if length <= 0:
+        return None
+    return max(0, min(int(step), length - 1))
+
+
+def next_play_step(step, length):
+    """Oynatmada sıradaki adım; geçmişin sonuna gelindiyse None"""
+    step = clamp_step(step, length)
+    if step is None or step + 1 >= length:
+        return None
+    return step + 1
+
+
+def fork_marker(branch):
+    """Dal karşılaştırmasında dallanma çizgisinin x konumu (kök dalda None)"""
+    return branch.base_length - 0.5 if branch.base_length else None
+
+
+class HistoryArchive:
+    """Uzun geçmişler için sıkıştırılmış, rastgele erişimli arşiv
+
+    Sayılar scale adımına yuvarlanır (hata ≤ scale / 2), zaman bloklarında
+    delta kodlanır ve sığan en küçük tamsayı tipine indirilir. Her düğüm
+    parçası bayt karıştırılarak (shuffle) ayrı bir zlib bloğu olur; okuma
+    yalnızca istenen aralıkla kesişen blokları açar (dosyadan mmap ile).
+    """
+
+    MAGIC = b"THA1"
+
+    def __init__(self, scale=1.0, time_block=720, node_chunk=64, level=9):
+        self.scale = scale
+        self.time_block = time_block
+        self.node_chunk = node_chunk
+        self.level = level
+        self.index = {}
+        self.data = bytearray()
+
+    def add(self, name, history, nodes=None):
+        """(T, n) geçmişi name senaryosu olarak sıkıştırıp ekle"""
+        if not isinstance(self.data, bytearray):
+            raise ValueError("Dosyadan açılan arşiv salt okunurdur")
+        history = np.asarray(history, dtype=np.float64)
+        hours, n = history.shape
+        quantized = np.rint(history / self.scale).astype(np.int64)
+
+        blocks = {}
+        for bt, t0 in enumerate(range(0, hours, self.time_block)):
+            delta = np.diff(quantized[t0 : t0 + self.time_block], axis=0, prepend=0)
+            for bc, c0 in enumerate(range(0, n, self.node_chunk)):
+                part = delta[:, c0 : c0 + self.node_chunk]
+                dtype = np.result_type(
+                    np.min_scalar_type(part.min()), np.min_scalar_type(part.max())
+                )
+                planes = np.ascontiguousarray(part.T, dtype=dtype).view(np.uint8)
+                shuffled = planes.reshape(-1, dtype.itemsize).T.tobytes()
+                payload = zlib.compress(shuffled, self.level)
+                blocks[f"{bt},{bc}"] = [len(self.data), len(payload), dtype.str]
+                self.data += payload
+
+        self.index[name] = {
+            "shape": [hours, n],
+            "nodes": list(nodes) if nodes is not None else None,
+            "scale": self.scale,
+            "time_block": self.time_block,
+            "node_chunk": self.node_chunk,
+            "blocks": blocks,
+        }
+
+    def read(self, name, nodes=None, t0=0, t1=None):
+        """[t0, t1) saatleri ve istenen düğümler (ad ya da indeks) için geçmiş
+
+        nodes verilmezse tüm sütunlar döner; sonuç analyze_bottleneck'e
+        doğrudan verilebilir.
+        """
+        entry = self.index[name]
+        hours, n = entry["shape"]
+        tb, nc = entry["time_block"], entry["node_chunk"]
+        t1 = hours if t1 is None else min(t1, hours)
+        if nodes is None:
+            columns = np.arange(n)
+        else:
+            names = entry["nodes"] or []
+            columns = np.array(
+                [
+                    names.index(node) if isinstance(node, str) else node
+                    for node in nodes
+                ],
+                dtype=int,
+            )
+
+        out = np.empty((max(t1 - t0, 0), len(columns)))
+        chunk_of = columns // nc
+        for bt in range(t0 // tb, -(-t1 // tb)):
+            start = bt * tb
+            rows = min(tb, hours - start)
+            a, b = max(t0 - start, 0), min(t1 - start, rows)
+            for bc in np.unique(chunk_of):
+                offset, length, dtype = entry["blocks"][f"{bt},{bc}"]
+                width = min(nc, n - bc * nc)
+                raw = zlib.decompress(self.data[offset : offset + length])
+                itemsize = np.dtype(dtype).itemsize
+                planes = np.frombuffer(raw, dtype=np.uint8).reshape(itemsize, -1)
+                delta = (
+                    np.ascontiguousarray(planes.T).view(dtype).reshape(width, rows).T
+                )
+                values = np.cumsum(delta[:b], axis=0, dtype=np.int64)[a:]
+                mask = chunk_of == bc
+                out[start + a - t0 : start + b - t0, mask] = (
+                    values[:, columns[mask] - bc * nc] * entry["scale"]
+                )
+        return out
+
+    def compression_ratio(self, name=None):
+        """float64 karşılığının sıkıştırılmış boyuta oranı"""
+        names = [name] if name is not None else list(self.index)
+        raw = sum(8 * np.prod(self.index[k]["shape"]) for k in names)
+        packed = sum(
+            block[1] for k in names for block in self.index[k]["blocks"].values()
+        )
+        return raw / max(packed, 1)
+
+    def save(self, path):
+        header = json.dumps(self.index).encode()
+        with open(path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            f.write(self.data)
+
+    @classmethod
+    def open(cls, path):
+        """Kaydedilmiş arşivi aç; yalnızca dizin okunur, bloklar mmap'ten gelir"""
+        archive = cls()
+        with open(path, "rb") as f:
+            if f.read(4) != cls.MAGIC:
+                raise ValueError(f"{path} bir geçmiş arşivi değil")
+            size = int.from_bytes(f.read(8), "little")
+            archive.index = json.loads(f.read(size))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        archive.data = memoryview(mapped)[12 + size :]
+        return archive
+
+
+class SimulationCancelled(Exception):
+    """Arka plan hesaplaması kullanıcı tarafından iptal edildi"""
+
+
+class BackgroundWorker:
+    """Ağır motor çağrılarını arka plan iş parçacığında çalıştırır
+
+    Sonuçlar Tk ana döngüsüne after() yoklaması ile taşınır. Her iş bir
+    kanala (ör. "sim", "step") aittir; kanalda yeni iş başlatılır ya da
+    invalidate() çağrılırsa eski işin sonucu bayat sayılıp atılır.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, widget, on_progress=None):
+        self.widget = widget
+        self.on_progress = on_progress
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.generations = {}
+        self.cancel_events = {}
+        self.progress = {}
+
+    def submit(self, channel, fn, on_done, on_error=None):
+        """fn(progress) işini başlat; bittiğinde on_done(sonuç) ana iş parçacığında çağrılır"""
+        self.invalidate(channel)
+        generation = self.generations[channel]
+        cancel_event = threading.Event()
+        self.cancel_events[channel] = cancel_event
+        self.progress[channel] = (0, 1)
+
+        def report(done, total):
+            if cancel_event.is_set():
+                raise SimulationCancelled()
+            self.progress[channel] = (done, total)
+
+        future = self.executor.submit(fn, report)
+        self.widget.after(
+            self.POLL_MS, self._poll, channel, generation, future, on_done, on_error
+        )
+
+    def invalidate(self, channel):
+        """Kanaldaki bekleyen işi iptal et, sonucu gelirse atılsın"""
+        self.generations[channel] = self.generations.get(channel, 0) + 1
+        if channel in self.cancel_events:
+            self.cancel_events.pop(channel).set()
+        self.progress.pop(channel, None)
+        self._report_progress()
+
+    def cancel_all(self):
+        for channel in list(self.cancel_events):
+            self.invalidate(channel)
+
+    def busy(self, channel=None):
+        if channel is None:
+            return bool(self.cancel_events)
+        return channel in self.cancel_events
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
+
+    def _report_progress(self):
+        if self.on_progress is None:
+            return
+        done = sum(d for d, _ in self.progress.values())
+        total = sum(t for _, t in self.progress.values())
+        self.on_progress(done, total)
+
+    def _poll(self, channel, generation, future, on_done, on_error):
+        # Bayat sonuç: kanal bu arada yeniden başlatıldı ya da iptal edildi
+        if self.generations.get(channel) != generation:
+            return
+        if not future.done():
+            self._report_progress()
+            self.widget.after(
+                self.POLL_MS, self._poll, channel, generation, future, on_done, on_error
+            )
+            return
+
+        self.cancel_events.pop(channel, None)
+        self.progress.pop(channel, None)
+        self._report_progress()
+        try:
+            result = future.result()
+        except SimulationCancelled:
+            return
+        except Exception as exc:
+            if on_error:
+                on_error(exc)
+            else:
+                messagebox.showerror("Hata", f"Hesaplama başarısız: {exc}")
+            return
+        on_done(result)
 
 
 class ModernButton(tk.Canvas):
@@ -250,14 +2755,57 @@ class ModernButton(tk.Canvas):
             self.command()
 
 
+class IdleThrottle:
+    """Sık gelen istekleri birleştirir: callback boşta (after_idle) ve en
+    fazla interval ms'de bir kez çalışır; aralık önceki çağrının bitişinden
+    sayılır ki uzun süren işlerden sonra da Tk'ya bir kare nefes payı kalsın.
+    """
+
+    def __init__(self, widget, callback, interval=SLIDER_FRAME_MS, clock=None):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self.clock = clock or time.perf_counter  # Saniye döndüren saat
+        self.job = None
+        self.last_run = -float("inf")
+
+    def schedule(self):
+        """Bekleyen çağrı yoksa bir tane planla"""
+        if self.job is not None:
+            return
+        wait = self.interval - (self.clock() - self.last_run) * 1000
+        if wait <= 0:
+            self.job = self.widget.after_idle(self.run)
+        else:
+            self.job = self.widget.after(int(np.ceil(wait)), self.run)
+
+    def run(self):
+        self.job = None
+        self.callback()
+        self.last_run = self.clock()
+
+    def cancel(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
+
 class ModernSlider(tk.Frame):
-    """Modern görünümlü slider"""
+    """Modern görünümlü slider
+
+    Sürükleme sırasında değer ve etiket anında güncellenir; command ise
+    IdleThrottle ile birleştirilir: her SLIDER_FRAME_MS aralığında yalnızca
+    son değerle bir kez çağrılır. Programatik set() komutu tetiklemez.
+    """
 
     def __init__(self, parent, label, from_, to, initial, command=None, **kwargs):
         super().__init__(parent, bg=COLORS["bg_card"], **kwargs)
 
         self.command = command
         self.value = tk.IntVar(value=initial)
+        self.pending = None
+        self.throttle = IdleThrottle(self, self.flush)
+        self.quiet = False
         self.from_ = from_
         self.to_ = to
 
@@ -298,13 +2846,23 @@ class ModernSlider(tk.Frame):
         self.value_label.pack(side=tk.RIGHT, padx=(10, 0))
 
     def _on_change(self, val):
+        # ttk.Scale.set de bu geri çağrıyı tetikler; set() içindeyken yok say
+        if self.quiet:
+            return
         int_val = int(float(val))
         # Limit kontrolü
         int_val = max(self.from_, min(self.to_, int_val))
         self.value.set(int_val)
         self.value_label.config(text=str(int_val))
         if self.command:
-            self.command(int_val)
+            self.pending = int_val
+            self.throttle.schedule()
+
+    def flush(self):
+        """Bekleyen son değerle command'ı çağır"""
+        val, self.pending = self.pending, None
+        if val is not None and self.command:
+            self.command(val)
 
     def get(self):
         return self.value.get()
@@ -312,10 +2870,21 @@ class ModernSlider(tk.Frame):
     def set(self, val, trigger_callback=False):
         val = max(self.from_, min(self.to_, val))
         self.value.set(val)
-        self.slider.set(val)
+        self.quiet = True
+        try:
+            self.slider.set(val)
+        finally:
+            self.quiet = False
         self.value_label.config(text=str(val))
+        # Programatik değer bekleyen sürükleme değerini geçersiz kılar
+        self.pending = None
         if trigger_callback and self.command:
-            self.command(val)
+            self.pending = val
+            self.throttle.schedule()
+
+    def destroy(self):
+        self.throttle.cancel()
+        super().destroy()
 
     def set_range(self, from_, to):
         """Slider aralığını değiştir"""
@@ -343,11 +2912,34 @@ class InteractiveSimulation(tk.Toplevel):
         self.configure(bg=COLORS["bg_dark"])
         self.minsize(1200, 800)
 
-        # Simülasyon durumu
+        # Simülasyon durumu (her dal kendi geçmişini tutar)
         self.current_hour = 0
-        self.state_history = []
+        self.branches = {"ana": SimulationBranch("ana", self.sim.n_len)}
+        self.state_history = self.branches["ana"]
         self.current_state = np.zeros(self.sim.n_len)
 
+        # Zaman çizelgesi / blit durumu
+        self.canvas = None
+        self.blit_background = None
+        self.dynamic_artists = []
+        self.node_labels = {}
+        self.network_ax = self.series_ax = None
+        self.series_lines = []
+        self.series_pyramid = None
+        self.series_source = None
+        self.series_peak = 0.0
+        self.play_job = None
+
+        # Oturum günlüğü: başlangıç P'si, adım girişleri, sıfırlamalar, dal
+        # olayları ve (ana penceredeki) rota düzenlemeleri
+        self.session_start = session_header(self.sim)
+        self.session = []
+        self.sim.p_listeners.append(self.on_p_change)
+
+        # Motor çağrıları arka planda, pencere donmaz
+        self.worker = BackgroundWorker(self, on_progress=self.update_progress)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.create_widgets()
         self.update_visualization()
 
@@ -532,6 +3124,15 @@ class InteractiveSimulation(tk.Toplevel):
             color="#9b59b6",
         ).pack(pady=5)
 
+        ModernButton(
+            btn_frame,
+            "💾  Oturumu Kaydet",
+            self.save_session,
+            width=260,
+            height=40,
+            color="#16a085",
+        ).pack(pady=5)
+
         # Durum göstergesi
         status_frame = tk.Frame(left_panel, bg="#1e3a5f")
         status_frame.pack(fill=tk.X, padx=20, pady=15)
@@ -554,56 +3155,121 @@ class InteractiveSimulation(tk.Toplevel):
         )
         self.status_text.pack(anchor="w", padx=15, pady=(0, 15))
 
+        # İlerleme çubuğu ve iptal
+        progress_frame = tk.Frame(left_panel, bg=COLORS["bg_card"])
+        progress_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+
+        self.progress_bar = ttk.Progressbar(
+            progress_frame, mode="determinate", maximum=1.0
+        )
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+
+        ModernButton(
+            progress_frame,
+            "✖ İptal",
+            self.cancel_computation,
+            width=80,
+            height=28,
+            color=COLORS["accent"],
+        ).pack(side=tk.RIGHT)
+
         # Sağ Panel - Görselleştirme
         right_panel = tk.Frame(content_frame, bg=COLORS["bg_card"])
         right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
-        self.viz_frame = right_panel
+        # Zaman çizelgesi: geçmişteki herhangi bir adımı göster / oynat
+        timeline_frame = tk.Frame(right_panel, bg=COLORS["bg_card"])
+        timeline_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=(0, 10))
 
-    def on_hour_change(self, val):
-        self.current_hour = val
-        self.time_display.config(text=f"🕐 {val:02d}:00")
+        self.timeline_slider = ModernSlider(
+            timeline_frame, "⏱ Zaman Çizelgesi (adım):", 0, 0, 0, command=self.show_step
+        )
+        self.timeline_slider.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        # Rush hour kontrolü (saat 8 ve 17)
-        is_rush_hour = val in [8, 17]
+        self.speed_slider = ModernSlider(
+            timeline_frame, "Hız (adım/sn):", 1, 30, 5, width=160
+        )
+        self.speed_slider.pack(side=tk.LEFT, padx=15)
+
+        self.play_button = ModernButton(
+            timeline_frame,
+            "▶ Oynat",
+            self.toggle_playback,
+            width=110,
+            height=36,
+            color="#3498db",
+        )
+        self.play_button.pack(side=tk.LEFT)
 
-        if is_rush_hour:
-            # Rush hour: 2000-5000 arası
-            self.n1_slider.set_range(667, 1667)
-            self.n2_slider.set_range(667, 1667)
-            self.n11_slider.set_range(667, 1667)
-            self.limit_label.config(
-                text="⚠️ Rush Hour: 2000-5000 araç", fg=COLORS["warning"]
-            )
-            self.time_display.config(fg=COLORS["warning"])
+        # Senaryo dalları: mevcut durumdan "ya şöyle olsaydı" kolu aç
+        branch_frame = tk.Frame(right_panel, bg=COLORS["bg_card"])
+        branch_frame.pack(side=tk.TOP, fill=tk.X, padx=20, pady=(10, 0))
 
-            # Varsayılan rush hour değerleri
-            if val == 8:
-                self.n1_slider.set(1400)
-                self.n2_slider.set(1300)
-                self.n11_slider.set(1300)
-            else:  # 17
-                self.n1_slider.set(1500)
-                self.n2_slider.set(1400)
-                self.n11_slider.set(1100)
-        else:
-            # Normal saat: 0-2000 arası
-            self.n1_slider.set_range(0, 700)
-            self.n2_slider.set_range(0, 700)
-            self.n11_slider.set_range(0, 700)
-            self.limit_label.config(
-                text="✓ Normal Saat: 0-2000 araç", fg=COLORS["success"]
-            )
-            self.time_display.config(fg=COLORS["success"])
+        tk.Label(
+            branch_frame,
+            text="🌿 Dal:",
+            bg=COLORS["bg_card"],
+            fg=COLORS["text"],
+            font=("Segoe UI", 10, "bold"),
+        ).pack(side=tk.LEFT)
 
-            # Varsayılan normal değerler
-            self.n1_slider.set(550)
-            self.n2_slider.set(450)
-            self.n11_slider.set(600)
+        self.branch_selector = ttk.Combobox(
+            branch_frame, values=list(self.branches), state="readonly", width=12
+        )
+        self.branch_selector.set("ana")
+        self.branch_selector.bind(
+            "<<ComboboxSelected>>",
+            lambda e: self.switch_branch(self.branch_selector.get()),
+        )
+        self.branch_selector.pack(side=tk.LEFT, padx=10)
+
+        ModernButton(
+            branch_frame,
+            "🌿 Dal Oluştur",
+            self.fork_branch,
+            width=130,
+            height=32,
+            color=COLORS["success"],
+        ).pack(side=tk.LEFT, padx=5)
+
+        ModernButton(
+            branch_frame,
+            "⚖ Karşılaştır",
+            self.compare_branches,
+            width=130,
+            height=32,
+            color="#9b59b6",
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.viz_frame = tk.Frame(right_panel, bg=COLORS["bg_card"])
+        self.viz_frame.pack(fill=tk.BOTH, expand=True)
+
+    def on_hour_change(self, val):
+        # Girdiler değişti: bekleyen adım sonucu artık bayat
+        self.worker.invalidate("step")
+        self.current_hour = val
+        self.time_display.config(text=f"🕐 {val:02d}:00")
+        self.update_hour_limits()
+
+        # Saate ait varsayılan değerler (set() komutları tetiklemez)
+        n1, n2, n11 = self.hour_defaults(val)
+        self.n1_slider.set(n1)
+        self.n2_slider.set(n2)
+        self.n11_slider.set(n11)
 
         self.update_total()
 
+    @staticmethod
+    def hour_defaults(hour):
+        """Saat için varsayılan (N1, N2, N11) giriş değerleri"""
+        if hour == 8:
+            return 1400, 1300, 1300
+        if hour == 17:
+            return 1500, 1400, 1100
+        return 550, 450, 600
+
     def on_vehicle_change(self, val=None):
+        self.worker.invalidate("step")
         self.update_total()
 
     def update_hour_limits(self):
@@ -629,8 +3295,6 @@ class InteractiveSimulation(tk.Toplevel):
             )
             self.time_display.config(fg=COLORS["success"])
 
-        self.update_total()
-
     def update_total(self):
         total = self.n1_slider.get() + self.n2_slider.get() + self.n11_slider.get()
         color = (
@@ -640,87 +3304,199 @@ class InteractiveSimulation(tk.Toplevel):
         )
         self.total_label.config(text=f"Toplam Giriş: {total:,} araç/saat", fg=color)
 
-    def step_forward(self):
-        """Bir adım ilerle"""
-        n1 = self.n1_slider.get()
-        n2 = self.n2_slider.get()
-        n11 = self.n11_slider.get()
+    def planned_inflows(self, steps):
+        """Sonraki adımların giriş vektörleri
+
+        İlk adım slider değerlerini kullanır; her adımdan sonra saat ilerler
+        ve on_hour_change o saatin varsayılanlarını yükler.
+        """
+        values = (self.n1_slider.get(), self.n2_slider.get(), self.n11_slider.get())
+        hour = self.current_hour
+        inflows = []
+        for _ in range(steps):
+            inflows.append(self.sim.get_custom_inflow(*values))
+            hour = (hour + 1) % 24
+            values = self.hour_defaults(hour)
+        return np.array(inflows)
+
+    def step_forward(self, steps=1):
+        """Adım ilerle (hesaplama arka planda)"""
+        if self.worker.busy("step"):
+            return
 
-        self.current_state = self.sim.run_single_step(self.current_state, n1, n2, n11)
-        self.state_history.append(self.current_state.copy())
+        state = self.current_state.copy()
+        inflows = self.planned_inflows(steps)
+        self.worker.submit(
+            "step",
+            lambda progress: self.sim.run_steps(state, inflows, progress=progress),
+            lambda result: self.on_steps_done(result, steps, inflows),
+        )
 
-        # Saati ilerlet
-        self.current_hour = (self.current_hour + 1) % 24
-        self.hour_slider.set(self.current_hour)
+    def on_steps_done(self, result, steps, inflows):
+        history, self.current_state = result
+        self.state_history.extend(history)
+        columns = [self.sim.n_map[node] for node in SESSION_INPUT_NODES]
+        self.session.append(
+            {"type": "steps", "hour": self.current_hour, "inflows": inflows[:, columns]}
+        )
 
-        # Saat göstergesini ve limitleri güncelle
-        self.time_display.config(text=f"🕐 {self.current_hour:02d}:00")
-        self.update_hour_limits()
+        # Saati ilerlet; yeni saatin limitleri ve varsayılanları yüklenir
+        self.current_hour = (self.current_hour + steps) % 24
+        self.hour_slider.set(self.current_hour)
+        self.on_hour_change(self.current_hour)
 
         self.update_visualization()
         self.update_status()
 
     def step_forward_10(self):
         """10 adım ilerle"""
-        for _ in range(10):
-            self.step_forward()
+        self.step_forward(10)
+
+    def update_progress(self, done, total):
+        self.progress_bar["value"] = done / total if total else 0
+
+    def cancel_computation(self):
+        self.worker.cancel_all()
+
+    def fork_branch(self):
+        """Mevcut durumdan yeni dal aç (O(1), ortak geçmiş paylaşılır)"""
+        self.state_history.current_state = self.current_state.copy()
+        self.state_history.current_hour = self.current_hour
+        name = f"dal-{len(self.branches)}"
+        self.branches[name] = self.state_history.fork(name)
+        self.session.append({"type": "fork", "name": name})
+        self.branch_selector.config(values=list(self.branches))
+        self.switch_branch(name)
+
+    def switch_branch(self, name):
+        """Aktif dalı değiştir; bekleyen adım ve oynatma iptal edilir"""
+        self.worker.invalidate("step")
+        self.stop_playback()
+
+        self.state_history.current_state = self.current_state.copy()
+        self.state_history.current_hour = self.current_hour
+        self.state_history = self.branches[name]
+        self.current_state = self.state_history.current_state.copy()
+        self.session.append({"type": "switch", "name": name})
+        self.current_hour = self.state_history.current_hour
+        self.branch_selector.set(name)
+
+        self.hour_slider.set(self.current_hour)
+        self.on_hour_change(self.current_hour)
+        self.update_visualization()
+        self.update_status()
+
+    def compare_branches(self):
+        """Tüm dalların zaman serilerini yan yana göster"""
+        self.state_history.current_state = self.current_state.copy()
+        self.state_history.current_hour = self.current_hour
+        branches = [b for b in self.branches.values() if len(b)]
+        if not branches:
+            messagebox.showinfo("Karşılaştırma", "Önce simülasyonu ilerletin.")
+            return
+
+        window = tk.Toplevel(self)
+        window.title("⚖ Dal Karşılaştırması")
+        window.geometry("1200x500")
+        window.configure(bg=COLORS["bg_card"])
+
+        fig = Figure(figsize=(12, 5), facecolor=COLORS["bg_card"])
+        axes = fig.subplots(1, len(branches), sharey=True, squeeze=False)[0]
+        plot_nodes = ["N5", "N6", "N7", "N8"]
+        plot_colors = ["#e94560", "#4ecca3", "#ffc107", "#00d9ff"]
+
+        for ax, branch in zip(axes, branches):
+            history = branch.array()
+            ax.set_facecolor(COLORS["graph_bg"])
+            for node, color in zip(plot_nodes, plot_colors):
+                ax.plot(history[:, self.sim.n_map[node]], label=node, color=color)
+            marker = fork_marker(branch)
+            if marker is not None:
+                ax.axvline(
+                    marker,
+                    color=COLORS["text"],
+                    linestyle="--",
+                    linewidth=1,
+                    label="Dallanma",
+                )
+            ax.set_title(
+                f"🌿 {branch.name}",
+                fontsize=12,
+                fontweight="bold",
+                color=COLORS["text"],
+            )
+            ax.set_xlabel("Adım", fontsize=10, color=COLORS["text_muted"])
+            ax.tick_params(colors=COLORS["text_muted"])
+            ax.grid(True, alpha=0.2, color=COLORS["text_muted"])
+
+        axes[0].set_ylabel("Araç Sayısı", fontsize=10, color=COLORS["text_muted"])
+        axes[0].legend(
+            loc="upper left",
+            facecolor=COLORS["bg_card"],
+            edgecolor=COLORS["accent"],
+            labelcolor=COLORS["text"],
+        )
+        fig.tight_layout(pad=2)
+
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def save_session(self):
+        """Oturum günlüğünü JSON olarak kaydet (replay_session ile oynatılır)"""
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".json",
+            filetypes=[("Oturum günlüğü", "*.json")],
+        )
+        if not path:
+            return
+        log = dict(self.session_start, events=self.session)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(_to_json(log), f, ensure_ascii=False)
+        steps = sum(len(e["inflows"]) for e in self.session if e["type"] == "steps")
+        messagebox.showinfo(
+            "Oturum", f"{steps} adımlık oturum kaydedildi.", parent=self
+        )
+
+    def on_p_change(self, node):
+        """P düzenlendi: eski P ile hesaplanan adım atılır, olay günlüğe yazılır"""
+        self.worker.invalidate("step")
+        self.session.append(routing_event(self.sim, node))
+
+    def on_close(self):
+        self.sim.p_listeners.remove(self.on_p_change)
+        self.worker.shutdown()
+        self.destroy()
 
     def reset_simulation(self):
         """Simülasyonu sıfırla"""
+        self.worker.invalidate("step")
         self.current_state = np.zeros(self.sim.n_len)
-        self.state_history = []
+        self.stop_playback()
+        self.state_history.clear()
+        self.session.append({"type": "reset"})
         self.current_hour = 0
         self.hour_slider.set(0)
-        self.time_display.config(text="🕐 00:00")
-
-        # Normal saat limitleri
-        self.n1_slider.set_range(0, 700)
-        self.n2_slider.set_range(0, 700)
-        self.n11_slider.set_range(0, 700)
-        self.limit_label.config(text="✓ Normal Saat: 0-2000 araç", fg=COLORS["success"])
-
-        self.n1_slider.set(550)
-        self.n2_slider.set(450)
-        self.n11_slider.set(600)
-        self.update_total()
+        self.on_hour_change(0)
         self.update_visualization()
         self.update_status()
 
     def load_rush_hour(self):
         """Rush hour değerlerini yükle"""
-        self.current_hour = 8
         self.hour_slider.set(8)
-        self.time_display.config(text="🕐 08:00")
-
-        # Rush hour limitleri
-        self.n1_slider.set_range(667, 1667)
-        self.n2_slider.set_range(667, 1667)
-        self.n11_slider.set_range(667, 1667)
-        self.limit_label.config(
-            text="⚠️ Rush Hour: 2000-5000 araç", fg=COLORS["warning"]
-        )
-
-        self.n1_slider.set(1400)
-        self.n2_slider.set(1300)
-        self.n11_slider.set(1300)
-        self.update_total()
+        self.on_hour_change(8)
 
     def update_status(self):
         """Durum metnini güncelle"""
         total_vehicles = np.sum(self.current_state)
 
         # Darboğaz bul
-        transient_indices = [
-            self.sim.n_map[n]
-            for n in self.sim.nodes
-            if n not in ["N3", "N9", "N10", "N12"]
-        ]
+        transient_indices, _ = self.sim._split_indices()
         transient_values = self.current_state[transient_indices]
         if np.max(transient_values) > 0:
             bn_idx = np.argmax(transient_values)
-            bn_node = [
-                n for n in self.sim.nodes if n not in ["N3", "N9", "N10", "N12"]
-            ][bn_idx]
+            bn_node = self.sim.nodes[transient_indices[bn_idx]]
             bn_val = int(transient_values[bn_idx])
         else:
             bn_node = "-"
@@ -754,93 +3530,58 @@ class InteractiveSimulation(tk.Toplevel):
             pad=10,
         )
 
-        # Düğüm pozisyonları (manuel yerleşim)
-        positions = {
-            "N1": (0.5, 1.0),  # Kuzey giriş
-            "N2": (1.0, 0.5),  # Doğu giriş
-            "N3": (1.0, 0.8),  # Çıkış
-            "N4": (0.0, 0.5),  # Batı giriş
-            "N5": (0.5, 0.7),  # Merkez üst
-            "N6": (0.7, 0.5),  # Merkez sağ
-            "N7": (0.5, 0.5),  # Merkez
-            "N8": (0.3, 0.5),  # Merkez sol
-            "N9": (0.5, 0.3),  # Çıkış
-            "N10": (1.0, 0.2),  # Çıkış
-            "N11": (0.5, 0.0),  # Güney giriş
-            "N12": (0.0, 0.2),  # Çıkış
-            "N13": (0.3, 0.2),  # Güney kavşak
-        }
-
-        # Bağlantıları çiz
-        connections = [
-            ("N1", "N5"),
-            ("N2", "N6"),
-            ("N4", "N8"),
-            ("N11", "N13"),
-            ("N5", "N6"),
-            ("N5", "N9"),
-            ("N6", "N3"),
-            ("N6", "N7"),
-            ("N6", "N10"),
-            ("N7", "N5"),
-            ("N7", "N8"),
-            ("N8", "N5"),
-            ("N8", "N10"),
-            ("N13", "N5"),
-            ("N13", "N12"),
-        ]
-
-        for src, dst in connections:
-            x1, y1 = positions[src]
-            x2, y2 = positions[dst]
-            ax1.annotate(
-                "",
-                xy=(x2, y2),
-                xytext=(x1, y1),
-                arrowprops=dict(arrowstyle="->", color=COLORS["text_muted"], alpha=0.5),
-            )
-
-        # Düğümleri çiz
-        max_val = max(np.max(self.current_state), 1)
-        for node, (x, y) in positions.items():
-            idx = self.sim.n_map[node]
-            val = self.current_state[idx]
-
-            # Renk ve boyut değere göre
-            if node in ["N3", "N9", "N10", "N12"]:
-                color = COLORS["success"]  # Çıkışlar
-                size = 400
-            elif node in ["N1", "N2", "N4", "N11"]:
-                color = "#3498db"  # Girişler
-                size = 400
-            else:
-                # Yoğunluğa göre renk
-                intensity = min(val / max_val, 1) if max_val > 0 else 0
-                if intensity > 0.7:
-                    color = COLORS["accent"]
-                elif intensity > 0.3:
-                    color = COLORS["warning"]
-                else:
-                    color = COLORS["success"]
-                size = 300 + intensity * 400
+        # Düğüm pozisyonları ve bağlantılar ağ verisinden
+        xy = self.sim.node_positions()
+        src, dst = self.sim.edges()
+        large = self.sim.n_len > NODE_LABEL_LIMIT
+
+        # Bağlantıları çiz: tüm oklar tek bir koleksiyonda (quiver)
+        start, vec = edge_arrows(xy, src, dst)
+        ax1.quiver(
+            start[:, 0],
+            start[:, 1],
+            vec[:, 0],
+            vec[:, 1],
+            angles="xy",
+            scale_units="xy",
+            scale=1,
+            color=COLORS["text_muted"],
+            alpha=0.3 if large else 0.5,
+            width=0.001 if large else 0.004,
+            headwidth=4,
+            headlength=5,
+            zorder=1,
+        )
 
-            ax1.scatter(
-                x, y, s=size, c=color, zorder=5, edgecolors="white", linewidths=2
-            )
-            ax1.annotate(
-                f"{node}\n{int(val):,}",
-                (x, y),
-                ha="center",
-                va="center",
-                fontsize=7,
-                fontweight="bold",
-                color="white",
-            )
+        # Düğümleri çiz: tek PathCollection (zaman çizelgesinde blit ile güncellenir)
+        self.node_xy = xy
+        self.displayed_state = self.current_state
+        sizes, colors = self.node_styles(self.current_state)
+        self.node_collection = ax1.scatter(
+            xy[:, 0],
+            xy[:, 1],
+            s=sizes,
+            c=colors,
+            zorder=5,
+            edgecolors="white",
+            linewidths=0.3 if large else 2,
+            animated=True,
+        )
+        self.dynamic_artists = [self.node_collection]
+        self.node_labels = {}
 
-        ax1.set_xlim(-0.1, 1.1)
-        ax1.set_ylim(-0.1, 1.1)
+        lo, hi = xy.min(axis=0), xy.max(axis=0)
+        pad = 0.1 * max(float((hi - lo).max()), 1.0)
+        ax1.set_xlim(lo[0] - pad, hi[0] + pad)
+        ax1.set_ylim(lo[1] - pad, hi[1] + pad)
         ax1.axis("off")
 
+        # Etiketler yalnızca yakınlaştırma eşiğinin altında
+        self.network_ax = ax1
+        self.update_node_labels()
+        ax1.callbacks.connect("xlim_changed", lambda ax: self.update_node_labels())
+        ax1.callbacks.connect("ylim_changed", lambda ax: self.update_node_labels())
+
         # Bar Chart - Düğüm değerleri
         ax2.set_facecolor(COLORS["graph_bg"])
         ax2.set_title(
@@ -852,22 +3593,23 @@ class InteractiveSimulation(tk.Toplevel):
         )
 
         transient_nodes = [
-            n for n in self.sim.nodes if n not in ["N3", "N9", "N10", "N12"]
+            n for n in self.sim.nodes if n not in self.sim.absorbing_nodes
         ]
         transient_values = [
             self.current_state[self.sim.n_map[n]] for n in transient_nodes
         ]
 
-        colors = []
-        for val in transient_values:
-            if val > 3000:
-                colors.append(COLORS["accent"])
-            elif val > 1000:
-                colors.append(COLORS["warning"])
-            else:
-                colors.append(COLORS["success"])
+        colors = [self.bar_color(val) for val in transient_values]
 
-        bars = ax2.barh(transient_nodes, transient_values, color=colors)
+        bars = ax2.barh(transient_nodes, transient_values, color=colors, animated=True)
+        # Geçmişteki en yüksek değer de sığsın (zaman çizelgesi için)
+        plot_nodes = ["N5", "N6", "N7", "N8"]
+        self.sync_series(
+            [self.sim.n_map[n] for n in plot_nodes],
+            [self.sim.n_map[n] for n in transient_nodes],
+        )
+        if len(self.state_history):
+            ax2.set_xlim(0, max(self.series_peak, max(transient_values), 1) * 1.15)
         ax2.set_xlabel("Araç Sayısı", fontsize=10, color=COLORS["text_muted"])
         ax2.tick_params(colors=COLORS["text_muted"])
 
@@ -876,15 +3618,21 @@ class InteractiveSimulation(tk.Toplevel):
             spine.set_alpha(0.3)
 
         # Değerleri bar üzerine yaz
+        bar_labels = []
         for bar, val in zip(bars, transient_values):
-            ax2.text(
-                bar.get_width() + 50,
-                bar.get_y() + bar.get_height() / 2,
-                f"{int(val):,}",
-                va="center",
-                fontsize=8,
-                color=COLORS["text"],
+            bar_labels.append(
+                ax2.text(
+                    bar.get_width() + 50,
+                    bar.get_y() + bar.get_height() / 2,
+                    f"{int(val):,}",
+                    va="center",
+                    fontsize=8,
+                    color=COLORS["text"],
+                    animated=True,
+                )
             )
+        self.bar_artists = (transient_nodes, list(bars), bar_labels)
+        self.dynamic_artists += list(bars) + bar_labels
 
         # Zaman Serisi
         ax3.set_facecolor(COLORS["graph_bg"])
@@ -896,24 +3644,31 @@ class InteractiveSimulation(tk.Toplevel):
             pad=10,
         )
 
+        self.time_cursor = None
+        self.series_ax = ax3
+        self.series_lines = []
         if len(self.state_history) > 1:
-            history_array = np.array(self.state_history)
-            steps = range(len(self.state_history))
-
-            plot_nodes = ["N5", "N6", "N7", "N8"]
             plot_colors = ["#e94560", "#4ecca3", "#ffc107", "#00d9ff"]
 
-            for node, color in zip(plot_nodes, plot_colors):
-                idx = self.sim.n_map[node]
-                ax3.plot(
-                    steps,
-                    history_array[:, idx],
+            # Görünür aralığa göre seviye seçen min/max piramidi (sync_series)
+            last = len(self.state_history) - 1
+            budget = int(ax3.bbox.width)
+            steps, loads = self.series_pyramid.query(0, last, budget)
+            raw = self.series_pyramid.level_for(0, last, budget) == 0
+
+            for i, (node, color) in enumerate(zip(plot_nodes, plot_colors)):
+                (line,) = ax3.plot(
+                    steps[:, i],
+                    loads[:, i],
                     label=node,
                     color=color,
                     linewidth=2,
-                    marker="o",
+                    marker="o" if raw else None,
                     markersize=3,
                 )
+                self.series_lines.append(line)
+            ax3.set_xlim(-0.05 * last, 1.05 * last)
+            ax3.callbacks.connect("xlim_changed", self.update_series_lod)
 
             ax3.legend(
                 loc="upper left",
@@ -921,6 +3676,16 @@ class InteractiveSimulation(tk.Toplevel):
                 edgecolor=COLORS["accent"],
                 labelcolor=COLORS["text"],
             )
+
+            # Zaman çizelgesinde seçili adım
+            self.time_cursor = ax3.axvline(
+                len(self.state_history) - 1,
+                color=COLORS["text"],
+                linewidth=1.5,
+                linestyle="--",
+                animated=True,
+            )
+            self.dynamic_artists.append(self.time_cursor)
         else:
             ax3.text(
                 0.5,
@@ -944,9 +3709,190 @@ class InteractiveSimulation(tk.Toplevel):
 
         fig.tight_layout(pad=2)
 
-        canvas = FigureCanvasTkAgg(fig, master=self.viz_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.blit_background = None
+        self.canvas = FigureCanvasTkAgg(fig, master=self.viz_frame)
+        self.canvas.mpl_connect("draw_event", self.on_canvas_draw)
+        self.canvas.mpl_connect("scroll_event", self.on_canvas_scroll)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Zaman çizelgesi son adımı gösterir
+        first, last = timeline_range(len(self.state_history))
+        self.timeline_slider.set_range(first, last)
+        self.timeline_slider.set(last, trigger_callback=True)
+
+    def node_styles(self, state):
+        """Tüm düğümlerin (boyut, renk) dizileri, vektörel"""
+        nodes = np.asarray(self.sim.nodes)
+        max_val = max(np.max(state), 1)
+
+        # Yoğunluğa göre renk ve boyut
+        intensity = np.minimum(np.asarray(state, dtype=np.float64) / max_val, 1)
+        sizes = 300 + intensity * 400
+        colors = np.where(
+            intensity > 0.7,
+            COLORS["accent"],
+            np.where(intensity > 0.3, COLORS["warning"], COLORS["success"]),
+        ).astype(object)
+
+        exits = np.isin(nodes, self.sim.absorbing_nodes)
+        entries = np.isin(nodes, self.sim.entry_nodes)
+        sizes[exits | entries] = 400
+        colors[exits] = COLORS["success"]  # Çıkışlar
+        colors[entries] = "#3498db"  # Girişler
+
+        # Büyük ağlarda işaretçiler küçülür
+        return sizes * min(1.0, np.sqrt(30 / self.sim.n_len)), list(colors)
+
+    def update_node_labels(self):
+        """Görünür düğüm sayısı NODE_LABEL_LIMIT altındaysa etiketleri göster"""
+        ax = self.network_ax
+        xy = self.node_xy
+        show = labelled_nodes(xy, ax.get_xlim(), ax.get_ylim())
+
+        for i in set(self.node_labels) - show:
+            self.node_labels.pop(i).remove()
+        for i in show - set(self.node_labels):
+            self.node_labels[i] = ax.annotate(
+                "",
+                tuple(xy[i]),
+                ha="center",
+                va="center",
+                fontsize=7,
+                fontweight="bold",
+                color="white",
+                zorder=6,
+                animated=True,
+            )
+        for i, label in self.node_labels.items():
+            label.set_text(f"{self.sim.nodes[i]}\n{int(self.displayed_state[i]):,}")
+
+    def on_canvas_scroll(self, event):
+        """Fare tekerleği: ağ haritasında yakınlaştır, zaman serisinde yatay yakınlaştır"""
+        ax = event.inaxes
+        if ax is None or ax not in (self.network_ax, self.series_ax):
+            return
+        factor = 0.8 if event.button == "up" else 1.25
+        ax.set_xlim([event.xdata + (v - event.xdata) * factor for v in ax.get_xlim()])
+        if ax is self.network_ax:
+            ax.set_ylim(
+                [event.ydata + (v - event.ydata) * factor for v in ax.get_ylim()]
+            )
+        self.canvas.draw_idle()
+
+    def sync_series(self, columns, peak_columns):
+        """Zaman serisi piramidini ve geçmiş tepe değerini geçmişle eşitle
+
+        Yeni adımlar artımlı eklenir (adım başına O(k + log T)); dal
+        değişince ya da geçmiş sıfırlanınca (farklı depo, kısalan geçmiş)
+        baştan kurulur.
+        """
+        history = self.state_history
+        source = (history, history.store)
+        stale = (
+            self.series_source is None
+            or any(a is not b for a, b in zip(source, self.series_source))
+            or len(history) < len(self.series_pyramid)
+        )
+        start = 0 if stale else len(self.series_pyramid)
+        new = history.array(start)
+        if stale:
+            self.series_pyramid = HistoryPyramid(new[:, columns])
+            self.series_source = source
+            self.series_peak = 0.0
+        else:
+            self.series_pyramid.extend(new[:, columns])
+        if len(new):
+            self.series_peak = max(self.series_peak, new[:, peak_columns].max())
+
+    def update_series_lod(self, ax):
+        """Zaman serisi çizgilerini görünür aralığa uygun piramit seviyesiyle yenile"""
+        if not self.series_lines:
+            return
+        x0, x1 = sorted(ax.get_xlim())
+        budget = int(ax.bbox.width)
+        steps, loads = self.series_pyramid.query(x0, x1, budget)
+        raw = self.series_pyramid.level_for(x0, x1, budget) == 0
+        for i, line in enumerate(self.series_lines):
+            line.set_data(steps[:, i], loads[:, i])
+            line.set_marker("o" if raw else "None")
+
+    def animated_artists(self):
+        return self.dynamic_artists + list(self.node_labels.values())
+
+    @staticmethod
+    def bar_color(val):
+        if val > 3000:
+            return COLORS["accent"]
+        if val > 1000:
+            return COLORS["warning"]
+        return COLORS["success"]
+
+    def on_canvas_draw(self, event):
+        """Tam çizimden sonra arka planı sakla, dinamik sanatçıları üstüne çiz"""
+        self.blit_background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        for artist in self.animated_artists():
+            self.canvas.figure.draw_artist(artist)
+
+    def show_step(self, step):
+        """Geçmişteki bir adımı O(1) erişimle göster (yalnızca blit)"""
+        step = clamp_step(step, len(self.state_history))
+        if step is None or self.blit_background is None:
+            return
+        state = self.state_history[step]
+
+        sizes, colors = self.node_styles(state)
+        self.node_collection.set_sizes(sizes)
+        self.node_collection.set_facecolor(colors)
+        self.displayed_state = state
+        for i, label in self.node_labels.items():
+            label.set_text(f"{self.sim.nodes[i]}\n{int(state[i]):,}")
+
+        transient_nodes, bars, bar_labels = self.bar_artists
+        for node, bar, text in zip(transient_nodes, bars, bar_labels):
+            val = state[self.sim.n_map[node]]
+            bar.set_width(val)
+            bar.set_color(self.bar_color(val))
+            text.set_x(val + 50)
+            text.set_text(f"{int(val):,}")
+
+        if self.time_cursor is not None:
+            self.time_cursor.set_xdata([step, step])
+
+        self.canvas.restore_region(self.blit_background)
+        for artist in self.animated_artists():
+            self.canvas.figure.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def toggle_playback(self):
+        if self.play_job is not None:
+            self.stop_playback()
+            return
+        if len(self.state_history) < 2:
+            return
+        # Sondaysa baştan oynat
+        if next_play_step(self.timeline_slider.get(), len(self.state_history)) is None:
+            self.timeline_slider.set(0, trigger_callback=True)
+        self.play_button.text = "⏸ Durdur"
+        self.play_button.draw_button()
+        self.play_job = self.after(0, self.play_tick)
+
+    def play_tick(self):
+        step = next_play_step(self.timeline_slider.get(), len(self.state_history))
+        if step is None:
+            self.stop_playback()
+            return
+        self.timeline_slider.set(step, trigger_callback=True)
+        self.play_job = self.after(
+            int(1000 / max(self.speed_slider.get(), 1)), self.play_tick
+        )
+
+    def stop_playback(self):
+        if self.play_job is not None:
+            self.after_cancel(self.play_job)
+            self.play_job = None
+        self.play_button.text = "▶ Oynat"
+        self.play_button.draw_button()
 
 
 class App(tk.Tk):
@@ -966,6 +3912,8 @@ class App(tk.Tk):
         self.configure_styles()
 
         self.create_widgets()
+        self.worker = BackgroundWorker(self, on_progress=self.update_progress)
+        self.sim.p_listeners.append(self.on_p_change)
 
     def configure_styles(self):
         self.style.configure("Dark.TFrame", background=COLORS["bg_dark"])
@@ -1056,6 +4004,9 @@ class App(tk.Tk):
         )
         btn4.pack(pady=8)
 
+        btn5 = ModernButton(buttons_frame, "🔀  Rota Düzenle", self.open_routing_editor)
+        btn5.pack(pady=8)
+
         # Info Card
         info_frame = tk.Frame(left_panel, bg="#1e3a5f")
         info_frame.pack(fill=tk.X, padx=20, pady=20)
@@ -1071,7 +4022,12 @@ class App(tk.Tk):
 
         info_text = tk.Label(
             info_frame,
-            text="Rush Hour: 08:00 & 17:00\nNormal: <2000 araç/saat\n\n13 düğümlü ağ modeli\n4 çıkış noktası (N3,N9,N10,N12)",
+            text=(
+                "Rush Hour: 08:00 & 17:00\nNormal: <2000 araç/saat\n\n"
+                f"{self.sim.n_len} düğümlü ağ modeli\n"
+                f"{len(self.sim.absorbing_nodes)} çıkış noktası "
+                f"({','.join(self.sim.absorbing_nodes)})"
+            ),
             bg="#1e3a5f",
             fg=COLORS["text_muted"],
             font=("Segoe UI", 9),
@@ -1079,6 +4035,23 @@ class App(tk.Tk):
         )
         info_text.pack(anchor="w", padx=15, pady=(0, 15))
 
+        # İlerleme çubuğu ve iptal
+        progress_frame = tk.Frame(left_panel, bg=COLORS["bg_card"])
+        progress_frame.pack(fill=tk.X, padx=20)
+
+        self.progress_bar = ttk.Progressbar(
+            progress_frame, mode="determinate", maximum=1.0
+        )
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+
+        ModernButton(
+            progress_frame,
+            "✖ İptal",
+            self.cancel_computation,
+            width=80,
+            height=28,
+        ).pack(side=tk.RIGHT)
+
         # Log Alanı
         log_label = tk.Label(
             left_panel,
@@ -1104,11 +4077,17 @@ class App(tk.Tk):
         # Sağ Panel (Grafik)
         self.graph_frame = tk.Frame(main_container, bg=COLORS["bg_card"])
         self.graph_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        # Grafik bitmap'i pencere boyutunu itmesin; boyut değişince yeniden çizilir
+        self.graph_frame.pack_propagate(False)
+        self.results_size = None
+        self.resize_throttle = IdleThrottle(self, self.refresh_results)
+        self.graph_frame.bind("<Configure>", self.on_graph_configure)
 
         # Başlangıç mesajı
         self.show_welcome()
 
     def show_welcome(self):
+        self.results_size = None
         for widget in self.graph_frame.winfo_children():
             widget.destroy()
 
@@ -1139,8 +4118,30 @@ class App(tk.Tk):
         self.log("✓ İnteraktif mod açıldı!")
         InteractiveSimulation(self, self.sim)
 
+    def update_progress(self, done, total):
+        self.progress_bar["value"] = done / total if total else 0
+
+    def cancel_computation(self):
+        if self.worker.busy():
+            self.worker.cancel_all()
+            self.log("✗ Hesaplama iptal edildi.")
+
     def run_sim(self):
-        self.history = self.sim.run_simulation()
+        # Rota düzenleyicisi P'yi bu arada değiştirebilir: görüntü gönderilir
+        P, _ = self.sim.p_snapshot()
+        self.worker.submit(
+            "sim",
+            lambda progress: self.sim.run_simulation(progress=progress, P=P),
+            self.on_sim_done,
+        )
+
+    def on_p_change(self, node):
+        """P düzenlendi: eski P ile süren hesapların sonuçları atılır"""
+        self.worker.invalidate("sim")
+        self.worker.invalidate("steady")
+
+    def on_sim_done(self, history):
+        self.history = history
         self.log("✓ Simülasyon tamamlandı!")
         self.log(f"  24 saatlik veri oluşturuldu.")
         self.plot_results()
@@ -1149,96 +4150,37 @@ class App(tk.Tk):
         for widget in self.graph_frame.winfo_children():
             widget.destroy()
 
-        # Figure oluştur
-        fig = Figure(figsize=(10, 7), facecolor=COLORS["bg_card"])
-
-        # 2 subplot: üstte ana grafik, altta heatmap
-        ax1 = fig.add_subplot(211)
-        ax2 = fig.add_subplot(212)
-
-        hours = np.arange(24)
-
-        # Grafik 1: Düğüm yoğunlukları
-        ax1.set_facecolor(COLORS["graph_bg"])
-
-        colors_plot = ["#e94560", "#4ecca3", "#ffc107", "#00d9ff"]
-        target_nodes = ["N5", "N6", "N7", "N8"]
-
-        for i, node in enumerate(target_nodes):
-            idx = self.sim.n_map[node]
-            ax1.plot(
-                hours,
-                self.history[:, idx],
-                label=f"{node}",
-                color=colors_plot[i],
-                linewidth=2.5,
-                marker="o",
-                markersize=4,
-            )
-
-        # Rush hour bölgelerini vurgula
-        ax1.axvspan(7.5, 8.5, alpha=0.3, color="#e94560", label="Rush Hour")
-        ax1.axvspan(16.5, 17.5, alpha=0.3, color="#e94560")
-
-        ax1.set_title(
-            "🚦 Saatlik Düğüm Yoğunlukları",
-            fontsize=14,
-            fontweight="bold",
-            color=COLORS["text"],
-            pad=15,
+        # Aynı geçmiş ve boyut için hazır bitmap yeniden kullanılır
+        figsize = _figure_size(self.graph_frame, (10, 7))
+        key = ("results", _array_key(self.history), figsize)
+        show_cached_figure(
+            self.graph_frame, key, lambda: self.build_results_figure(figsize)
         )
-        ax1.set_xlabel("Saat", fontsize=10, color=COLORS["text_muted"])
-        ax1.set_ylabel("Araç Sayısı", fontsize=10, color=COLORS["text_muted"])
-        ax1.legend(
-            loc="upper right",
-            facecolor=COLORS["bg_card"],
-            edgecolor=COLORS["accent"],
-            labelcolor=COLORS["text"],
-        )
-        ax1.grid(True, alpha=0.2, color=COLORS["text_muted"])
-        ax1.tick_params(colors=COLORS["text_muted"])
-        ax1.set_xticks(range(0, 24, 2))
+        self.results_size = figsize
 
-        for spine in ax1.spines.values():
-            spine.set_color(COLORS["text_muted"])
-            spine.set_alpha(0.3)
+    def on_graph_configure(self, event):
+        if self.results_size is not None:
+            self.resize_throttle.schedule()
 
-        # Grafik 2: Tüm düğümlerin heatmap'i
-        ax2.set_facecolor(COLORS["graph_bg"])
-
-        # Sadece transient (geçici) düğümleri göster
-        transient_nodes = [
-            n for n in self.sim.nodes if n not in ["N3", "N9", "N10", "N12"]
-        ]
-        transient_indices = [self.sim.n_map[n] for n in transient_nodes]
-        transient_data = self.history[:, transient_indices].T
+    def refresh_results(self):
+        """Pencere boyutu değiştiyse sonuç grafiğini yeni boyutta göster"""
+        if self.results_size is None or self.history is None:
+            return
+        if _figure_size(self.graph_frame, self.results_size) != self.results_size:
+            self.plot_results()
 
-        im = ax2.imshow(
-            transient_data, aspect="auto", cmap="hot", interpolation="nearest"
-        )
-        ax2.set_yticks(range(len(transient_nodes)))
-        ax2.set_yticklabels(transient_nodes)
-        ax2.set_xticks(range(0, 24, 2))
-        ax2.set_xlabel("Saat", fontsize=10, color=COLORS["text_muted"])
-        ax2.set_title(
-            "🔥 Trafik Yoğunluk Haritası (Heatmap)",
-            fontsize=14,
-            fontweight="bold",
-            color=COLORS["text"],
-            pad=15,
-        )
-        ax2.tick_params(colors=COLORS["text_muted"])
+    def build_results_figure(self, figsize=(10, 7)):
+        """Saatlik yoğunluk grafiği ve heatmap figürünü oluştur"""
+        fig = Figure(figsize=figsize, facecolor=COLORS["bg_card"])
 
-        cbar = fig.colorbar(im, ax=ax2, shrink=0.8)
-        cbar.ax.tick_params(colors=COLORS["text_muted"])
-        cbar.set_label("Araç Sayısı", color=COLORS["text_muted"])
+        # 2 subplot: üstte ana grafik, altta heatmap
+        ax1 = fig.add_subplot(211)
+        ax2 = fig.add_subplot(212)
+        draw_load_chart(ax1, self.sim, self.history)
+        draw_load_heatmap(fig, ax2, self.sim, self.history)
 
         fig.tight_layout(pad=3)
-
-        # Canvas'a yerleştir
-        canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        return fig
 
     def show_bottleneck(self):
         if self.history is None:
@@ -1282,7 +4224,16 @@ class App(tk.Tk):
         close_btn.pack(pady=10)
 
     def show_steady_state(self):
-        node, N_matrix = self.sim.analyze_steady_state()
+        # Rota düzenleyicisi P'yi bu arada değiştirebilir: görüntü gönderilir
+        snapshot = self.sim.p_snapshot()
+        self.worker.submit(
+            "steady",
+            lambda progress: self.sim.analyze_steady_state(snapshot),
+            self.on_steady_state_done,
+        )
+
+    def on_steady_state_done(self, result):
+        node, N_matrix = result
 
         if node:
             self.log("\n─── STEADY STATE ───")
@@ -1333,6 +4284,126 @@ analizi ile tespit edilmiştir."""
         else:
             self.log("✗ Matris hatası!")
 
+    def open_routing_editor(self):
+        """Kavşak dağılımlarını sürükleyerek düzenle, yapısal darboğazı canlı izle"""
+        if getattr(self, "routing_window", None) and self.routing_window.winfo_exists():
+            self.routing_window.lift()
+            return
+
+        self.log("\n─── ROTA DÜZENLEME ───")
+        window = tk.Toplevel(self)
+        window.title("🔀 Rota Düzenleme")
+        window.geometry("420x560")
+        window.configure(bg=COLORS["bg_card"])
+        window.transient(self)
+        self.routing_window = window
+
+        tk.Label(
+            window,
+            text="Kavşak Dağılımları",
+            bg=COLORS["bg_card"],
+            fg=COLORS["text"],
+            font=("Segoe UI", 14, "bold"),
+        ).pack(pady=(20, 10))
+
+        # Birden fazla çıkışı olan geçici düğümler düzenlenebilir
+        junctions = [
+            node
+            for node in self.sim.nodes
+            if node not in self.sim.absorbing_nodes
+            and np.count_nonzero(self.sim.P[self.sim.n_map[node]]) > 1
+        ]
+        self.routing_node = tk.StringVar(value=junctions[0] if junctions else "")
+        selector = ttk.Combobox(
+            window,
+            textvariable=self.routing_node,
+            values=junctions,
+            state="readonly",
+            width=12,
+        )
+        selector.pack(pady=5)
+        selector.bind("<<ComboboxSelected>>", lambda e: self.select_routing_node())
+
+        self.routing_frame = tk.Frame(window, bg=COLORS["bg_card"])
+        self.routing_frame.pack(fill=tk.X, padx=20, pady=10)
+        self.routing_sliders = {}
+
+        self.routing_result = tk.Label(
+            window,
+            text="",
+            bg=COLORS["bg_card"],
+            fg=COLORS["text_muted"],
+            font=("Consolas", 10),
+            justify="left",
+        )
+        self.routing_result.pack(pady=10)
+
+        ModernButton(
+            window, "↺ Varsayılan", self.reset_routing, width=140, height=36
+        ).pack(pady=5)
+
+        self.select_routing_node()
+
+    def select_routing_node(self):
+        """Seçili kavşağın her çıkışı için bir yüzde slider'ı oluştur"""
+        for widget in self.routing_frame.winfo_children():
+            widget.destroy()
+        self.routing_sliders = {}
+
+        src = self.routing_node.get()
+        if not src:
+            return
+        row = self.sim.P[self.sim.n_map[src]]
+        for j in np.flatnonzero(row):
+            dst = self.sim.nodes[j]
+            slider = ModernSlider(
+                self.routing_frame,
+                f"{src} → {dst} (%)",
+                1,
+                99,
+                int(round(row[j] * 100)),
+                command=lambda value, dst=dst: self.on_routing_change(dst, value),
+            )
+            slider.pack(fill=tk.X, pady=4)
+            self.routing_sliders[dst] = slider
+        self.update_routing_result()
+
+    def on_routing_change(self, dst, value):
+        """Bir olasılık değişti: P satırı ve önbellekli N rank-1 güncellenir"""
+        src = self.routing_node.get()
+        try:
+            self.sim.set_transition(src, dst, value / 100)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            self.log(f"✗ {e}")
+            return
+
+        # Satırın diğer olasılıkları orantılı değişti, slider'ları eşitle
+        # (set() komutu tetiklemez)
+        row = self.sim.P[self.sim.n_map[src]]
+        for other, slider in self.routing_sliders.items():
+            if other != dst:
+                slider.set(int(round(row[self.sim.n_map[other]] * 100)))
+        self.update_routing_result()
+
+    def update_routing_result(self):
+        """Yapısal darboğazı ve en çok ziyaret edilen düğümleri göster"""
+        try:
+            transient_nodes, _, col_sums = self.sim.fundamental()
+        except np.linalg.LinAlgError:
+            self.routing_result.config(text="✗ Matris tekil")
+            return
+        node, visits = self.sim.structural_bottleneck()
+        lines = [f"Yapısal darboğaz: {node} ({visits:.2f} ziyaret)", ""]
+        for k in np.argsort(col_sums)[::-1][:5]:
+            lines.append(f"  {transient_nodes[k]:>4}  {col_sums[k]:7.3f}")
+        self.routing_result.config(text="\n".join(lines))
+
+    def reset_routing(self):
+        """P'yi varsayılan dağılımlara döndür"""
+        self.sim.setup_matrix()
+        self.log("  P varsayılan değerlere döndü.")
+        self.select_routing_node()
+
     def show_probability_matrix(self):
         """P olasılık matrisini görselleştir"""
         self.log("\n─── P MATRİSİ ───")
@@ -1377,58 +4448,6 @@ analizi ile tespit edilmiştir."""
         left_frame = tk.Frame(content_frame, bg=COLORS["bg_card"])
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
 
-        fig = Figure(figsize=(6, 5), facecolor=COLORS["bg_card"])
-        ax = fig.add_subplot(111)
-        ax.set_facecolor(COLORS["graph_bg"])
-
-        # Heatmap çiz
-        im = ax.imshow(self.sim.P, cmap="YlOrRd", aspect="auto", vmin=0, vmax=1)
-
-        # Eksen etiketleri
-        ax.set_xticks(range(self.sim.n_len))
-        ax.set_yticks(range(self.sim.n_len))
-        ax.set_xticklabels(self.sim.nodes, fontsize=8, rotation=45)
-        ax.set_yticklabels(self.sim.nodes, fontsize=8)
-        ax.tick_params(colors=COLORS["text_muted"])
-
-        # Her hücreye değer yaz
-        for i in range(self.sim.n_len):
-            for j in range(self.sim.n_len):
-                val = self.sim.P[i, j]
-                if val > 0:
-                    color = "white" if val > 0.5 else "black"
-                    ax.text(
-                        j,
-                        i,
-                        f"{val:.1f}",
-                        ha="center",
-                        va="center",
-                        fontsize=7,
-                        color=color,
-                        fontweight="bold",
-                    )
-
-        ax.set_title(
-            "Geçiş Olasılıkları Heatmap",
-            fontsize=12,
-            fontweight="bold",
-            color=COLORS["text"],
-            pad=10,
-        )
-        ax.set_xlabel("Hedef Düğüm (j)", fontsize=10, color=COLORS["text_muted"])
-        ax.set_ylabel("Kaynak Düğüm (i)", fontsize=10, color=COLORS["text_muted"])
-
-        # Colorbar
-        cbar = fig.colorbar(im, ax=ax, shrink=0.8)
-        cbar.ax.tick_params(colors=COLORS["text_muted"])
-        cbar.set_label("Olasılık", color=COLORS["text_muted"])
-
-        fig.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=left_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-
         # Sağ Panel - Detaylı Geçiş Listesi
         right_frame = tk.Frame(content_frame, bg=COLORS["bg_card"], width=350)
         right_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
@@ -1461,38 +4480,9 @@ analizi ile tespit edilmiştir."""
         detail_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=detail_text.yview)
 
-        # Geçişleri listele
-        detail_text.insert(tk.END, "═══ YUTAN DÜĞÜMLER ═══\n")
-        detail_text.insert(tk.END, "(Çıkış Noktaları)\n\n")
-        for node in ["N3", "N9", "N10", "N12"]:
-            detail_text.insert(tk.END, f"  • {node} → {node} (1.0)\n")
-
-        detail_text.insert(tk.END, "\n═══ DİREKT GEÇİŞLER ═══\n\n")
-        direct_transitions = [
-            ("N1", "N5", "Giriş → Kavşak"),
-            ("N2", "N6", "Giriş → Kavşak"),
-            ("N4", "N8", "Giriş → Kavşak"),
-            ("N11", "N13", "Giriş → Kavşak"),
-        ]
-        for src, dst, desc in direct_transitions:
-            detail_text.insert(tk.END, f"  • {src} → {dst} (1.0)\n")
-            detail_text.insert(tk.END, f"    {desc}\n\n")
-
-        detail_text.insert(tk.END, "═══ KAVŞAK DAĞILIMLARI ═══\n\n")
-        distributions = [
-            ("N5", [("N6", 0.7), ("N9", 0.3)]),
-            ("N6", [("N3", 0.2), ("N7", 0.4), ("N10", 0.4)]),
-            ("N7", [("N5", 0.3), ("N8", 0.7)]),
-            ("N8", [("N5", 0.5), ("N10", 0.5)]),
-            ("N13", [("N5", 0.5), ("N12", 0.5)]),
-        ]
-        for src, targets in distributions:
-            detail_text.insert(tk.END, f"  {src} düğümünden:\n")
-            for dst, prob in targets:
-                bar = "█" * int(prob * 10) + "░" * (10 - int(prob * 10))
-                detail_text.insert(tk.END, f"    → {dst}: {bar} {prob:.0%}\n")
-            detail_text.insert(tk.END, "\n")
-
+        # Geçişleri listele (pencere açıldığı andaki P'den)
+        P, _ = self.sim.p_snapshot()
+        detail_text.insert(tk.END, transition_details(self.sim, P))
         detail_text.config(state=tk.DISABLED)
 
         # Alt bilgi
@@ -1513,7 +4503,181 @@ analizi ile tespit edilmiştir."""
         )
         close_btn.pack(pady=10)
 
+        # Heatmap: yerleşim tamamlandıktan sonra, önbellekten
+        p_key = _array_key(P)
+        figsize = _figure_size(left_frame, (6, 5))
+        label, layout = show_cached_figure(
+            left_frame,
+            ("pmatrix", p_key, figsize),
+            lambda: self.build_matrix_figure(
+                P, self.sim.nodes, self.sim.nodes, figsize
+            ),
+        )
+        if self.sim.n_len > MATRIX_TEXT_LIMIT:
+            label.bind(
+                "<Button-1>",
+                lambda e: self.open_matrix_tile(e, layout, P, p_key),
+            )
+            label.config(cursor="hand2")
+
+    def build_matrix_figure(self, block, row_labels, col_labels, figsize, title=None):
+        """P (veya bir karesi) için heatmap figürü
+
+        Küçük matrislerde hücre değerleri yazılır; büyük matrisler blok
+        maksimumu ile havuzlanıp tek bir görüntü olarak çizilir.
+        """
+        fig = Figure(figsize=figsize, facecolor=COLORS["bg_card"])
+        ax = fig.add_subplot(111)
+        ax.set_facecolor(COLORS["graph_bg"])
+        n_rows, n_cols = block.shape
+
+        if max(n_rows, n_cols) <= MATRIX_TEXT_LIMIT:
+            # Heatmap çiz
+            im = ax.imshow(block, cmap="YlOrRd", aspect="auto", vmin=0, vmax=1)
+
+            # Eksen etiketleri
+            ax.set_xticks(range(n_cols))
+            ax.set_yticks(range(n_rows))
+            ax.set_xticklabels(col_labels, fontsize=8, rotation=45)
+            ax.set_yticklabels(row_labels, fontsize=8)
+
+            # Her hücreye değer yaz
+            for i, j in zip(*np.nonzero(block > 0)):
+                val = block[i, j]
+                ax.text(
+                    j,
+                    i,
+                    f"{val:.1f}",
+                    ha="center",
+                    va="center",
+                    fontsize=7,
+                    color="white" if val > 0.5 else "black",
+                    fontweight="bold",
+                )
+        else:
+            # Büyük ağ: tek vektörel görüntü, tıklanan karo yakınlaştırılır
+            im = ax.imshow(
+                _pool_matrix(block, MATRIX_OVERVIEW_PIXELS),
+                cmap="YlOrRd",
+                aspect="auto",
+                vmin=0,
+                vmax=1,
+                interpolation="nearest",
+                extent=(-0.5, n_cols - 0.5, n_rows - 0.5, -0.5),
+            )
+        ax.tick_params(colors=COLORS["text_muted"])
+
+        ax.set_title(
+            title or "Geçiş Olasılıkları Heatmap",
+            fontsize=12,
+            fontweight="bold",
+            color=COLORS["text"],
+            pad=10,
+        )
+        ax.set_xlabel("Hedef Düğüm (j)", fontsize=10, color=COLORS["text_muted"])
+        ax.set_ylabel("Kaynak Düğüm (i)", fontsize=10, color=COLORS["text_muted"])
+
+        # Colorbar
+        cbar = fig.colorbar(im, ax=ax, shrink=0.8)
+        cbar.ax.tick_params(colors=COLORS["text_muted"])
+        cbar.set_label("Olasılık", color=COLORS["text_muted"])
+
+        fig.tight_layout()
+        return fig
+
+    def open_matrix_tile(self, event, layout, P, p_key):
+        """Genel görünümde tıklanan bölgenin MATRIX_TILE boyutlu karesini aç"""
+        x0, y0, width, height = layout["axes"][0]
+        fx = (event.x - x0) / width
+        fy = (layout["size"][1] - event.y - y0) / height
+        if not (0 <= fx < 1 and 0 <= fy < 1):
+            return
+
+        n = self.sim.n_len
+        i0 = int((1 - fy) * n) // MATRIX_TILE * MATRIX_TILE
+        j0 = int(fx * n) // MATRIX_TILE * MATRIX_TILE
+        rows = slice(i0, min(i0 + MATRIX_TILE, n))
+        cols = slice(j0, min(j0 + MATRIX_TILE, n))
+
+        tile_window = tk.Toplevel(self)
+        tile_window.title(f"🔍 P[{rows.start}:{rows.stop}, {cols.start}:{cols.stop}]")
+        tile_window.configure(bg=COLORS["bg_card"])
+        tile_window.transient(self)
+        show_cached_figure(
+            tile_window,
+            ("ptile", p_key, i0, j0),
+            lambda: self.build_matrix_figure(
+                P[rows, cols],
+                self.sim.nodes[rows],
+                self.sim.nodes[cols],
+                (7, 6),
+                title=f"Karo: satır {rows.start}-{rows.stop - 1}, sütun {cols.start}-{cols.stop - 1}",
+            ),
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Markov zinciri trafik simülasyonu")
+    commands = parser.add_subparsers(dest="command")
+
+    report = commands.add_parser(
+        "report", help="Senaryo dosyasından başsız (headless) rapor üret"
+    )
+    report.add_argument("scenarios", help="JSON senaryo dosyası")
+    report.add_argument("-o", "--out", default="reports", help="Çıktı klasörü")
+    report.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Paralel süreç sayısı"
+    )
+
+    batch = commands.add_parser(
+        "batch", help="Senaryo dosyasını toplu çalıştır, sonuçları klasöre yaz"
+    )
+    batch.add_argument("scenarios", help="JSON senaryo dosyası")
+    batch.add_argument("-o", "--out", default="results", help="Sonuç klasörü")
+    batch.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Paralel süreç sayısı"
+    )
+
+    replay = commands.add_parser(
+        "replay", help="Kaydedilmiş interaktif oturumu arayüzsüz oynat"
+    )
+    replay.add_argument("session", help="Oturum günlüğü (JSON)")
+    replay.add_argument("-o", "--out", help="Dal geçmişlerinin yazılacağı .npz")
+
+    args = parser.parse_args(argv)
+    if args.command == "replay":
+        branches = replay_session(load_session(args.session))
+        for name, branch in branches.items():
+            print(
+                f"🌿 {name}: {len(branch['history'])} adım, "
+                f"saat {branch['hour']:02d}:00, "
+                f"toplam araç {int(branch['state'].sum()):,}"
+            )
+        if args.out:
+            np.savez_compressed(
+                args.out, **{name: b["history"] for name, b in branches.items()}
+            )
+        return
+    if args.command == "batch":
+        stats = run_batch(load_scenarios(args.scenarios), args.out, jobs=args.jobs)
+        print(
+            f"✓ {stats['scenarios']} senaryo, {stats['computed']} hesaplama "
+            f"({stats['reused']} tekrar kullanıldı), {stats['wall_seconds']:.2f} sn: "
+            f"{os.path.join(args.out, 'summary.json')}"
+        )
+        return
+    if args.command == "report":
+        summaries = generate_reports(
+            load_scenarios(args.scenarios), args.out, jobs=args.jobs
+        )
+        print(
+            f"✓ {len(summaries)} senaryo raporu: {os.path.join(args.out, 'index.html')}"
+        )
+        return
 
-if __name__ == "__main__":
     app = App()
     app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
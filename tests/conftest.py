@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# main.py depo kökünde, tek modül
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import TrafficSimulation  # noqa: E402
+
+
+def build_synthetic_network(n, seed=0):
+    """Döngüsüz rastgele ağ; bazı düğümlere hiçbir yol girmez (akışsız)
+
+    İlk n/20 düğüm giriş, son n/10 düğüm yutan düğümdür; her geçici düğüm
+    kendisinden sonraki en fazla üç düğüme dağılır. Girişlerden hemen
+    sonraki n/20 düğüm hiçbir yerden araç almaz.
+    """
+    rng = np.random.default_rng(seed)
+    sim = TrafficSimulation()
+    sim.nodes = [f"M{i}" for i in range(n)]
+    sim.n_map = {node: i for i, node in enumerate(sim.nodes)}
+    sim.n_len = n
+    n_entries, n_exits = n // 20, n // 10
+    sim.entry_nodes = sim.nodes[:n_entries]
+    sim.absorbing_nodes = sim.nodes[n - n_exits :]
+
+    dark = np.arange(n_entries, 2 * n_entries)
+    P = np.zeros((n, n))
+    for i in range(n - n_exits):
+        candidates = np.setdiff1d(np.arange(max(i + 1, 2 * n_entries), n), dark)
+        targets = rng.choice(candidates, size=min(3, len(candidates)), replace=False)
+        P[i, targets] = rng.dirichlet(np.ones(len(targets)))
+    P[np.arange(n - n_exits, n), np.arange(n - n_exits, n)] = 1.0
+    sim.P = P
+    sim.invalidate_fundamental()
+    return sim
+
+
+@pytest.fixture
+def synthetic_network():
+    return build_synthetic_network
@@ -0,0 +1,79 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from main import TrafficSimulation, build_scenario, run_batch
+
+SCENARIOS = [
+    {"name": "base", "analyses": ["steady_state", "od"]},
+    {"name": "heavy N1", "inflows": {"N1": 3000}, "analyses": ["steady_state", "od"]},
+    {
+        "name": "detour",
+        "transitions": {"N6": {"N3": 0.5, "N10": 0.5}},
+        "analyses": ["steady_state"],
+    },
+]
+
+
+def test_shared_computations_run_once(tmp_path):
+    stats = run_batch(SCENARIOS, str(tmp_path), jobs=1)
+    # 3 simülasyon + yapısal analizler: temel P için 2, değişik P için 1
+    assert stats["computations"] == 6
+    assert stats["computed"] == 6
+    assert stats["reused"] == 2
+
+    with open(tmp_path / "0001_heavy_N1.json", encoding="utf-8") as f:
+        heavy = json.load(f)
+    assert heavy["timings"]["steady_state"]["reused"]
+    assert not heavy["timings"]["simulation"]["reused"]
+
+
+def test_results_match_direct_run(tmp_path):
+    run_batch(SCENARIOS[:1], str(tmp_path), jobs=1)
+    with open(tmp_path / "0000_base.json", encoding="utf-8") as f:
+        base = json.load(f)["results"]
+
+    sim = TrafficSimulation()
+    history = np.load(tmp_path / base["simulation"]["history_file"])
+    np.testing.assert_allclose(history, sim.run_simulation(24), rtol=1e-12)
+    np.testing.assert_allclose(
+        base["od"]["exit_share"], sim.analyze_od()["exit_share"], rtol=1e-12
+    )
+
+
+def test_second_run_reuses_stored_objects(tmp_path):
+    run_batch(SCENARIOS, str(tmp_path), jobs=1)
+    stats = run_batch(SCENARIOS, str(tmp_path), jobs=1)
+    assert stats["computed"] == 0
+    assert stats["reused"] == sum(1 + len(s["analyses"]) for s in SCENARIOS)
+    assert os.path.exists(tmp_path / "summary.json")
+
+
+def test_transition_rows_are_normalized():
+    sim, _ = build_scenario({"transitions": {"N6": {"N3": 1, "N10": 3}}})
+    i = sim.n_map["N6"]
+    assert sim.P[i, sim.n_map["N3"]] == 0.25 and sim.P[i, sim.n_map["N10"]] == 0.75
+    np.testing.assert_allclose(sim.P.sum(axis=1), 1.0)
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ({"transitions": {"N99": {"N3": 1.0}}}, "N99"),
+        ({"transitions": {"N6": {"N99": 1.0}}}, "N99"),
+        ({"transitions": {"N6": {"N3": -0.5, "N10": 1.5}}}, "N6 → N3"),
+        ({"transitions": {"N6": {"N3": 0.0}}}, "N6"),
+        ({"transitions": {"N3": {"N6": 1.0}}}, "N3 yutan"),
+        ({"inflows": {"N42": 100}}, "N42"),
+        ({"inflows": {"N1": [100, -5]}}, "N1"),
+        ({"precision": "float16"}, "float16"),
+        ({"incidents": [{"node": "N6", "close": ["N77"]}]}, "N77"),
+    ],
+)
+def test_invalid_specs_raise_clear_errors(spec, message, tmp_path):
+    spec = dict(spec, name="bozuk")
+    with pytest.raises(ValueError, match=message) as info:
+        run_batch([spec], str(tmp_path), jobs=1)
+    assert "bozuk" in str(info.value)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from main import HistoryStore, SimulationBranch
+
+
+def states(start, count, n=4):
+    return np.arange(start, start + count)[:, None] * np.ones(n)
+
+
+def test_store_grows_past_capacity():
+    store = HistoryStore(4, capacity=2)
+    store.extend(states(0, 5))
+    store.append(states(5, 1)[0])
+    np.testing.assert_array_equal(store.array(), states(0, 6))
+    assert store[3][0] == 3
+
+
+def test_fork_shares_prefix_and_diverges():
+    root = SimulationBranch("main", 4)
+    root.extend(states(0, 5))
+    child = root.fork("what-if")
+    # Ebeveyn dallanmadan sonra ilerlese de çocuğun öneki değişmez
+    root.extend(states(100, 3))
+    child.extend(states(50, 2))
+    grandchild = child.fork("deeper")
+    grandchild.append(states(70, 1)[0])
+
+    np.testing.assert_array_equal(
+        root.array(), np.vstack([states(0, 5), states(100, 3)])
+    )
+    np.testing.assert_array_equal(
+        child.array(), np.vstack([states(0, 5), states(50, 2)])
+    )
+    expected = np.vstack([states(0, 5), states(50, 2), states(70, 1)])
+    np.testing.assert_array_equal(grandchild.array(), expected)
+    assert len(grandchild) == 8
+    for i in range(-8, 8):
+        np.testing.assert_array_equal(grandchild[i], expected[i])
+    # Önek kopyalanmaz: çocuk yalnızca kendi adımlarını saklar
+    assert len(child.store) == 2 and len(grandchild.store) == 1
+
+
+def test_clear_does_not_touch_children():
+    root = SimulationBranch("main", 4)
+    root.extend(states(0, 3))
+    child = root.fork("b")
+    root.clear()
+    assert len(root) == 0
+    np.testing.assert_array_equal(child.array(), states(0, 3))
@@ -0,0 +1,70 @@
+import numpy as np
+
+from main import TrafficSimulation
+
+
+def observed(sim, hours=2000, seed=0):
+    """Girişlere rastgele sayımlar verip gözlenen geçmişi üret"""
+    rng = np.random.default_rng(seed)
+    n_entries = len(sim.entry_nodes)
+    U = np.zeros((hours, sim.n_len))
+    U[:, :n_entries] = rng.uniform(50, 500, (hours, n_entries))
+    history, _ = sim.run_steps(np.zeros(sim.n_len), U)
+    return U, history
+
+
+def no_flow_rows(sim, U, history):
+    transient = ~np.isin(sim.nodes, sim.absorbing_nodes)
+    return transient & (history.sum(axis=0) + U.sum(axis=0) == 0)
+
+
+def test_noise_free_recovery(synthetic_network):
+    sim = synthetic_network(200)
+    U, history = observed(sim)
+    P_hat, diagnostics = sim.calibrate_matrix(history, U)
+    assert diagnostics["converged"]
+    assert diagnostics["max_row_error"] < 1e-12
+    np.testing.assert_allclose(P_hat, sim.P, atol=1e-6)
+
+
+def test_default_network_recovery():
+    sim = TrafficSimulation()
+    U = np.array([sim.get_inflow(t % 24) for t in range(24 * 14)])
+    history, _ = sim.run_steps(np.zeros(sim.n_len), U)
+    true_P = sim.P.copy()
+    sim.P[:] = np.where(true_P > 0, 0.5, 0.0)  # Yalnızca yapı bilinir
+    P_hat, _ = sim.calibrate_matrix(history, U, pattern=true_P > 0)
+    np.testing.assert_allclose(P_hat, true_P, atol=1e-7)
+
+
+def test_rows_without_flow_fall_back_to_prior(synthetic_network):
+    sim = synthetic_network(200)
+    U, history = observed(sim)
+    rng = np.random.default_rng(1)
+    noisy = history + 0.01 * rng.standard_normal(history.shape)
+    P_hat, diagnostics = sim.calibrate_matrix(noisy, U)
+
+    dark = no_flow_rows(sim, U, history)
+    assert dark.any()
+    assert sorted(diagnostics["prior_rows"]) == sorted(np.array(sim.nodes)[dark])
+    np.testing.assert_allclose(P_hat[dark], sim.P[dark], atol=1e-15)
+    assert np.abs(P_hat - sim.P).max() < 1e-2
+    np.testing.assert_allclose(P_hat.sum(axis=1), 1.0, atol=1e-12)
+
+
+def test_dark_rows_keep_prior_under_count_noise(synthetic_network):
+    sim = synthetic_network(300)
+    U, history = observed(sim)
+    rng = np.random.default_rng(2)
+    noisy = history + rng.standard_normal(history.shape)  # σ ≈ 1 araç
+    P_hat, diagnostics = sim.calibrate_matrix(noisy, U)
+
+    assert abs(diagnostics["noise"] - 1.0) < 0.1
+    dark = no_flow_rows(sim, U, history)
+    assert set(np.array(sim.nodes)[dark]) <= set(diagnostics["prior_rows"])
+    np.testing.assert_allclose(P_hat[dark], sim.P[dark], atol=1e-15)
+
+    flow = np.sqrt(((history + U) ** 2).mean(axis=0))
+    busy = flow > 100
+    assert busy.sum() > 50
+    assert np.abs(P_hat[busy] - sim.P[busy]).max() < 0.02
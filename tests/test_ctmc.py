@@ -0,0 +1,47 @@
+import numpy as np
+
+from main import TrafficSimulation
+
+
+def rk4_reference(G, U, steps_per_hour, refine=50):
+    """Aynı ızgarada çok ince adımlı RK4 ile dx/dt = x·G + u"""
+    x = np.zeros(G.shape[0])
+    h = 1.0 / (steps_per_hour * refine)
+    out = []
+    for u in U:
+        for _ in range(steps_per_hour):
+            for _ in range(refine):
+                k1 = x @ G + u
+                k2 = (x + h / 2 * k1) @ G + u
+                k3 = (x + h / 2 * k2) @ G + u
+                k4 = (x + h * k3) @ G + u
+                x = x + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            out.append(x)
+    return np.array(out)
+
+
+def test_generator_rows():
+    sim = TrafficSimulation()
+    G = sim.generator_matrix()
+    np.testing.assert_allclose(G.sum(axis=1), 0.0, atol=1e-12)
+    _, a_idx = sim._split_indices()
+    assert not G[a_idx].any()
+
+
+def test_ctmc_matches_fine_rk4():
+    sim = TrafficSimulation()
+    U = np.array([sim.get_inflow(t) for t in range(6, 10)])
+    times, history = sim.run_ctmc_simulation(inflows=U, steps_per_hour=4)
+    np.testing.assert_allclose(times, np.arange(1, 17) / 4)
+    reference = rk4_reference(sim.generator_matrix(), U, 4)
+    np.testing.assert_allclose(history, reference, rtol=1e-8, atol=1e-6)
+
+
+def test_ctmc_conserves_vehicles():
+    sim = TrafficSimulation()
+    U = np.array([sim.get_inflow(t) for t in range(24)])
+    x0 = np.full(sim.n_len, 10.0)
+    times, history = sim.run_ctmc_simulation(inflows=U, x0=x0)
+    expected = x0.sum() + np.cumsum(np.repeat(U.sum(axis=1), 12)) / 12
+    np.testing.assert_allclose(history.sum(axis=1), expected, rtol=1e-10)
+    assert (history >= -1e-9).all()
@@ -0,0 +1,53 @@
+import numpy as np
+
+import main
+from main import TrafficSimulation
+
+
+def test_samples_are_stochastic_and_keep_support():
+    sim = TrafficSimulation()
+    draws = sim.sample_transition_matrices(2000, concentration=100.0, seed=1)
+    assert draws.shape == (2000, sim.n_len, sim.n_len)
+    np.testing.assert_allclose(draws.sum(axis=-1), 1.0, rtol=1e-12)
+    assert not draws[:, sim.P == 0].any()
+    _, a_idx = sim._split_indices()
+    np.testing.assert_array_equal(
+        draws[:, a_idx], np.broadcast_to(sim.P[a_idx], draws[:, a_idx].shape)
+    )
+    # Dirichlet ortalaması P; 2000 örnekte standart hata < 0.002
+    np.testing.assert_allclose(draws.mean(axis=0), sim.P, atol=0.01)
+
+
+def test_seed_is_reproducible():
+    sim = TrafficSimulation()
+    a = sim.sample_transition_matrices(5, seed=7)
+    b = sim.sample_transition_matrices(5, seed=7)
+    np.testing.assert_array_equal(a, b)
+
+
+def test_ensemble_band_and_sharp_limit():
+    sim = TrafficSimulation()
+    result = sim.run_ensemble(samples=100, hours=24, seed=3)
+    assert (result["lower"] <= result["median"] + 1e-9).all()
+    assert (result["median"] <= result["upper"] + 1e-9).all()
+    assert np.isclose(sum(result["bottleneck"].values()), 1.0)
+    assert np.isclose(sum(result["structural_bottleneck"].values()), 1.0)
+
+    # κ çok büyükken tüm örnekler P'ye, ortalama da deterministik koşuya yaklaşır
+    sharp = sim.run_ensemble(samples=20, concentration=1e9, hours=24, seed=3)
+    np.testing.assert_allclose(sharp["mean"], sim.run_simulation(24), rtol=1e-3)
+
+
+def test_ensemble_step_is_one_stacked_matmul(monkeypatch):
+    decide = main._use_class_gemv
+    decisions = []
+
+    def spy(classes, rows, n):
+        decisions.append(decide(classes, rows, n))
+        return decisions[-1]
+
+    monkeypatch.setattr(main, "_use_class_gemv", spy)
+    TrafficSimulation().run_ensemble(samples=2000, hours=24, seed=0)
+    # Her adım M örneği tek bir (M, n, n) toplu matmul ile ilerletir
+    assert decisions and not any(decisions)
+    assert not decide(2000, 1, main.GEMV_MIN_NODES)
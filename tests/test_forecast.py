@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from main import InflowForecaster, TrafficSimulation
+
+
+def entry_counts(sim, forecaster, hour):
+    return sim.get_inflow(hour % 24)[forecaster.columns]
+
+
+@pytest.mark.parametrize("method", ["holt_winters", "seasonal_naive"])
+def test_profile_is_reproduced_without_error(method):
+    sim = TrafficSimulation()
+    forecaster = InflowForecaster(sim, method=method)
+    for hour in range(48):
+        forecaster.update(entry_counts(sim, forecaster, hour))
+    lower, mean, upper = forecaster.forecast(30)
+    expected = np.array([entry_counts(sim, forecaster, h) for h in range(48, 78)])
+    np.testing.assert_allclose(mean, expected, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(lower, mean, atol=1e-6)
+    np.testing.assert_allclose(upper, mean, atol=1e-6)
+
+
+def test_seasonal_naive_repeats_last_cycle():
+    sim = TrafficSimulation()
+    forecaster = InflowForecaster(sim, method="seasonal_naive")
+    rng = np.random.default_rng(0)
+    observed = rng.uniform(0, 1000, (24, len(forecaster.nodes)))
+    for counts in observed:
+        forecaster.update(counts)
+    _, mean, _ = forecaster.forecast(48)
+    np.testing.assert_array_equal(mean, np.vstack([observed, observed]))
+
+
+def test_lookahead_bands_are_ordered():
+    sim = TrafficSimulation()
+    forecaster = InflowForecaster(sim)
+    rng = np.random.default_rng(1)
+    for hour in range(72):
+        noise = rng.normal(1.0, 0.2, len(forecaster.nodes))
+        forecaster.update(entry_counts(sim, forecaster, hour) * noise)
+
+    result = sim.run_lookahead(forecaster, 12)
+    assert (result["lower"] <= result["mean"] + 1e-9).all()
+    assert (result["mean"] <= result["upper"] + 1e-9).all()
+    assert (result["upper"] - result["lower"]).max() > 0
+
+    _, mean, _ = forecaster.forecast(12)
+    expected = sim._run_engine(forecaster.inflow_matrix(mean))
+    np.testing.assert_allclose(result["mean"], expected, rtol=1e-12)
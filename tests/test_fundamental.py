@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from main import App, TrafficSimulation, transition_details
+
+
+def direct_inverse(sim):
+    t_idx, _ = sim._split_indices()
+    return np.linalg.inv(np.eye(len(t_idx)) - sim.P[np.ix_(t_idx, t_idx)])
+
+
+def test_rank_one_updates_match_direct_inverse():
+    sim = TrafficSimulation()
+    sim.fundamental()
+    rng = np.random.default_rng(3)
+    for _ in range(200):
+        src = rng.choice(["N5", "N6", "N7", "N8", "N13"])
+        row = sim.P[sim.n_map[src]]
+        dst = sim.nodes[rng.choice(np.flatnonzero(row))]
+        sim.set_transition(src, dst, rng.uniform(0.05, 0.95))
+        _, N_fund, col_sums = sim.fundamental()
+        np.testing.assert_allclose(N_fund, direct_inverse(sim), atol=1e-10)
+        np.testing.assert_allclose(col_sums, N_fund.sum(axis=0), atol=1e-10)
+
+
+def test_stale_snapshot_is_not_installed():
+    sim = TrafficSimulation()
+    snapshot = sim.p_snapshot()
+    old = direct_inverse(sim)
+
+    # Arka plandaki analiz başlamadan rota düzenlendi
+    sim.set_transition("N6", "N7", 0.8)
+    _, N_stale, _ = sim.fundamental(snapshot)
+    np.testing.assert_allclose(N_stale, old)
+    assert sim._fundamental is None
+
+    _, N_fund, _ = sim.fundamental()
+    np.testing.assert_allclose(N_fund, direct_inverse(sim), atol=1e-12)
+
+
+def test_current_snapshot_reuses_cache():
+    sim = TrafficSimulation()
+    cached = sim.fundamental()
+    assert sim.fundamental(sim.p_snapshot()) is cached
+    _, N_fund = sim.analyze_steady_state(sim.p_snapshot())
+    assert N_fund is cached[1]
+
+
+def test_closed_loop_edit_leaves_p_unchanged():
+    sim = TrafficSimulation()
+    sim.fundamental()
+    before, _ = sim.p_snapshot()
+    row = np.zeros(sim.n_len)
+    row[sim.n_map["N8"]] = 1.0
+    sim.set_row("N7", row)
+    row = np.zeros(sim.n_len)
+    row[sim.n_map["N7"]] = 1.0
+    with pytest.raises(np.linalg.LinAlgError):
+        sim.set_row("N8", row)
+    assert (
+        sim.P[sim.n_map["N8"], sim.n_map["N5"]]
+        == before[sim.n_map["N8"], sim.n_map["N5"]]
+    )
+
+
+class FakeWorker:
+    def __init__(self):
+        self.jobs = {}
+        self.invalidated = []
+
+    def submit(self, channel, fn, on_done):
+        self.jobs[channel] = fn
+
+    def invalidate(self, channel):
+        self.invalidated.append(channel)
+        self.jobs.pop(channel, None)
+
+
+def fake_app():
+    return SimpleNamespace(
+        sim=TrafficSimulation(), worker=FakeWorker(), on_sim_done=None
+    )
+
+
+def test_run_sim_uses_p_snapshot():
+    app = fake_app()
+    expected = app.sim.run_simulation()
+    App.run_sim(app)
+
+    # İş kuyruktayken rota düzenlendi: iş yine gönderildiği andaki P ile çalışır
+    app.sim.set_transition("N6", "N7", 0.8)
+    history = app.worker.jobs["sim"](lambda done, total: None)
+    np.testing.assert_array_equal(history, expected)
+
+
+def test_p_edit_invalidates_pending_results():
+    app = fake_app()
+    app.sim.p_listeners.append(lambda node: App.on_p_change(app, node))
+    App.run_sim(app)
+    app.sim.set_transition("N6", "N7", 0.8)
+    assert "sim" in app.worker.invalidated and "sim" not in app.worker.jobs
+
+
+def test_cached_fundamental_is_read_only():
+    sim = TrafficSimulation()
+    _, N_fund = sim.analyze_steady_state()
+    with pytest.raises(ValueError):
+        N_fund[0, 0] = 0.0
+    sim.set_transition("N6", "N7", 0.8)
+    _, N_fund, col_sums = sim.fundamental()
+    assert not N_fund.flags.writeable and not col_sums.flags.writeable
+    np.testing.assert_allclose(N_fund, direct_inverse(sim), atol=1e-12)
+
+
+def test_transition_details_follow_edits():
+    sim = TrafficSimulation()
+    assert "→ N7: ████░░░░░░ 40%" in transition_details(sim, sim.P)
+    sim.set_transition("N6", "N7", 0.8)
+    text = transition_details(sim, sim.P)
+    assert "→ N7: ████████░░ 80%" in text
+    assert "→ N3: ░░░░░░░░░░ 7%" in text
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from main import HistoryArchive, TrafficSimulation
+
+
+@pytest.fixture
+def month():
+    sim = TrafficSimulation()
+    rng = np.random.default_rng(0)
+    U = np.array([sim.get_inflow(t % 24) for t in range(24 * 30)])
+    U *= rng.uniform(0.9, 1.1, U.shape)
+    history, _ = sim.run_steps(np.zeros(sim.n_len), U)
+    return sim, history
+
+
+@pytest.mark.parametrize("scale", [1.0, 0.25])
+def test_round_trip_within_quantization_bound(month, scale):
+    sim, history = month
+    archive = HistoryArchive(scale=scale, time_block=100, node_chunk=5)
+    archive.add("temel", history, sim.nodes)
+    decoded = archive.read("temel")
+    assert decoded.shape == history.shape
+    assert np.abs(decoded - history).max() <= scale / 2 + 1e-9
+
+
+def test_partial_reads_match_full_decode(month):
+    sim, history = month
+    archive = HistoryArchive(time_block=100, node_chunk=5)
+    archive.add("temel", history, sim.nodes)
+    full = archive.read("temel")
+
+    part = archive.read("temel", nodes=["N7", "N5", "N12"], t0=95, t1=317)
+    columns = [sim.n_map[n] for n in ["N7", "N5", "N12"]]
+    np.testing.assert_array_equal(part, full[95:317, columns])
+    np.testing.assert_array_equal(
+        archive.read("temel", nodes=[3], t0=700), full[700:, [3]]
+    )
+
+
+def test_bottleneck_on_decoded_history(month):
+    sim, history = month
+    archive = HistoryArchive()
+    archive.add("temel", history, sim.nodes)
+    node, value = sim.analyze_bottleneck(archive.read("temel"))
+    expected_node, expected_value = sim.analyze_bottleneck(history)
+    assert node == expected_node
+    assert abs(value - expected_value) <= 0.5
+
+
+def test_save_and_open(month, tmp_path):
+    sim, history = month
+    archive = HistoryArchive(time_block=128)
+    archive.add("a", history, sim.nodes)
+    archive.add("b", history[:50] * 2)
+    path = tmp_path / "gecmis.tha"
+    archive.save(path)
+
+    opened = HistoryArchive.open(path)
+    np.testing.assert_array_equal(opened.read("a"), archive.read("a"))
+    np.testing.assert_array_equal(
+        opened.read("b", t0=10, t1=20), archive.read("b")[10:20]
+    )
+    with pytest.raises(ValueError):
+        opened.add("c", history)
+
+
+def test_compresses_smooth_history(month):
+    sim, history = month
+    archive = HistoryArchive()
+    archive.add("temel", history, sim.nodes)
+    assert archive.compression_ratio() >= 5
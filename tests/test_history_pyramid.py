@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from main import HistoryPyramid, SimulationBranch
+
+
+def reference_levels(series):
+    """Her seviye için kovaların min/max'ı doğrudan ham seriden"""
+    levels, width = [], 2
+    while width < 2 * len(series):
+        buckets = range(0, len(series), width)
+        lo_i = np.array([b + series[b : b + width].argmin(axis=0) for b in buckets])
+        hi_i = np.array([b + series[b : b + width].argmax(axis=0) for b in buckets])
+        levels.append(
+            (
+                lo_i,
+                np.take_along_axis(series, lo_i, 0),
+                hi_i,
+                np.take_along_axis(series, hi_i, 0),
+            )
+        )
+        width *= 2
+    return levels
+
+
+def assert_same_levels(a, b):
+    assert len(a) == len(b)
+    for level_a, level_b in zip(a, b):
+        for x, y in zip(level_a, level_b):
+            np.testing.assert_array_equal(x, y)
+
+
+@pytest.mark.parametrize("length", [1, 2, 3, 5, 17, 64, 333])
+def test_fresh_build_matches_reference(length):
+    series = np.random.default_rng(length).integers(0, 20, (length, 3)).astype(float)
+    pyramid = HistoryPyramid(series)
+    assert_same_levels(pyramid.levels, reference_levels(series))
+
+
+@pytest.mark.parametrize("length", [2, 7, 64, 333])
+def test_incremental_appends_match_fresh_build(length):
+    rng = np.random.default_rng(length)
+    series = rng.integers(0, 20, (length, 4)).astype(float)
+
+    single = HistoryPyramid(series[:0])
+    for row in series:
+        single.extend(row)
+    chunked = HistoryPyramid(series[:1])
+    start = 1
+    while start < length:
+        k = int(rng.integers(1, 9))
+        chunked.extend(series[start : start + k])
+        start += k
+
+    fresh = HistoryPyramid(series)
+    for pyramid in (single, chunked):
+        np.testing.assert_array_equal(pyramid.series, fresh.series)
+        assert_same_levels(pyramid.levels, fresh.levels)
+        for budget in (4, 50):
+            for got, want in zip(
+                pyramid.query(0, length, budget), fresh.query(0, length, budget)
+            ):
+                np.testing.assert_array_equal(got, want)
+
+
+def test_one_dimensional_series():
+    series = np.arange(10.0)[::-1]
+    pyramid = HistoryPyramid(series)
+    pyramid.extend([20.0, -1.0])
+    lo_i, lo_v, hi_i, hi_v = pyramid.levels[-1]
+    assert lo_v[0, 0] == -1.0 and lo_i[0, 0] == 11
+    assert hi_v[0, 0] == 20.0 and hi_i[0, 0] == 10
+
+
+def test_branch_array_tail():
+    branch = SimulationBranch("ana", 2)
+    branch.extend(np.arange(10.0).reshape(5, 2))
+    child = branch.fork("dal")
+    child.extend(np.full((3, 2), 9.0))
+    np.testing.assert_array_equal(child.array(6), child.array()[6:])
+    np.testing.assert_array_equal(child.array(2), child.array()[2:])
+    assert child.array(5).base is not None  # Dalın kendi bölümü kopyalanmaz
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from main import TrafficSimulation
+
+
+def brute_force(sim, hours, edits):
+    """Her saat P'yi açıkça düzenleyip x = (x + U)·P ile simüle et
+
+    edits: saat -> {kaynak: {hedef: olasılık}} tam satır tanımları
+    """
+    x = np.zeros(sim.n_len)
+    history = []
+    for t in range(hours):
+        P = sim.P.copy()
+        for src, row in edits.get(t, {}).items():
+            i = sim.n_map[src]
+            P[i] = 0.0
+            for dst, p in row.items():
+                P[i, sim.n_map[dst]] = p
+        x = (x + sim.get_inflow(t)) @ P
+        history.append(x)
+    return np.array(history)
+
+
+def test_single_closure_matches_brute_force():
+    sim = TrafficSimulation()
+    incidents = [{"node": "N6", "close": ["N7"], "start": 6, "end": 10}]
+    # N6: N3 0.2, N10 0.4 -> 1/3, 2/3
+    edits = {t: {"N6": {"N3": 1 / 3, "N10": 2 / 3}} for t in range(6, 10)}
+    np.testing.assert_allclose(
+        sim.run_simulation(24, incidents=incidents),
+        brute_force(sim, 24, edits),
+        rtol=1e-12,
+        atol=1e-9,
+    )
+
+
+def test_overlapping_closures_on_same_node():
+    sim = TrafficSimulation()
+    incidents = [
+        {"node": "N6", "close": ["N7"], "start": 4, "end": 12},
+        {"node": "N6", "close": ["N10"], "start": 8, "end": 16},
+    ]
+    edits = {}
+    for t in range(4, 16):
+        if t < 8:
+            edits[t] = {"N6": {"N3": 1 / 3, "N10": 2 / 3}}
+        elif t < 12:
+            edits[t] = {"N6": {"N3": 1.0}}
+        else:
+            edits[t] = {"N6": {"N3": 1 / 3, "N7": 2 / 3}}
+    np.testing.assert_allclose(
+        sim.run_simulation(24, incidents=incidents),
+        brute_force(sim, 24, edits),
+        rtol=1e-12,
+        atol=1e-9,
+    )
+
+
+def test_row_override_combined_with_closure():
+    sim = TrafficSimulation()
+    incidents = [
+        {"node": "N6", "row": {"N3": 0.2, "N7": 0.6, "N10": 0.2}},
+        {"node": "N6", "close": ["N10"], "start": 8, "end": 18},
+    ]
+    edits = {t: {"N6": {"N3": 0.2, "N7": 0.6, "N10": 0.2}} for t in range(24)}
+    for t in range(8, 18):
+        edits[t] = {"N6": {"N3": 0.25, "N7": 0.75}}
+    np.testing.assert_allclose(
+        sim.run_simulation(24, incidents=incidents),
+        brute_force(sim, 24, edits),
+        rtol=1e-12,
+        atol=1e-9,
+    )
+
+
+def test_merged_row_is_stochastic():
+    sim = TrafficSimulation()
+    incidents = [
+        {"node": "N6", "close": ["N7"]},
+        {"node": "N6", "close": ["N10"]},
+    ]
+    schedule = sim._compile_incidents(incidents, (), 1)
+    b, rows, delta = schedule[0]
+    assert len(rows) == 1
+    row = sim.P[rows[0]] + delta[0]
+    assert row[sim.n_map["N3"]] == pytest.approx(1.0)
+    assert row.sum() == pytest.approx(1.0)
+
+
+def test_closing_every_exit_is_rejected():
+    sim = TrafficSimulation()
+    incidents = [
+        {"node": "N6", "close": ["N3", "N7"]},
+        {"node": "N6", "close": ["N10"]},
+    ]
+    with pytest.raises(ValueError):
+        sim.run_simulation(4, incidents=incidents)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from main import TrafficSimulation, peak_inflow
+
+
+def absorption(sim, P):
+    t_idx, a_idx = sim._split_indices()
+    N_fund = np.linalg.inv(np.eye(len(t_idx)) - P[np.ix_(t_idx, t_idx)])
+    return N_fund, N_fund @ P[np.ix_(t_idx, a_idx)]
+
+
+def test_closures_match_brute_force():
+    sim = TrafficSimulation()
+    inflow = peak_inflow([sim.get_inflow(t) for t in range(24)])
+    closures = sim.analyze_link_closures()
+    t_idx, _ = sim._split_indices()
+    entry_rows = np.searchsorted(t_idx, [sim.n_map[e] for e in sim.entry_nodes])
+    _, B0 = absorption(sim, sim.P)
+
+    assert closures["entry_nodes"] == sim.entry_nodes
+    for e, (src, dst) in enumerate(closures["edges"]):
+        if not closures["feasible"][e]:
+            continue
+        P = sim.P.copy()
+        i = sim.n_map[src]
+        P[i, sim.n_map[dst]] = 0.0
+        P[i] /= P[i].sum()
+        N_fund, B = absorption(sim, P)
+        loads = inflow[t_idx] @ N_fund - inflow[t_idx]
+
+        assert np.isclose(closures["peak_load"][e], loads.max())
+        np.testing.assert_allclose(
+            closures["absorption_change"][e],
+            B[entry_rows] - B0[entry_rows],
+            atol=1e-12,
+        )
+
+
+def test_default_inflow_is_peak_hour():
+    sim = TrafficSimulation()
+    rush = sim.analyze_link_closures(inflow=sim.get_inflow(17))
+    default = sim.analyze_link_closures()
+    np.testing.assert_array_equal(rush["peak_load"], default["peak_load"])
+
+
+def test_exit_only_link_is_infeasible():
+    sim = TrafficSimulation()
+    closures = sim.analyze_link_closures()
+    e = closures["edges"].index(("N1", "N5"))
+    assert not closures["feasible"][e]
+    assert np.isinf(closures["peak_load"][e])
+    assert np.isnan(closures["absorption_change"][e]).all()
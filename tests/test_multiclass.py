@@ -0,0 +1,51 @@
+import numpy as np
+
+from main import GEMV_MIN_NODES, TrafficSimulation, _advance, _use_class_gemv
+
+
+def class_inflows(sim, shares, hours=24):
+    U = np.array([sim.get_inflow(t) for t in range(hours)])
+    return np.stack([share * U for share in shares]), U
+
+
+def test_identical_classes_sum_to_single_class_run():
+    sim = TrafficSimulation()
+    inflows, U = class_inflows(sim, [0.7, 0.2, 0.1])
+    result = sim.run_multiclass_simulation(sim.class_tensor([{}, {}, {}]), inflows)
+    np.testing.assert_allclose(result["total"], sim._run_engine(U), rtol=1e-12)
+    np.testing.assert_allclose(result["classes"].sum(axis=0), result["total"])
+
+
+def test_each_class_follows_its_own_routing():
+    sim = TrafficSimulation()
+    trucks = {"N6": {"N3": 0.5, "N10": 0.5}}
+    tensor = sim.class_tensor([{}, trucks])
+    np.testing.assert_allclose(tensor.sum(axis=-1), 1.0, rtol=1e-12)
+    assert tensor[1, sim.n_map["N6"], sim.n_map["N7"]] == 0.0
+
+    inflows, _ = class_inflows(sim, [0.8, 0.2])
+    result = sim.run_multiclass_simulation(
+        tensor, inflows, class_names=["car", "truck"]
+    )
+    for c in range(2):
+        single = sim._run_engine(inflows[c], P=tensor[c])
+        np.testing.assert_allclose(result["classes"][c], single, rtol=1e-12)
+    assert set(result["class_bottlenecks"]) == {"car", "truck"}
+
+
+def test_batched_scenarios():
+    sim = TrafficSimulation()
+    inflows, _ = class_inflows(sim, [0.5, 0.5], hours=12)
+    batch = np.stack([inflows, 2 * inflows])
+    result = sim.run_multiclass_simulation(sim.class_tensor([{}, {}]), batch)
+    assert result["classes"].shape == (2, 2, 12, sim.n_len)
+    np.testing.assert_allclose(result["total"][1], 2 * result["total"][0], rtol=1e-12)
+
+
+def test_class_gemv_path_matches_stacked_matmul():
+    rng = np.random.default_rng(0)
+    n = GEMV_MIN_NODES
+    M = rng.random((2, n, n))
+    z = rng.random((2, n))
+    assert _use_class_gemv(2, 1, n)
+    np.testing.assert_allclose(_advance(z, M), np.einsum("ci,cij->cj", z, M))
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from main import (
+    COLORS,
+    NODE_LABEL_LIMIT,
+    InteractiveSimulation,
+    TrafficSimulation,
+    edge_arrows,
+    labelled_nodes,
+)
+
+
+def test_edges_are_off_diagonal_nonzeros(synthetic_network):
+    for sim in (TrafficSimulation(), synthetic_network(200)):
+        src, dst = sim.edges()
+        expected = sim.P > 0
+        np.fill_diagonal(expected, False)
+        got = np.zeros_like(expected)
+        got[src, dst] = True
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_positions_fall_back_to_grid(synthetic_network):
+    sim = TrafficSimulation()
+    xy = sim.node_positions()
+    assert tuple(xy[sim.n_map["N6"]]) == sim.positions["N6"]
+
+    big = synthetic_network(200)
+    big.positions = {}
+    xy = big.node_positions()
+    assert xy.shape == (200, 2) and xy.min() >= 0 and xy.max() <= 1
+    assert len(np.unique(xy, axis=0)) == 200
+
+
+def test_edge_arrows_are_shortened_along_the_edge():
+    xy = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]])
+    src, dst = np.array([0, 1]), np.array([1, 2])
+    start, vec = edge_arrows(xy, src, dst)
+    np.testing.assert_allclose(start, [[0.06, 0.0], [1.0, 0.06]])
+    np.testing.assert_allclose(vec, [[0.88, 0.0], [0.0, 0.88]])
+    start, vec = edge_arrows(xy, src[:0], dst[:0])
+    assert start.shape == vec.shape == (0, 2)
+
+
+def test_labels_only_below_limit():
+    xy = np.column_stack([np.arange(100.0), np.zeros(100)])
+    assert labelled_nodes(xy, (9.5, 20.5), (-1, 1)) == set(range(10, 21))
+    assert labelled_nodes(xy, (20.5, 9.5), (1, -1)) == set(range(10, 21))
+    assert labelled_nodes(xy, (-1, 100), (-1, 1)) == set()
+    assert len(labelled_nodes(xy, (-0.5, NODE_LABEL_LIMIT - 0.5), (-1, 1))) == (
+        NODE_LABEL_LIMIT
+    )
+
+
+def test_node_styles_mark_entries_and_exits(synthetic_network):
+    sim = TrafficSimulation()
+    view = SimpleNamespace(sim=sim)
+    state = np.zeros(sim.n_len)
+    state[sim.n_map["N6"]] = 5000
+    sizes, colors = InteractiveSimulation.node_styles(view, state)
+    assert colors[sim.n_map["N6"]] == COLORS["accent"]
+    assert colors[sim.n_map["N7"]] == COLORS["success"]
+    assert colors[sim.n_map["N1"]] == "#3498db"
+    assert sizes[sim.n_map["N6"]] == 700 and sizes[sim.n_map["N3"]] == 400
+
+    # Büyük ağlarda işaretçiler √(30/n) oranında küçülür
+    big = synthetic_network(1200)
+    sizes, colors = InteractiveSimulation.node_styles(
+        SimpleNamespace(sim=big), np.zeros(big.n_len)
+    )
+    assert len(sizes) == len(colors) == 1200
+    np.testing.assert_allclose(sizes.max(), 400 * np.sqrt(30 / 1200))
@@ -0,0 +1,26 @@
+import numpy as np
+
+from main import TrafficSimulation
+
+
+def test_exit_shares_are_distributions():
+    od = TrafficSimulation().analyze_od()
+    assert od["exit_share"].shape == (len(od["entries"]), len(od["exits"]))
+    assert (od["exit_share"] >= 0).all()
+    np.testing.assert_allclose(od["exit_share"].sum(axis=1), 1.0, rtol=1e-12)
+
+
+def test_od_matches_absorption_probabilities():
+    sim = TrafficSimulation()
+    od = sim.analyze_od()
+    t_idx, a_idx = sim._split_indices()
+    Q = sim.P[np.ix_(t_idx, t_idx)]
+    R = sim.P[np.ix_(t_idx, a_idx)]
+    N = np.linalg.inv(np.eye(len(t_idx)) - Q)
+    rows = [list(t_idx).index(sim.n_map[e]) for e in od["entries"]]
+    np.testing.assert_allclose(od["exit_share"], (N @ R)[rows], rtol=1e-10)
+
+    cols = [list(t_idx).index(sim.n_map[j]) for j in od["junctions"]]
+    np.testing.assert_allclose(od["junction_visits"], N[np.ix_(rows, cols)])
+    reach = od["junction_reach"]
+    assert ((reach >= 0) & (reach <= 1 + 1e-12)).all()
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from main import TrafficSimulation
+
+
+def test_partition_covers_every_node_once():
+    sim = TrafficSimulation()
+    parts = sim.partition_nodes(3)
+    nodes = np.sort(np.concatenate(parts))
+    np.testing.assert_array_equal(nodes, np.arange(sim.n_len))
+
+
+@pytest.mark.parametrize("parts", [1, 2])
+def test_partitioned_matches_run_simulation(parts):
+    sim = TrafficSimulation()
+    reference = sim.run_simulation(48)
+    inflows = np.array([sim.get_inflow(t) for t in range(48)])
+    history = sim.run_partitioned_simulation(parts=parts, inflows=inflows)
+    np.testing.assert_allclose(history, reference, rtol=1e-12, atol=1e-9)
+
+
+def test_partitioned_starts_from_x0():
+    sim = TrafficSimulation()
+    x0 = np.linspace(0, 500, sim.n_len)
+    inflows = np.zeros((5, sim.n_len))
+    history = sim.run_partitioned_simulation(parts=1, inflows=inflows, x0=x0)
+    expected = x0
+    for row in history:
+        expected = expected @ sim.P
+        np.testing.assert_allclose(row, expected, rtol=1e-12)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from main import TrafficSimulation
+
+
+def simulate_days(sim, inflow_fn, days):
+    U = np.array([inflow_fn(t % 24) for t in range(24 * days)])
+    history, _ = sim.run_steps(np.zeros(sim.n_len), U)
+    return U, history
+
+
+def test_periodic_orbit_matches_long_simulation():
+    sim = TrafficSimulation()
+    result = sim.analyze_periodic_steady_state()
+    _, history = simulate_days(sim, sim.get_inflow, 60)
+    t_idx, _ = sim._split_indices()
+    np.testing.assert_allclose(result["states"], history[-24:, t_idx], rtol=1e-9)
+    assert result["transient_nodes"] == [sim.nodes[i] for i in t_idx]
+
+
+def test_daily_exits_balance_daily_inflow():
+    sim = TrafficSimulation()
+    result = sim.analyze_periodic_steady_state()
+    total_in = sum(sim.get_inflow(t).sum() for t in range(24))
+    assert np.isclose(sum(result["daily_exits"].values()), total_in)
+
+
+def test_custom_absorbing_nodes(synthetic_network):
+    sim = synthetic_network(60, seed=4)
+    rng = np.random.default_rng(0)
+    daily = np.zeros((24, sim.n_len))
+    daily[:, : len(sim.entry_nodes)] = rng.uniform(10, 100, (24, len(sim.entry_nodes)))
+
+    result = sim.analyze_periodic_steady_state(inflow_fn=lambda t: daily[t])
+    assert result["exit_nodes"] == sim.absorbing_nodes
+    assert not set(result["transient_nodes"]) & set(sim.absorbing_nodes)
+
+    _, history = simulate_days(sim, lambda t: daily[t], 40)
+    t_idx, _ = sim._split_indices()
+    np.testing.assert_allclose(
+        result["states"], history[-24:, t_idx], rtol=1e-9, atol=1e-9
+    )
+    node, _ = sim.analyze_bottleneck(history)
+    assert node not in sim.absorbing_nodes
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from main import TrafficSimulation
+
+
+@pytest.mark.parametrize("mode", ["float32", "compact"])
+def test_reduced_precision_conserves_vehicles(mode):
+    sim = TrafficSimulation()
+    report = sim.precision_report(hours=24 * 30, mode=mode)
+    total_in = sum(sim.get_inflow(t % 24).sum() for t in range(24 * 30))
+
+    assert report["history_bytes"] * 2 == report["history_bytes_float64"]
+    assert report["conservation_error_float64"] <= 1e-9 * total_in
+    assert report["conservation_error"] <= 1e-6 * total_in
+    assert report["max_rel_error"] < 1e-4
+
+
+def test_float64_mode_is_exact():
+    report = TrafficSimulation().precision_report(hours=24 * 7, mode="float64")
+    assert report["max_abs_error"] == 0.0
+    assert report["history_bytes"] == report["history_bytes_float64"]
@@ -0,0 +1,31 @@
+import numpy as np
+
+from main import TrafficSimulation
+
+
+def test_reduced_matches_full_simulation():
+    sim = TrafficSimulation()
+    full = sim.run_simulation(24)
+    reduced = sim.run_reduced_simulation(24)
+    t_idx, a_idx = sim._split_indices()
+
+    assert reduced["transient_nodes"] == [sim.nodes[i] for i in t_idx]
+    assert reduced["exit_nodes"] == [sim.nodes[i] for i in a_idx]
+    np.testing.assert_allclose(reduced["transient_history"], full[:, t_idx], rtol=1e-12)
+    np.testing.assert_allclose(
+        reduced["cumulative_exits"], full[:, a_idx], rtol=1e-12, atol=1e-9
+    )
+    np.testing.assert_allclose(
+        np.cumsum(reduced["exit_flows"], axis=0), reduced["cumulative_exits"]
+    )
+
+
+def test_vehicles_are_conserved():
+    sim = TrafficSimulation()
+    reduced = sim.run_reduced_simulation(
+        24 * 7, inflow_fn=lambda t: sim.get_inflow(t % 24)
+    )
+    total_in = sum(sim.get_inflow(t % 24).sum() for t in range(24 * 7))
+    in_network = reduced["transient_history"][-1].sum()
+    exited = reduced["cumulative_exits"][-1].sum()
+    assert np.isclose(in_network + exited, total_in, rtol=1e-12)
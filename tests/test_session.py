@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+
+from main import (
+    SESSION_INPUT_NODES,
+    TrafficSimulation,
+    _to_json,
+    replay_session,
+    routing_event,
+    session_header,
+)
+
+
+def record(sim, session, hours, state, hour):
+    """İnteraktif pencerenin yaptığı gibi adımları çalıştırıp günlüğe yaz"""
+    columns = [sim.n_map[node] for node in SESSION_INPUT_NODES]
+    inflows = np.array([sim.get_inflow((hour + t) % 24) for t in range(hours)])
+    history, state = sim.run_steps(state, inflows)
+    session.append({"type": "steps", "hour": hour, "inflows": inflows[:, columns]})
+    return history, state
+
+
+def round_trip(header, events):
+    return json.loads(json.dumps(_to_json(dict(header, events=events))))
+
+
+def test_replay_after_routing_edits_is_identical():
+    sim = TrafficSimulation()
+    # Kayıttan önceki düzenleme başlangıç P'si ile birlikte saklanmalı
+    sim.set_row("N5", np.where(sim.P[sim.n_map["N5"]] > 0, [0.5] * 13, 0))
+    header, events = session_header(sim), []
+    sim.p_listeners.append(lambda node: events.append(routing_event(sim, node)))
+
+    state, chunks = np.zeros(sim.n_len), []
+    history, state = record(sim, events, 10, state, 0)
+    chunks.append(history)
+
+    row = np.zeros(sim.n_len)
+    row[[sim.n_map["N3"], sim.n_map["N7"], sim.n_map["N10"]]] = [0.1, 0.7, 0.2]
+    sim.set_row("N6", row)
+    history, state = record(sim, events, 14, state, 10)
+    chunks.append(history)
+
+    sim.setup_matrix()
+    history, state = record(sim, events, 6, state, 0)
+    chunks.append(history)
+
+    assert [e["type"] for e in events] == ["steps", "row", "steps", "matrix", "steps"]
+    assert all("time" in e for e in events if e["type"] in ("row", "matrix"))
+
+    branches = replay_session(round_trip(header, events))
+    np.testing.assert_array_equal(branches["ana"]["history"], np.concatenate(chunks))
+    np.testing.assert_array_equal(branches["ana"]["state"], state)
+
+
+def test_replay_uses_recorded_precision():
+    sim = TrafficSimulation()
+    sim.precision = "float32"
+    header, events = session_header(sim), []
+    history, _ = record(sim, events, 24, np.zeros(sim.n_len), 0)
+
+    branches = replay_session(round_trip(header, events))
+    assert branches["ana"]["history"].dtype == np.float32
+    np.testing.assert_array_equal(branches["ana"]["history"], history)
+
+
+def test_version_one_logs_still_replay():
+    sim = TrafficSimulation()
+    events = []
+    history, _ = record(sim, events, 12, np.zeros(sim.n_len), 0)
+    branches = replay_session(round_trip({"version": 1}, events))
+    np.testing.assert_array_equal(branches["ana"]["history"], history)
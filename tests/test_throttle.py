@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+from main import SLIDER_FRAME_MS, IdleThrottle, ModernSlider
+
+
+class FakeScheduler:
+    """Tk after/after_idle/after_cancel yerine elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 0.0  # saniye
+        self.jobs = {}
+        self.next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, fn):
+        self.next_id += 1
+        self.jobs[self.next_id] = (self.now + ms / 1000, fn)
+        return self.next_id
+
+    def after_idle(self, fn):
+        return self.after(0, fn)
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def advance(self, seconds):
+        """Saati ilerlet, vadesi gelen işleri sırayla çalıştır"""
+        end = self.now + seconds
+        while True:
+            due = [(t, j) for j, (t, _) in self.jobs.items() if t <= end]
+            if not due:
+                break
+            t, job = min(due)
+            self.now = max(self.now, t)
+            self.jobs.pop(job)[1]()
+        self.now = end
+
+
+def make_throttle(callback, interval=SLIDER_FRAME_MS):
+    scheduler = FakeScheduler()
+    throttle = IdleThrottle(scheduler, callback, interval, clock=scheduler.clock)
+    return scheduler, throttle
+
+
+def test_burst_coalesces_into_one_idle_call():
+    calls = []
+    scheduler, throttle = make_throttle(lambda: calls.append(scheduler.now))
+    for _ in range(50):
+        throttle.schedule()
+    assert len(scheduler.jobs) == 1
+    scheduler.advance(0.001)
+    assert calls == [0.0]
+
+
+def test_calls_are_spaced_by_interval():
+    calls = []
+    scheduler, throttle = make_throttle(lambda: calls.append(scheduler.now))
+    # 1 ms'de bir istek, 200 ms boyunca (sürekli sürükleme)
+    for _ in range(200):
+        throttle.schedule()
+        scheduler.advance(0.001)
+    scheduler.advance(1.0)
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    assert len(calls) <= 200 / SLIDER_FRAME_MS + 2
+    assert min(gaps) >= SLIDER_FRAME_MS / 1000 - 1e-9
+
+
+def test_interval_counts_from_end_of_slow_callback():
+    calls = []
+    scheduler = FakeScheduler()
+
+    def slow():
+        calls.append(scheduler.now)
+        scheduler.now += 0.1  # 100 ms süren iş
+
+    throttle = IdleThrottle(scheduler, slow, clock=scheduler.clock)
+    throttle.schedule()
+    scheduler.advance(0)
+    throttle.schedule()
+    scheduler.advance(1.0)
+    assert calls[1] - calls[0] >= 0.1 + SLIDER_FRAME_MS / 1000 - 1e-9
+
+
+def test_cancel_drops_pending_call():
+    calls = []
+    scheduler, throttle = make_throttle(lambda: calls.append(1))
+    throttle.schedule()
+    throttle.cancel()
+    scheduler.advance(1.0)
+    assert calls == [] and not scheduler.jobs
+    throttle.cancel()  # İş yokken de güvenli
+
+
+def test_slider_delivers_only_the_last_value():
+    received = []
+    scheduler = FakeScheduler()
+    slider = SimpleNamespace(
+        value=SimpleNamespace(set=lambda v: None),
+        value_label=SimpleNamespace(config=lambda **kw: None),
+        command=received.append,
+        pending=None,
+        quiet=False,
+        from_=0,
+        to_=100,
+    )
+    slider.flush = lambda: ModernSlider.flush(slider)
+    slider.throttle = IdleThrottle(scheduler, slider.flush, clock=scheduler.clock)
+    for value in range(0, 101, 5):
+        ModernSlider._on_change(slider, str(value))
+    scheduler.advance(0.1)
+    assert received == [100]
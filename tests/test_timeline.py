@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from main import (
+    InteractiveSimulation,
+    ModernSlider,
+    SimulationBranch,
+    clamp_step,
+    fork_marker,
+    next_play_step,
+    timeline_range,
+)
+
+
+class Recorder:
+    """Çağrıları kaydeden sahte matplotlib/Tk nesnesi"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+
+class FakeSlider:
+    """ModernSlider mantığı, Tk bileşenleri yerine kaydedicilerle"""
+
+    get = ModernSlider.get
+    set = ModernSlider.set
+    set_range = ModernSlider.set_range
+    _on_change = ModernSlider._on_change
+    flush = ModernSlider.flush
+
+    def __init__(self, command):
+        self.value = SimpleNamespace(v=0)
+        self.value.get = lambda: self.value.v
+        self.value.set = lambda v: setattr(self.value, "v", v)
+        self.slider = Recorder()
+        self.value_label = Recorder()
+        self.throttle = SimpleNamespace(schedule=lambda: None)
+        self.command = command
+        self.pending = None
+        self.quiet = False
+        self.from_, self.to_ = 0, 0
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 10])
+def test_step_helpers_at_history_boundaries(length):
+    first, last = timeline_range(length)
+    assert first == 0 and last == max(length - 1, 0)
+    if length == 0:
+        assert clamp_step(0, 0) is None and next_play_step(0, 0) is None
+        return
+    assert clamp_step(-3, length) == 0
+    assert clamp_step(last, length) == last
+    assert clamp_step(last + 5, length) == last
+    assert next_play_step(last, length) is None
+    assert next_play_step(-1, length) == (1 if length > 1 else None)
+
+
+def test_slider_range_follows_history():
+    shown = []
+    slider = FakeSlider(shown.append)
+    for length in (1, 5, 12):
+        first, last = timeline_range(length)
+        slider.set_range(first, last)
+        slider.set(last, trigger_callback=True)
+        slider.flush()
+        assert slider.get() == last and shown[-1] == last
+
+    # Kısa bir dala geçildi: değer yeni aralığa sıkışır
+    slider.set_range(*timeline_range(3))
+    assert slider.get() == 2
+    # Sürükleme aralık dışı değer verirse de sıkıştırılır
+    slider._on_change("40.7")
+    slider.flush()
+    assert shown[-1] == 2
+
+
+def test_show_step_clamps_to_history():
+    states = np.arange(12.0).reshape(4, 3)
+    view = SimpleNamespace(
+        state_history=list(states),
+        blit_background=object(),
+        node_styles=lambda state: (state, ["c"] * 3),
+        node_collection=Recorder(),
+        node_labels={},
+        bar_artists=([], [], []),
+        time_cursor=Recorder(),
+        canvas=Recorder(),
+        animated_artists=lambda: [],
+        sim=SimpleNamespace(nodes=["A", "B", "C"]),
+    )
+    view.canvas.figure = SimpleNamespace(bbox=None)
+    for step, expected in [(-1, 0), (0, 0), (3, 3), (99, 3)]:
+        InteractiveSimulation.show_step(view, step)
+        np.testing.assert_array_equal(view.displayed_state, states[expected])
+        assert view.time_cursor.calls[-1] == ("set_xdata", ([expected, expected],))
+
+    view.state_history = []
+    view.displayed_state = None
+    InteractiveSimulation.show_step(view, 0)
+    assert view.displayed_state is None
+
+
+def test_fork_marker():
+    root = SimulationBranch("main", 2)
+    assert fork_marker(root) is None
+    root.extend(np.zeros((4, 2)))
+    assert fork_marker(root.fork("b")) == 3.5
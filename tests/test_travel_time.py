@@ -0,0 +1,38 @@
+import numpy as np
+
+from main import TrafficSimulation
+
+
+def test_survival_matches_powers_of_q():
+    sim = TrafficSimulation()
+    result = sim.travel_time_distribution(horizon=60, tol=0.0, block=7)
+    t_idx, _ = sim._split_indices()
+    Q = sim.P[np.ix_(t_idx, t_idx)]
+    rows = [list(t_idx).index(sim.n_map[e]) for e in result["entries"]]
+
+    Qm = np.eye(len(t_idx))
+    for m in range(61):
+        np.testing.assert_allclose(
+            result["survival"][:, m], Qm.sum(axis=1)[rows], atol=1e-12
+        )
+        Qm = Qm @ Q
+    np.testing.assert_allclose(result["survival"][:, 0], 1.0)
+
+
+def test_mean_matches_pmf_expectation():
+    result = TrafficSimulation().travel_time_distribution(horizon=24 * 30, tol=1e-14)
+    pmf = result["pmf"]
+    assert (pmf >= -1e-15).all()
+    hours = np.arange(1, pmf.shape[1] + 1)
+    assert (result["tail_mass"] < 1e-14).all()
+    np.testing.assert_allclose(pmf @ hours, result["mean"], rtol=1e-9)
+
+
+def test_percentiles_are_ordered():
+    result = TrafficSimulation().travel_time_distribution()
+    p = result["percentiles"]
+    assert (p[0.5] <= p[0.9]).all() and (p[0.9] <= p[0.99]).all()
+    cdf = 1.0 - result["survival"]
+    for e, hour in enumerate(p[0.9]):
+        hour = int(hour)
+        assert cdf[e, hour] >= 0.9 and (hour == 0 or cdf[e, hour - 1] < 0.9)